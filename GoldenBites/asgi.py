@@ -2,6 +2,8 @@
 ASGI config for GoldenBites project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Production serves it through gunicorn with uvicorn workers (see Procfile), so one
+worker keeps serving other requests while async views wait on the database.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -14,5 +16,14 @@ load_dotenv()
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'GoldenBites.settings')
+# Under ASGI each request runs its queries on a thread of its own, so a persistent per-thread
+# connection is never reused. Borrow from a per-worker pool instead (psycopg 3, see settings.py).
+os.environ.setdefault('DB_POOL_MAX_SIZE', '8')
+# Web requests only; management commands (migrate, generate_data) run without it
+os.environ.setdefault('DB_STATEMENT_TIMEOUT_MS', '5000')
 
-application = get_asgi_application()
\ No newline at end of file
+application = get_asgi_application()
+
+# Compile the templates before the worker takes traffic (TEMPLATE_WARMUP, production profile)
+from members.warmup import warm_up  # noqa: E402 (needs the app registry loaded above)
+warm_up()
@@ -0,0 +1,70 @@
+"""
+Offline settings profile for load tests and benchmarks on a developer machine, on top of
+the production profile (settings_production) so timings include compression and the
+cached, warmed templates:
+
+    export DJANGO_SETTINGS_MODULE=GoldenBites.settings_local
+    python manage.py migrate
+    python manage.py collectstatic --noinput   # DEBUG is off, so pages link the hashed bundles
+    python manage.py loadtest --prepare --start-server
+
+LOCAL_DB_ENGINE selects the database: 'sqlite' (default, LOCAL_SQLITE_PATH) or 'postgres'
+(a local server, LOCAL_DB_NAME/USER/PASSWORD/HOST/PORT). Product images go to the
+in-memory fake storage backend unless STORAGE_BACKEND is set, so nothing talks to Supabase.
+LOCAL_DB_LATENCY (seconds) is added to every query to stand in for the round trip to the
+hosted pooler, like FAKE_STORAGE_LATENCY does for storage.
+"""
+import os
+import secrets
+
+# settings_production insists on a real key; a local run gets a fresh one unless one is exported
+os.environ.setdefault('DJANGO_SECRET_KEY', secrets.token_urlsafe(50))
+
+from .settings_production import *  # noqa: E402,F401,F403
+
+# DEBUG keeps every query in memory and serves errors as debug pages, which skews load tests
+DEBUG = os.environ.get('DJANGO_DEBUG', 'False') == 'True'
+ALLOWED_HOSTS = ['localhost', '127.0.0.1', '[::1]']
+
+LOCAL_DB_ENGINE = os.environ.get('LOCAL_DB_ENGINE', 'sqlite')
+if LOCAL_DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('LOCAL_DB_NAME', 'goldenbites'),
+            'USER': os.environ.get('LOCAL_DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('LOCAL_DB_PASSWORD', ''),
+            'HOST': os.environ.get('LOCAL_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('LOCAL_DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'connect_timeout': DB_CONNECT_TIMEOUT,
+            },
+        }
+    }
+    if DB_STATEMENT_TIMEOUT_MS:
+        DATABASES['default']['OPTIONS']['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('LOCAL_SQLITE_PATH', BASE_DIR / 'local.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'OPTIONS': {
+                # Several gunicorn workers write concurrently: WAL lets reads proceed during a write,
+                # and IMMEDIATE transactions queue for the write lock instead of failing mid-transaction
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+        }
+    }
+
+LOCAL_DB_LATENCY = float(os.environ.get('LOCAL_DB_LATENCY', 0))
+
+# No replica locally
+DATABASE_ROUTERS = []
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware != 'members.routers.ReplicaRoutingMiddleware']
+
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'fake')
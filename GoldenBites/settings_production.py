@@ -0,0 +1,50 @@
+"""
+Production settings profile, as served by the Procfile:
+
+    DJANGO_SETTINGS_MODULE=GoldenBites.settings_production
+    python manage.py collectstatic --noinput   # at build time; pages link the hashed bundles
+
+The hosted database, cache and storage settings come from settings.py. On top of them:
+DEBUG is off (it keeps every query in memory and turns errors into debug pages), templates
+come from the cached loader and are compiled when each worker starts (members/warmup.py),
+and HTML and JSON responses are compressed with brotli or gzip (members/compression.py).
+DJANGO_ALLOWED_HOSTS adds comma-separated host names to ALLOWED_HOSTS.
+DJANGO_SECRET_KEY must be set (JWT_SIGNING_KEY defaults to it); the profile refuses to load without it.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+
+# The fallback SECRET_KEY in settings.py is in the repository: sessions, password-reset links and
+# bearer tokens signed with it could be forged by anyone
+if not os.environ.get('DJANGO_SECRET_KEY'):
+    raise ImproperlyConfigured("Set DJANGO_SECRET_KEY (and optionally JWT_SIGNING_KEY) in the environment.")
+
+DEBUG = os.environ.get('DJANGO_DEBUG', 'False') == 'True'
+ALLOWED_HOSTS = [*ALLOWED_HOSTS, *filter(None, os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(','))]
+
+# Compiled templates are kept per worker for its lifetime; a deploy restarts the workers
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'context_processors': [
+            processor for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+            if processor != 'django.template.context_processors.debug'
+        ],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+TEMPLATE_WARMUP = True
+
+# Compress page and JSON responses on their way out, below the metrics/N+1 middlewares so their
+# timings include it; static files are served pre-compressed further down (members/staticfiles.py)
+MIDDLEWARE = list(MIDDLEWARE)
+MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware'), 'members.compression.CompressionMiddleware')
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))  # 0-11; 11 is several times slower for a few % less
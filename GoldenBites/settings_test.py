@@ -0,0 +1,32 @@
+"""
+Settings for the pytest suite (see conftest.py): the offline profile (settings_local)
+pinned to SQLite, with synchronous image uploads and a fast password hasher.
+"""
+from .settings_local import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',  # The test database is in memory either way; a file name left an empty file behind
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+STORAGE_BACKEND = 'fake'
+# Plain static names and nothing collected, so the suite doesn't need collectstatic
+STATIC_ROOT = None
+STORAGES = {**STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}}
+IMAGE_UPLOAD_BACKGROUND = False
+IMAGE_DELETE_FLUSH_INTERVAL = 3600  # Tests flush the deletion queue explicitly (flush_deletions)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']  # Test users only
+
+NPLUSONE_MODE = 'strict'
+METRICS_SAMPLE_RATE = 0.0
@@ -14,5 +14,11 @@ load_dotenv()
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'GoldenBites.settings')
+# Web requests only; management commands (migrate, generate_data) run without it
+os.environ.setdefault('DB_STATEMENT_TIMEOUT_MS', '5000')
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Compile the templates before the worker takes traffic (TEMPLATE_WARMUP, production profile)
+from members.warmup import warm_up  # noqa: E402 (needs the app registry loaded above)
+warm_up()
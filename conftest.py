@@ -0,0 +1,26 @@
+"""
+pytest bootstrap: configures Django from GoldenBites.settings_test and creates the
+test database once per session. The suite also collects members/tests.py, so
+`python -m pytest` and `python manage.py test` run the same Django TestCases.
+"""
+import os
+
+import django
+import pytest
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'GoldenBites.settings_test')
+django.setup()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def django_test_database():
+    from django.test.runner import DiscoverRunner
+
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    runner.setup_test_environment()  # DEBUG = False, as under manage.py test
+    old_config = runner.setup_databases()
+    try:
+        yield
+    finally:
+        runner.teardown_databases(old_config)
+        runner.teardown_test_environment()
@@ -0,0 +1,265 @@
+"""
+Read-only JSON catalog API, version 1, mounted at /api/v1/:
+
+    stalls/                        stalls, in id order
+    stalls/<id>/
+    products/                      products, in id order; ?stall=<id>, ?category=<name>
+    products/<id>/
+    categories/                    category names (trimmed, title case) with product counts; ?stall=<id>
+    review-summaries/?ids=1,2      review count, average and distribution per product
+
+Lists come back as {"results": [...], "next": <URL of the next page or null>}. They are paged
+by an opaque cursor (the last id seen, so pages don't shift when rows are added) and ?limit=
+(API_PAGE_SIZE by default, at most API_MAX_PAGE_SIZE). ?ids=3,1,2 fetches up to
+API_MAX_PAGE_SIZE objects by id in one query instead; unknown ids are left out. ?fields=id,name
+returns only those fields. Errors are {"error": "..."} with a 4xx status.
+
+Rows are read with values_list() and zipped into dicts, so no model instances are built.
+Nothing here reads the session or the user, so responses are the same for every client
+(no Vary: Cookie) and are sent with Cache-Control: public, max-age=API_CACHE_MAX_AGE. They
+carry an ETag and Last-Modified built from the version stamps in members/versions.py, and a
+client or CDN revalidating with If-None-Match gets a 304 before any query runs.
+"""
+import base64
+import binascii
+import json
+from functools import wraps
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db.models import Avg, Count, Q, QuerySet
+from django.db.models.functions import Lower, Trim
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import FoodStall, Product, Review
+from .versions import validators
+
+class APIError(ValueError):
+    """A bad request; the message is returned to the client."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+class Resource(NamedTuple):
+    queryset: QuerySet
+    fields: dict  # API field -> model field path
+    key: str  # Primary key path; also the cursor
+
+STALLS = Resource(
+    FoodStall.objects.all(),
+    {
+        'id': 'owner_id',
+        'name': 'stall_name',
+        'service_type': 'service_type',
+        'updated_at': 'updated_at',
+    },
+    'owner_id',
+)
+PRODUCTS = Resource(
+    Product.objects.all(),
+    {
+        'id': 'id',
+        'name': 'product_name',
+        'price': 'unit_price',
+        'category': 'category',
+        'stall_id': 'food_stall_id',
+        'stall_name': 'food_stall__stall_name',
+        'image_url': 'image_url',
+        'image_variants': 'image_variants',
+        'ingredients': 'ingredients',
+        'details': 'details',
+        'updated_at': 'updated_at',
+    },
+    'id',
+)
+
+def _page_size():
+    return getattr(settings, 'API_PAGE_SIZE', 50)
+
+def _max_page_size():
+    return getattr(settings, 'API_MAX_PAGE_SIZE', 200)
+
+def _int_param(request, name, minimum=1, maximum=None):
+    value = request.GET.get(name)
+    if value is None:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise APIError(f"'{name}' must be an integer.")
+    if number < minimum or (maximum is not None and number > maximum):
+        raise APIError(f"'{name}' must be between {minimum} and {maximum}." if maximum else f"'{name}' must be at least {minimum}.")
+    return number
+
+def _ids(request, required=False):
+    value = request.GET.get('ids')
+    if not value:
+        if required:
+            raise APIError("'ids' is required.")
+        return None
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(',')))
+    except ValueError:
+        raise APIError("'ids' must be a comma-separated list of integers.")
+    if len(ids) > _max_page_size():
+        raise APIError(f"At most {_max_page_size()} ids per request.")
+    return ids
+
+def _fields(request, resource):
+    value = request.GET.get('fields')
+    if not value:
+        return list(resource.fields)
+    names = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in names if name not in resource.fields]
+    if unknown or not names:
+        raise APIError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(resource.fields)}.")
+    return names
+
+def _encode_cursor(after):
+    return base64.urlsafe_b64encode(json.dumps({'after': after}).encode()).decode().rstrip('=')
+
+def _decode_cursor(token):
+    try:
+        after = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))['after']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise APIError("Invalid cursor.")
+    if not isinstance(after, int):
+        raise APIError("Invalid cursor.")
+    return after
+
+def _rows(queryset, resource, names):
+    """[(key, {name: value})] for queryset, straight from values_list()."""
+    paths = [resource.key, *(resource.fields[name] for name in names)]
+    return [(row[0], dict(zip(names, row[1:]))) for row in queryset.values_list(*paths)]
+
+def _collection(request, resource, queryset):
+    """One page of queryset (or the ?ids= objects) as {'results', 'next'}."""
+    names = _fields(request, resource)
+    queryset = queryset.order_by(resource.key)
+    ids = _ids(request)
+    if ids is not None:
+        rows = dict(_rows(queryset.filter(**{f'{resource.key}__in': ids}), resource, names))
+        return {'results': [rows[pk] for pk in ids if pk in rows], 'next': None}
+
+    limit = _int_param(request, 'limit', maximum=_max_page_size()) or _page_size()
+    cursor = request.GET.get('cursor')
+    if cursor:
+        queryset = queryset.filter(**{f'{resource.key}__gt': _decode_cursor(cursor)})
+    rows = _rows(queryset[:limit + 1], resource, names)  # One extra row tells whether there is a next page
+    next_url = None
+    if len(rows) > limit:
+        params = request.GET.copy()
+        params['cursor'] = _encode_cursor(rows[limit - 1][0])
+        next_url = f'{request.path}?{params.urlencode()}'
+    return {'results': [row for _, row in rows[:limit]], 'next': next_url}
+
+def _detail(request, resource, pk):
+    names = _fields(request, resource)
+    rows = _rows(resource.queryset.filter(**{resource.key: pk}), resource, names)
+    if not rows:
+        raise APIError("Not found.", status=404)
+    return rows[0][1]
+
+def _normalize_category(name):
+    return (name or '').strip().title()
+
+def api_view(scopes_func):
+    """
+    View decorator for the API: GET/HEAD only, APIError -> JSON error, and conditional GET
+    from the version stamps named by scopes_func(request, *args, **kwargs). The view returns
+    the payload; it runs only when the client's copy is stale.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return JsonResponse({'error': 'Method not allowed.'}, status=405, headers={'Allow': 'GET, HEAD'})
+            etag, last_modified = validators(scopes_func(request, *args, **kwargs), [request.get_full_path()])
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                try:
+                    payload = view_func(request, *args, **kwargs)
+                except APIError as error:
+                    return JsonResponse({'error': str(error)}, status=error.status)
+                response = JsonResponse(payload, json_dumps_params={'separators': (',', ':')})
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, public=True, max_age=getattr(settings, 'API_CACHE_MAX_AGE', 60))
+            return response
+        return wrapper
+    return decorator
+
+def _catalog(request, *args, **kwargs):
+    return ['catalog']
+
+def _review_scopes(request):
+    try:
+        ids = _ids(request) or []
+    except APIError:
+        ids = []  # The view reports it
+    return [f'reviews:{product_id}' for product_id in ids]
+
+@api_view(_catalog)
+def stalls(request):
+    return _collection(request, STALLS, STALLS.queryset)
+
+@api_view(_catalog)
+def stall_detail(request, stall_id):
+    return _detail(request, STALLS, stall_id)
+
+@api_view(_catalog)
+def products(request):
+    queryset = PRODUCTS.queryset
+    stall_id = _int_param(request, 'stall')
+    if stall_id is not None:
+        queryset = queryset.filter(food_stall_id=stall_id)
+    category = request.GET.get('category')
+    if category:
+        # Stored categories vary in case and spacing; match them the way categories/ lists them
+        queryset = queryset.alias(category_key=Lower(Trim('category'))).filter(category_key=category.strip().lower())
+    return _collection(request, PRODUCTS, queryset)
+
+@api_view(lambda request, product_id: [f'product:{product_id}'])
+def product_detail(request, product_id):
+    return _detail(request, PRODUCTS, product_id)
+
+@api_view(_catalog)
+def categories(request):
+    queryset = Product.objects.order_by()
+    stall_id = _int_param(request, 'stall')
+    if stall_id is not None:
+        queryset = queryset.filter(food_stall_id=stall_id)
+    counts = {}
+    for category, count in queryset.values_list('category').annotate(count=Count('id')):
+        name = _normalize_category(category)
+        if name:
+            counts[name] = counts.get(name, 0) + count
+    return {'results': [{'name': name, 'product_count': counts[name]} for name in sorted(counts)]}
+
+@api_view(_review_scopes)
+def review_summaries(request):
+    ids = _ids(request, required=True)
+    rows = (
+        Review.objects.filter(product_id__in=ids)
+        .values('product_id')
+        .annotate(
+            count=Count('id'),
+            average=Avg('rating'),
+            **{f'rating_{stars}': Count('id', filter=Q(rating=stars)) for stars in range(1, 6)},
+        )
+        .order_by()
+    )
+    summaries = {row['product_id']: row for row in rows}
+    results = []
+    for product_id in ids:
+        row = summaries.get(product_id, {})
+        results.append({
+            'product_id': product_id,
+            'review_count': row.get('count', 0),
+            'average_rating': round(row['average'], 1) if row.get('average') is not None else 0,
+            'distribution': {str(stars): row.get(f'rating_{stars}', 0) for stars in range(1, 6)},
+        })
+    return {'results': results}
@@ -1,6 +1,32 @@
+import time
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
 
 
 class MembersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'members'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - registers the notification badge invalidation receivers
+        from .sqlhooks import install_dispatcher
+        connection_created.connect(install_dispatcher)  # Request-scoped SQL metrics and N+1 tracking
+        if getattr(settings, 'LOCAL_DB_LATENCY', 0):
+            connection_created.connect(_add_query_latency)
+
+
+def _add_query_latency(sender, connection, **kwargs):
+    # Offline benchmarks (settings_local): every query waits as if the database were remote.
+    # Runs on every reconnect of the same wrapper, so only add it once.
+    if getattr(connection, '_query_latency_added', False):
+        return
+    connection._query_latency_added = True
+    latency = settings.LOCAL_DB_LATENCY
+
+    def delayed(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    connection.execute_wrappers.append(delayed)
@@ -0,0 +1,75 @@
+"""
+Sign-in by username or email.
+
+The sign-in form asks for "username or email". Identifiers are matched case-insensitively
+with one query, and that query uses the functional indexes on lower(username)/lower(email)
+(see User.Meta). Unknown identifiers still run the password hasher, so a miss takes as long
+as a wrong password. Session auth calls get_user() on every request, so with a shared cache
+(AUTH_USER_CACHE_TIMEOUT, on when REDIS_URL is set) the user object is cached per user.
+Signals drop the cached copy whenever the user row changes. A per-worker cache would keep
+serving the old row on every other worker, so there the user is read on each request.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+AUTH_USER_CACHE_KEY = 'auth_user:{user_id}'
+
+def _auth_user_cache_key(user_id):
+    return AUTH_USER_CACHE_KEY.format(user_id=user_id)
+
+def invalidate_auth_user(user_id):
+    cache.delete(_auth_user_cache_key(user_id))
+
+def lookup_users(identifier):
+    """Users whose username or email equals identifier, ignoring case; username matches first."""
+    identifier = identifier.strip().lower()
+    UserModel = get_user_model()
+    return (
+        UserModel._default_manager
+        .alias(username_lower=Lower('username'), email_lower=Lower('email'))
+        .filter(Q(username_lower=identifier) | Q(email_lower=identifier))
+    )
+
+class UsernameOrEmailBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(get_user_model().USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        # An email can be shared by several accounts, and one user's email can be another's
+        # username. The username match wins; anything else is ambiguous and fails like a miss.
+        identifier = username.strip().lower()
+        candidates = list(lookup_users(identifier)[:3])
+        exact = [user for user in candidates if user.username.lower() == identifier]
+        if exact:
+            user = exact[0]
+        elif len(candidates) == 1:
+            user = candidates[0]
+        else:
+            user = None
+        if user is None:
+            # Hash the password anyway so a miss costs the same as a wrong password
+            get_user_model()().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        timeout = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 0)
+        if timeout <= 0:
+            return super().get_user(user_id)
+        key = _auth_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            UserModel = get_user_model()
+            try:
+                user = UserModel._default_manager.get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(key, user, timeout)
+        return user if self.user_can_authenticate(user) else None
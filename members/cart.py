@@ -0,0 +1,203 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from .catalog import get_product_cards
+from .models import Product
+from .routers import primary
+
+# The cart is stored in the session as {"<product id>": quantity} plus 'cart_stall_id'.
+# Names, prices and images are hydrated from the catalog cache when a page needs them, so
+# a cart change only rewrites a few bytes of session data.
+CART_SESSION_KEY = 'cart'
+CART_STALL_SESSION_KEY = 'cart_stall_id'
+# {"<product id>": "12.50"}: the unit price the customer last saw for each line. Only written
+# when an item is added or a price change has been shown, never on quantity changes.
+CART_PRICES_SESSION_KEY = 'cart_prices'
+
+MAX_LINE_QUANTITY = 99  # Matches the +/- controls in order-details.html
+
+class CartError(ValueError):
+    """An invalid batch operation; the cart is left untouched."""
+
+def get_cart(session):
+    """Returns the cart as {product_id_str: quantity}, converting carts saved in the old format."""
+    cart = session.get(CART_SESSION_KEY, {})
+    if any(isinstance(quantity, dict) for quantity in cart.values()):
+        # Older sessions stored the whole product snapshot per line; keep its price as the quote
+        quoted_prices = dict(session.get(CART_PRICES_SESSION_KEY, {}))
+        for product_id, item in cart.items():
+            if isinstance(item, dict) and item.get('price') is not None:
+                quoted_prices[product_id] = str(item['price'])
+        cart = {
+            product_id: int(item['quantity']) if isinstance(item, dict) else int(item)
+            for product_id, item in cart.items()
+        }
+        session[CART_SESSION_KEY] = cart
+        session[CART_PRICES_SESSION_KEY] = quoted_prices
+    return cart
+
+def _forget_prices(session, product_ids):
+    quoted_prices = session.get(CART_PRICES_SESSION_KEY)
+    if quoted_prices and any(product_id in quoted_prices for product_id in product_ids):
+        session[CART_PRICES_SESSION_KEY] = {
+            product_id: price for product_id, price in quoted_prices.items() if product_id not in product_ids
+        }
+
+def set_quantity(session, product_id, quantity, quoted_price=None):
+    """Sets a line's quantity. quoted_price records the unit price the customer was shown."""
+    cart = get_cart(session)
+    cart[str(product_id)] = int(quantity)
+    session[CART_SESSION_KEY] = cart
+    if quoted_price is not None:
+        session[CART_PRICES_SESSION_KEY] = {**session.get(CART_PRICES_SESSION_KEY, {}), str(product_id): str(quoted_price)}
+
+def remove_item(session, product_id):
+    """Removes a line; returns False if it wasn't in the cart. An emptied cart forgets its stall."""
+    cart = get_cart(session)
+    if cart.pop(str(product_id), None) is None:
+        return False
+    session[CART_SESSION_KEY] = cart
+    _forget_prices(session, {str(product_id)})
+    if not cart:
+        session.pop(CART_STALL_SESSION_KEY, None)
+    return True
+
+def clear_cart(session):
+    session[CART_SESSION_KEY] = {}
+    session.pop(CART_STALL_SESSION_KEY, None)
+    session.pop(CART_PRICES_SESSION_KEY, None)
+
+def apply_operations(session, operations):
+    """
+    Applies a list of {"op": "set"|"remove", "product_id": ..., "quantity": ...} operations
+    to the session cart as one unit: everything is validated against a copy first and the
+    session is written at most once. Setting a quantity of 0 removes the line. Removing a
+    line that is already gone is a no-op, so a stale tab or a double click doesn't sink the
+    rest of the batch. Only lines already in the cart can be changed; new products go
+    through add_to_cart_view, which enforces the one-stall rule.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise CartError("No cart operations given.")
+    original = get_cart(session)
+    cart = dict(original)
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise CartError("Invalid cart operation.")
+        product_id = str(operation.get('product_id', ''))
+        op = operation.get('op')
+        if op not in ('set', 'remove'):
+            raise CartError(f"Unknown cart operation: {op}")
+        if op == 'remove':
+            cart.pop(product_id, None)
+            continue
+        if product_id not in cart:
+            raise CartError("Item not in cart.")
+        try:
+            quantity = int(operation.get('quantity'))
+        except (TypeError, ValueError):
+            raise CartError("Quantity must be a number.")
+        if quantity < 0 or quantity > MAX_LINE_QUANTITY:
+            raise CartError(f"Quantity must be between 0 and {MAX_LINE_QUANTITY}.")
+        if quantity:
+            cart[product_id] = quantity
+        else:
+            del cart[product_id]
+    if cart != original:
+        session[CART_SESSION_KEY] = cart
+        _forget_prices(session, original.keys() - cart.keys())
+        if not cart:
+            session.pop(CART_STALL_SESSION_KEY, None)
+
+@dataclass
+class PricedCart:
+    lines: list = field(default_factory=list)
+    total_price: Decimal = Decimal('0.00')
+    item_count: int = 0
+    changed_lines: list = field(default_factory=list)  # Lines whose price moved since the customer last saw it
+
+def _current_prices(product_ids):
+    # Cards are cached per worker, so one that saw a price change can't clear another's copy
+    with primary():
+        products = Product.objects.only('unit_price').in_bulk({int(product_id) for product_id in product_ids})
+    return {product_id: product.unit_price for product_id, product in products.items()}
+
+def _price_lines(session, current_prices=False):
+    cart = get_cart(session)
+    cards = get_product_cards(cart.keys())
+    prices = _current_prices(cart.keys()) if current_prices and cart else None
+    quoted_prices = session.get(CART_PRICES_SESSION_KEY, {})
+    priced = PricedCart()
+    for product_id, quantity in cart.items():
+        card = cards.get(int(product_id))
+        if card is None or (prices is not None and int(product_id) not in prices):
+            continue
+        price = Decimal(card['price']) if prices is None else prices[int(product_id)]
+        quoted_price = quoted_prices.get(product_id)
+        quoted_price = Decimal(quoted_price) if quoted_price is not None else price
+        line = {
+            'id': product_id,
+            'name': card['name'],
+            'stall_name': card['stall_name'],
+            'price': price,
+            'quoted_price': quoted_price,
+            'price_changed': quoted_price != price,
+            'quantity': quantity,
+            'image_url': card['image_url'],
+            'item_total': price * quantity,
+        }
+        priced.lines.append(line)
+        priced.total_price += line['item_total']
+        priced.item_count += quantity
+        if line['price_changed']:
+            priced.changed_lines.append(line)
+    if len(priced.lines) != len(cart):
+        # Products deleted since they were added drop out of the cart
+        for product_id in set(cart) - {line['id'] for line in priced.lines}:
+            remove_item(session, product_id)
+    return priced
+
+def price_cart(request, current_prices=False):
+    """
+    Hydrates and prices the request's cart with one catalog lookup. The result is kept on
+    the request and reused until the cart changes, so views, templates and JSON
+    responses in the same request don't price it twice.
+
+    Prices come from the cached product cards, which are fine for display. Pages that show
+    the amount to be charged and the checkout itself pass current_prices=True to read
+    unit prices from the primary instead (one query).
+    """
+    cached = getattr(request, '_priced_cart', None)
+    if cached is None or cached[0] != _cart_state(request.session) or (current_prices and not cached[2]):
+        priced = _price_lines(request.session, current_prices)
+        request._priced_cart = (_cart_state(request.session), priced, current_prices)
+        return priced
+    return cached[1]
+
+def _cart_state(session):
+    return tuple(get_cart(session).items()), tuple(session.get(CART_PRICES_SESSION_KEY, {}).items())
+
+def acknowledge_prices(session, priced):
+    """Records the current prices of changed lines as seen, once the change has been shown."""
+    if priced.changed_lines:
+        session[CART_PRICES_SESSION_KEY] = {
+            **session.get(CART_PRICES_SESSION_KEY, {}),
+            **{line['id']: str(line['price']) for line in priced.changed_lines},
+        }
+
+def price_change_messages(priced):
+    return [
+        f"The price of '{line['name']}' changed from ₱{line['quoted_price']:.2f} to ₱{line['price']:.2f}."
+        for line in priced.changed_lines
+    ]
+
+def cart_summary(request):
+    """JSON-ready cart state returned by the batch endpoint so the page never recomputes prices itself."""
+    priced = price_cart(request)
+    return {
+        'items': [
+            {'id': line['id'], 'quantity': line['quantity'], 'item_total': f"{line['item_total']:.2f}"}
+            for line in priced.lines
+        ],
+        'total_items': priced.item_count,
+        'total_price': f"{priced.total_price:.2f}",
+    }
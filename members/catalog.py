@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Product
+from .routers import primary
+
+# Per-product display data ("cards") shared by the cart, payment and checkout pages.
+# Sessions only keep product id -> quantity; everything shown next to a cart line comes from here.
+PRODUCT_CARD_CACHE_KEY = 'catalog:product:{product_id}'
+
+def _product_card_cache_key(product_id):
+    return PRODUCT_CARD_CACHE_KEY.format(product_id=product_id)
+
+def _build_card(product):
+    return {
+        'id': product.pk,
+        'name': product.product_name,
+        'price': product.unit_price,
+        'image_url': product.image_url or '',
+        'stall_name': product.food_stall.stall_name if product.food_stall else 'N/A',
+        'stall_id': product.food_stall_id,
+    }
+
+def get_product_cards(product_ids):
+    """
+    Returns {product_id: card} for the given ids. Cache misses are loaded from the primary
+    with a single query; products that no longer exist are simply missing from the result.
+    """
+    product_ids = {int(product_id) for product_id in product_ids}
+    if not product_ids:
+        return {}
+    keys = {_product_card_cache_key(product_id): product_id for product_id in product_ids}
+    cached = cache.get_many(keys)
+    cards = {keys[key]: card for key, card in cached.items()}
+
+    missing = product_ids - cards.keys()
+    if missing:
+        # From the primary: a card reloaded from a lagging replica right after a save would cache
+        # the old row for another CATALOG_CACHE_TIMEOUT
+        with primary():
+            products = Product.objects.select_related('food_stall').only(
+                'product_name', 'unit_price', 'image_url', 'food_stall__stall_name',
+            ).in_bulk(missing)
+        loaded = {product_id: _build_card(product) for product_id, product in products.items()}
+        cache.set_many(
+            {_product_card_cache_key(product_id): card for product_id, card in loaded.items()},
+            getattr(settings, 'CATALOG_CACHE_TIMEOUT', 300),
+        )
+        cards.update(loaded)
+    return cards
+
+def invalidate_product_cards(product_ids):
+    cache.delete_many([_product_card_cache_key(product_id) for product_id in product_ids])
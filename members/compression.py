@@ -0,0 +1,80 @@
+"""
+Response compression for HTML pages and JSON.
+
+Brotli when the client accepts it, gzip otherwise. Brotli runs at COMPRESSION_BROTLI_QUALITY
+(a mid level: most of the size win of level 11 at a fraction of its CPU cost). Responses
+that are already encoded are left alone, e.g. static files, which StaticFilesMiddleware
+sends as their pre-compressed copies. So are streaming responses and anything under
+MIN_LENGTH bytes.
+
+BREACH: as in django.middleware.gzip, gzip output carries up to 100 random bytes in its
+header. Brotli output can't be padded the same way, so HTML for requests that can reflect
+input into the page (a query string, or a method other than GET/HEAD) is sent gzipped even
+to brotli clients. CSRF tokens in pages are masked per response anyway.
+"""
+import re
+
+import brotli
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+COMPRESSIBLE_TYPES = ('text/html', 'application/json')
+MIN_LENGTH = 200  # Smaller bodies don't shrink enough to pay for the headers
+
+_accepts_br = re.compile(r'\bbr\b')
+_accepts_gzip = re.compile(r'\bgzip\b')
+
+def _brotli_quality():
+    return getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+
+def _may_reflect_input(request, response):
+    # Pages that could echo request data next to a secret get gzip and its length padding
+    return response['Content-Type'].startswith('text/html') and (
+        request.method not in ('GET', 'HEAD') or request.META.get('QUERY_STRING')
+    )
+
+def compress_response(request, response):
+    """Compresses response in place if the client and content type allow it."""
+    if response.streaming or response.has_header('Content-Encoding') or len(response.content) < MIN_LENGTH:
+        return response
+    if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+
+    accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    if _accepts_br.search(accept_encoding) and not _may_reflect_input(request, response):
+        encoding, content = 'br', brotli.compress(response.content, mode=brotli.MODE_TEXT, quality=_brotli_quality())
+    elif _accepts_gzip.search(accept_encoding):
+        encoding, content = 'gzip', compress_string(response.content, max_random_bytes=100)
+    else:
+        return response
+    if len(content) >= len(response.content):
+        return response
+
+    response.content = content
+    response['Content-Length'] = str(len(content))
+    response['Content-Encoding'] = encoding
+    # The ETag names the uncompressed page; a weak one stays valid across encodings
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    return response
+
+class CompressionMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return compress_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return compress_response(request, await self.get_response(request))
@@ -0,0 +1,16 @@
+from django.utils.functional import SimpleLazyObject
+
+from .notifications import get_unread_badge
+
+def notification_badge(request):
+    """
+    Exposes the unread notification badge to every template. Evaluated lazily so
+    pages that never render bottom_nav.html don't pay for the cache lookup.
+    """
+    def _badge():
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return {'unread_count': 0, 'latest_id': None}
+        return get_unread_badge(user.pk)
+
+    return {'notification_badge': SimpleLazyObject(_badge)}
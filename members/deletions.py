@@ -0,0 +1,180 @@
+"""
+Batched deletion of storage objects.
+
+Views and the upload worker call schedule_deletion() instead of removing images
+inline. Paths are buffered per process and flushed through the storage API's
+multi-path remove, either when a batch fills up or every few seconds. Failed
+batches are retried with backoff; anything that still fails is logged and left
+for `manage.py reconcile_product_images` to pick up.
+
+Images are content-addressed and may be shared by several products, so each path
+carries the image URL it belongs to. At flush time paths whose image is still
+referenced by a product are dropped instead of deleted. An upload that reuses an
+existing object calls cancel_deletion() first, which also waits for a batch that is
+between its reference check and the remove call.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import Product
+from .routers import primary
+from .storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def _deletion_setting(name, default):
+    return getattr(settings, name, default)
+
+
+class DeletionQueue:
+    def __init__(self, batch_size, flush_interval, max_attempts):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.pending = {}  # path -> [attempts so far, source image URL]; a dict also de-duplicates
+        self.retry_after = 0.0
+        self.removed = 0
+        self.kept_shared = 0
+        self.abandoned = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Held from a batch's reference check until it is removed
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='image-deletions', daemon=True)
+        self._thread.start()
+
+    def add(self, paths, source_url=None):
+        with self._lock:
+            for path in paths:
+                self.pending.setdefault(path, [0, source_url])
+            full = len(self.pending) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def cancel(self, source_url):
+        with self._flush_lock, self._lock:
+            self.pending = {path: entry for path, entry in self.pending.items() if entry[1] != source_url}
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if time.monotonic() >= self.retry_after:
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Image deletion flush failed")
+                finally:
+                    close_old_connections()
+
+    def flush(self):
+        """Removes everything pending in batches of batch_size. Returns the number of paths removed."""
+        removed = 0
+        while True:
+            with self._flush_lock:
+                with self._lock:
+                    batch = dict(list(self.pending.items())[:self.batch_size])
+                    for path in batch:
+                        del self.pending[path]
+                if not batch:
+                    return removed
+                batch = self._drop_shared(batch)
+                if not batch:
+                    continue
+                try:
+                    get_storage().remove(list(batch))
+                except Exception as e:
+                    self._requeue(batch, e)
+                    return removed
+            removed += len(batch)
+            with self._lock:
+                self.removed += len(batch)
+
+    def _drop_shared(self, batch):
+        # Reference count check: one query for the whole batch
+        source_urls = {source_url for _, source_url in batch.values() if source_url}
+        if not source_urls:
+            return batch
+        with primary():  # A lagging replica could miss a product that was just given this image
+            still_used = set(
+                Product.objects.filter(image_url__in=source_urls).values_list('image_url', flat=True).distinct()
+            )
+        kept = {path: entry for path, entry in batch.items() if entry[1] not in still_used}
+        with self._lock:
+            self.kept_shared += len(batch) - len(kept)
+        return kept
+
+    def _requeue(self, batch, error):
+        retry, abandoned = {}, []
+        for path, (attempts, source_url) in batch.items():
+            if attempts + 1 >= self.max_attempts:
+                abandoned.append(path)
+            else:
+                retry[path] = [attempts + 1, source_url]
+        with self._lock:
+            for path, entry in retry.items():
+                self.pending.setdefault(path, entry)
+            self.abandoned += len(abandoned)
+            # Back off the whole queue; storage is most likely unavailable
+            attempt = max((attempts for attempts, _ in retry.values()), default=0)
+            self.retry_after = time.monotonic() + self.flush_interval * (2 ** attempt)
+        logger.warning("Image deletion batch of %d failed (%s); %d will be retried", len(batch), error, len(retry))
+        if abandoned:
+            logger.error("Giving up deleting %d image(s), left for reconcile_product_images: %s",
+                         len(abandoned), ', '.join(abandoned))
+
+
+_queue = None
+_queue_pid = None
+_queue_lock = threading.Lock()
+
+
+def _get_queue():
+    global _queue, _queue_pid
+    pid = os.getpid()
+    if _queue is None or _queue_pid != pid:
+        with _queue_lock:
+            if _queue is None or _queue_pid != pid:
+                _queue = DeletionQueue(
+                    _deletion_setting('IMAGE_DELETE_BATCH_SIZE', 100),
+                    _deletion_setting('IMAGE_DELETE_FLUSH_INTERVAL', 5.0),
+                    _deletion_setting('IMAGE_DELETE_MAX_ATTEMPTS', 5),
+                )
+                _queue_pid = pid
+    return _queue
+
+
+def schedule_deletion(paths, source_url=None):
+    """
+    Queues storage paths for batched removal. Empty and None paths are ignored. With
+    source_url the paths are only removed if no product references that URL any more.
+    """
+    paths = [path for path in paths if path]
+    if paths:
+        _get_queue().add(paths, source_url)
+
+
+def cancel_deletion(source_url):
+    """
+    Takes an image (original and derivatives, as scheduled with source_url) out of this
+    process's queue before an upload reuses it, waiting for a batch that is already being
+    removed. Once it returns, this process won't remove the image.
+    """
+    if _queue is not None and _queue_pid == os.getpid():
+        _queue.cancel(source_url)
+
+
+def flush_deletions():
+    """Synchronously removes everything queued so far (used at exit, by commands and in tests)."""
+    if _queue is not None and _queue_pid == os.getpid():
+        return _queue.flush()
+    return 0
+
+
+atexit.register(flush_deletions)
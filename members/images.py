@@ -0,0 +1,126 @@
+"""
+Responsive image derivatives.
+
+For every original we build fixed-width thumbnails in modern formats (WebP, plus
+AVIF when Pillow supports it) and a tiny blurred placeholder. Derivatives are
+stored next to the original as "<stem>.w<width>.<ext>" and described by a small
+dict saved on Product.image_variants:
+
+    {
+        "placeholder": "data:image/webp;base64,...",
+        "sources": {"image/avif": [[320, url], ...], "image/webp": [[320, url], ...]},
+    }
+"""
+import base64
+import io
+import os
+
+from django.conf import settings
+from PIL import Image, ImageFilter, ImageOps, features
+
+DEFAULT_WIDTHS = (160, 320, 640, 960)
+PLACEHOLDER_WIDTH = 16
+
+# format name -> (Pillow format, content type, extension, encoder options)
+FORMATS = {
+    'avif': ('AVIF', 'image/avif', 'avif', {'quality': 50}),
+    'webp': ('WEBP', 'image/webp', 'webp', {'quality': 75, 'method': 4}),
+}
+
+
+def derivative_widths():
+    return tuple(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', DEFAULT_WIDTHS))
+
+
+def available_formats():
+    """Formats to generate, best compression first. AVIF is skipped if Pillow was built without it."""
+    wanted = getattr(settings, 'IMAGE_DERIVATIVE_FORMATS', ('avif', 'webp'))
+    return [name for name in wanted if name in FORMATS and features.check(name)]
+
+
+def derivative_path(original_path, width, format_name):
+    stem = os.path.splitext(original_path)[0]
+    return f"{stem}.w{width}.{FORMATS[format_name][2]}"
+
+
+def _open(source):
+    image = Image.open(source)
+    image = ImageOps.exif_transpose(image)  # Phone photos are often stored rotated
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    return image
+
+
+def _encode(image, format_name):
+    pillow_format, _, _, options = FORMATS[format_name]
+    buffer = io.BytesIO()
+    image.save(buffer, pillow_format, **options)
+    return buffer.getvalue()
+
+
+def _resize(image, width):
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def build_derivatives(source):
+    """
+    Returns (derivatives, placeholder) for a file path or file object. derivatives is a
+    list of (width, format_name, content_type, data). Widths larger than the original
+    are skipped; an original narrower than every width still gets one derivative.
+    """
+    image = _open(source)
+    widths = [width for width in derivative_widths() if width < image.width] or [image.width]
+    derivatives = []
+    for width in widths:
+        resized = _resize(image, width)
+        for format_name in available_formats():
+            content_type = FORMATS[format_name][1]
+            derivatives.append((width, format_name, content_type, _encode(resized, format_name)))
+
+    tiny = _resize(image, min(PLACEHOLDER_WIDTH, image.width)).filter(ImageFilter.GaussianBlur(1))
+    placeholder = 'data:image/webp;base64,' + base64.b64encode(_encode(tiny, 'webp')).decode('ascii')
+    return derivatives, placeholder
+
+
+def _variants(derivatives, placeholder, url_for):
+    sources = {}
+    for width, format_name, content_type, _ in derivatives:
+        sources.setdefault(content_type, []).append([width, url_for(width, format_name)])
+    return {'placeholder': placeholder, 'sources': sources}
+
+
+def generate_variants(storage, original_path, source):
+    """Builds derivatives for an uploaded original and stores them alongside it."""
+    derivatives, placeholder = build_derivatives(source)
+    for width, format_name, content_type, data in derivatives:
+        # Derivative keys follow the (content-addressed) original, so overwriting is safe
+        storage.upload(derivative_path(original_path, width, format_name), data, content_type, upsert=True)
+    return _variants(
+        derivatives, placeholder,
+        lambda width, format_name: storage.public_url(derivative_path(original_path, width, format_name)),
+    )
+
+
+def generate_static_variants(static_root, relative_path, output_dir='derived'):
+    """Writes derivatives for a bundled static image into a sibling <output_dir>/ folder."""
+    source = os.path.join(static_root, relative_path)
+    target_dir = os.path.join(os.path.dirname(relative_path), output_dir)
+    name = os.path.basename(relative_path)
+    derivatives, placeholder = build_derivatives(source)
+    os.makedirs(os.path.join(static_root, target_dir), exist_ok=True)
+    for width, format_name, _, data in derivatives:
+        with open(os.path.join(static_root, target_dir, derivative_path(name, width, format_name)), 'wb') as handle:
+            handle.write(data)
+    # Static variants store paths relative to STATIC_URL; the template tag resolves them
+    return _variants(
+        derivatives, placeholder,
+        lambda width, format_name: f"{target_dir}/{derivative_path(name, width, format_name)}".replace(os.sep, '/'),
+    )
+
+
+def variant_urls(variants):
+    """Every derivative URL in an image_variants dict (used when deleting an image)."""
+    if not variants:
+        return []
+    return [url for entries in variants.get('sources', {}).values() for _, url in entries]
@@ -0,0 +1,239 @@
+"""
+Scenario-based load generation against a running server (see `manage.py loadtest`).
+
+Each virtual user is a thread with its own HTTP client and cookie jar, signed in like a
+browser, so sessions, CSRF and the cart behave as they do in production:
+
+- customers loop home -> product_detail -> add_to_cart -> payment -> place_order
+- stalls poll their orders board and move one order a step forward per poll
+  through update_order_status
+
+Every request is recorded under its step name. The Recorder reports throughput,
+errors and latency percentiles per step.
+
+run_login_burst() is a separate mode for the sign-in path alone. It releases every
+sign-in at the same moment, with a mix of usernames, emails and unknown identifiers,
+and repeats that for several rounds.
+
+run_ttfb() measures time to first byte of the heaviest pages, home (customer) and the
+orders board (stall), one request at a time, with a browser's Accept-Encoding. The first
+request to each page is reported separately: it shows whether the worker still had to
+compile the templates.
+"""
+import random
+import re
+import threading
+import time
+
+import httpx
+from django.urls import reverse
+
+from .timing import percentile
+
+PRODUCT_LINK = re.compile(r'href="/product/(\d+)/"')
+STATUS_BUTTON = re.compile(r'data-order-id="(\d+)" data-new-status="([\w ]+)"')
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps = {}  # step name -> [latencies (seconds), error count]
+
+    def record(self, step, seconds, ok):
+        with self._lock:
+            timings = self.steps.setdefault(step, [[], 0])
+            timings[0].append(seconds)
+            if not ok:
+                timings[1] += 1
+
+    def summary(self, elapsed):
+        """(step, requests, errors, requests/s, p50, p95, p99, max) per step, latencies in seconds."""
+        rows = []
+        with self._lock:
+            for step, (timings, errors) in self.steps.items():
+                ordered = sorted(timings)
+                rows.append((
+                    step, len(ordered), errors, len(ordered) / elapsed,
+                    percentile(ordered, 0.50), percentile(ordered, 0.95), percentile(ordered, 0.99), ordered[-1],
+                ))
+        return rows
+
+
+class VirtualUser:
+    def __init__(self, base_url, username, password, recorder, think_time=0.5, seed=None):
+        self.client = httpx.Client(base_url=base_url, follow_redirects=False, timeout=30)
+        self.username = username
+        self.password = password
+        self.recorder = recorder
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+
+    def request(self, step, method, url, expect=200, headers=None, **kwargs):
+        """Sends and records one request; returns the response, or None if it failed or didn't match `expect`."""
+        headers = dict(headers or {})
+        if method == 'POST':
+            headers['X-CSRFToken'] = self.client.cookies.get('csrftoken', '')
+        start = time.perf_counter()
+        try:
+            response = self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(step, time.perf_counter() - start, False)
+            return None
+        ok = expect(response) if callable(expect) else response.status_code == expect
+        self.recorder.record(step, time.perf_counter() - start, ok)
+        return response if ok else None
+
+    def sign_in(self):
+        url = reverse('sign_in')
+        if self.request('sign_in_page', 'GET', url) is None:
+            return False
+        response = self.request('sign_in', 'POST', url, expect=302, data={'username': self.username, 'password': self.password})
+        return response is not None
+
+    def think(self, seconds=None):
+        time.sleep(self.rng.uniform(0, 2 * (self.think_time if seconds is None else seconds)))
+
+    def run(self, deadline):
+        try:
+            if not self.sign_in():
+                return
+            while time.monotonic() < deadline:
+                self.iteration()
+        finally:
+            self.client.close()
+
+    def iteration(self):
+        raise NotImplementedError
+
+
+class Customer(VirtualUser):
+    product_ids = None
+
+    def iteration(self):
+        home = self.request('home', 'GET', reverse('home'))
+        if home is not None and not self.product_ids:
+            self.product_ids = PRODUCT_LINK.findall(home.text)
+        if not self.product_ids:
+            self.think()
+            return
+        product_id = int(self.rng.choice(self.product_ids))
+        self.think()
+        self.request('product_detail', 'GET', reverse('product_detail', args=[product_id]))
+        self.think()
+        added = self.request(
+            'add_to_cart', 'POST', reverse('add_to_cart', args=[product_id]),
+            data={'quantity': self.rng.randint(1, 3)}, headers={'X-Requested-With': 'XMLHttpRequest'},
+        )
+        if added is None:
+            return
+        self.request('payment', 'GET', reverse('payment'))
+        self.think()
+        confirmation_url = reverse('order_confirmation')
+        self.request(
+            'place_order', 'POST', reverse('place_order'),
+            expect=lambda response: response.status_code == 302 and response.headers.get('location') == confirmation_url,
+            data={'payment_method': 'Cash', 'pickup_method': 'pickup', 'order_note': '', 'queue_number': f'L{self.rng.randint(0, 9999):04d}'},
+        )
+
+
+class Stall(VirtualUser):
+    def __init__(self, *args, poll_interval=2.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.poll_interval = poll_interval
+
+    def iteration(self):
+        board = self.request('orders', 'GET', reverse('orders'))
+        if board is not None:
+            # Accept / Mark as Ready / Mark as Completed buttons; never cancel
+            actions = [(int(order_id), status) for order_id, status in STATUS_BUTTON.findall(board.text) if status != 'Cancelled']
+            if actions:
+                order_id, status = self.rng.choice(actions)
+                self.request(
+                    'update_order_status', 'POST', reverse('update_order_status', args=[order_id]),
+                    data={'status': status}, headers={'X-Requested-With': 'XMLHttpRequest'},
+                )
+        self.think(self.poll_interval)
+
+
+def run_scenarios(base_url, customers, stalls, password, duration, think_time=0.5, poll_interval=2.0, seed=0):
+    """Runs the virtual users for `duration` seconds; returns (Recorder, elapsed seconds)."""
+    recorder = Recorder()
+    users = [
+        Customer(base_url, username, password, recorder, think_time=think_time, seed=seed + index)
+        for index, username in enumerate(customers)
+    ] + [
+        Stall(base_url, username, password, recorder, think_time=think_time, poll_interval=poll_interval, seed=seed - index - 1)
+        for index, username in enumerate(stalls)
+    ]
+    start = time.monotonic()
+    deadline = start + duration
+    threads = [threading.Thread(target=user.run, args=(deadline,), daemon=True) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.monotonic() - start
+
+
+def run_login_burst(base_url, attempts, password, rounds=5, seed=0):
+    """
+    Signs in with every (step, identifier, expected status) in attempts at once, `rounds`
+    times, each from a fresh session; returns (Recorder, elapsed seconds).
+    """
+    recorder = Recorder()
+    barrier = threading.Barrier(len(attempts))
+
+    def attempt(index, step, identifier, expect):
+        for _ in range(rounds):
+            user = VirtualUser(base_url, identifier, password, recorder, seed=seed + index)
+            try:
+                page = user.request('sign_in_page', 'GET', reverse('sign_in'))  # For the CSRF cookie
+                barrier.wait()  # Always reached, so one failed page load doesn't strand the others
+                if page is not None:
+                    user.request(step, 'POST', reverse('sign_in'), expect=expect, data={'username': identifier, 'password': password})
+            finally:
+                user.client.close()
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=attempt, args=(index, *spec), daemon=True) for index, spec in enumerate(attempts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.monotonic() - start
+
+
+def run_ttfb(base_url, customer, stall, password, samples=50):
+    """
+    Requests home as `customer` and orders as `stall`, `samples` times each, sequentially;
+    returns (Recorder, elapsed seconds, {page: bytes on the wire, Content-Encoding}).
+    Steps are '<page>_first', '<page>_ttfb' (headers and first body bytes) and '<page>' (full response).
+    """
+    recorder = Recorder()
+    wire = {}
+    pages = [('home', customer, reverse('home')), ('orders', stall, reverse('orders'))]
+    start = time.monotonic()
+    for page, username, url in pages:
+        user = VirtualUser(base_url, username, password, recorder)
+        try:
+            if not user.sign_in():
+                continue
+            for sample in range(samples + 1):
+                begin = time.perf_counter()
+                try:
+                    with user.client.stream('GET', url, headers={'Accept-Encoding': 'br, gzip'}) as response:
+                        chunks = response.iter_raw()
+                        body = next(chunks, b'')
+                        first_byte = time.perf_counter() - begin
+                        body += b''.join(chunks)
+                except httpx.HTTPError:
+                    recorder.record(f'{page}_ttfb', time.perf_counter() - begin, False)
+                    continue
+                ok = response.status_code == 200
+                recorder.record(f'{page}_first' if sample == 0 else f'{page}_ttfb', first_byte, ok)
+                if sample:
+                    recorder.record(page, time.perf_counter() - begin, ok)
+                wire[page] = (len(body), response.headers.get('Content-Encoding', 'identity'))
+        finally:
+            user.client.close()
+    return recorder, time.monotonic() - start, wire
@@ -0,0 +1,58 @@
+import statistics
+import time
+
+from django.core import signals
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from members.timing import timing_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures per-request database connection overhead by replaying the request "
+        "lifecycle (request_started, one query, request_finished) with CONN_MAX_AGE=0 "
+        "(a new connection per request, the old behaviour) and with persistent connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--conn-max-age', type=int, default=60, help="CONN_MAX_AGE used for the persistent run.")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        settings_dict = connection.settings_dict
+        original_max_age = settings_dict['CONN_MAX_AGE']
+        self.stdout.write(
+            f"Database {settings_dict['HOST'] or 'local'}:{settings_dict['PORT'] or '-'} "
+            f"({connection.vendor}), server-side cursors "
+            f"{'off' if settings_dict.get('DISABLE_SERVER_SIDE_CURSORS') else 'on'}"
+        )
+        try:
+            connection.close()
+            settings_dict['CONN_MAX_AGE'] = 0
+            per_request = self._run(connection, options['iterations'])
+            settings_dict['CONN_MAX_AGE'] = options['conn_max_age']
+            persistent = self._run(connection, options['iterations'])
+        finally:
+            settings_dict['CONN_MAX_AGE'] = original_max_age
+            connection.close()
+
+        self.stdout.write(timing_summary('new connection', per_request))
+        self.stdout.write(timing_summary('persistent', persistent))
+        saved = statistics.mean(per_request) - statistics.mean(persistent)
+        self.stdout.write(self.style.SUCCESS(f"Mean saving per request: {saved * 1000:.1f} ms"))
+
+    def _run(self, connection, iterations):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            # Same hooks Django runs around every request: close_old_connections() on both signals
+            signals.request_started.send(sender=self.__class__)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            signals.request_finished.send(sender=self.__class__)
+            timings.append(time.perf_counter() - start)
+        return timings
@@ -0,0 +1,49 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from members import storage
+from members.timing import timing_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Times image upload + delete through the storage service. Compares the pooled, "
+        "process-wide client with building a new client per call (the old behaviour). "
+        "Run with STORAGE_BACKEND=fake to benchmark offline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--size-kb', type=int, default=256, help="Payload size of each fake image.")
+        parser.add_argument('--prefix', default='benchmark', help="Bucket folder used for the test objects.")
+
+    def handle(self, *args, **options):
+        payload = b'\0' * (options['size_kb'] * 1024)
+        iterations = options['iterations']
+
+        fresh = self._run(lambda: storage._build_backend(), payload, iterations, options['prefix'], close_each=True)
+        storage.reset_storage()
+        pooled = self._run(storage.get_storage, payload, iterations, options['prefix'], close_each=False)
+
+        for label, timings in (('client per call', fresh), ('pooled client', pooled)):
+            if timings:
+                self.stdout.write(timing_summary(label, timings))
+        if pooled and fresh:
+            saved = statistics.mean(fresh) - statistics.mean(pooled)
+            self.stdout.write(self.style.SUCCESS(f"Mean saving per upload+delete: {saved * 1000:.1f} ms"))
+
+    def _run(self, get_backend, payload, iterations, prefix, close_each):
+        timings = []
+        for _ in range(iterations):
+            path = f"{prefix}/{uuid.uuid4()}.bin"
+            start = time.perf_counter()
+            backend = get_backend()
+            backend.upload(path, payload, 'application/octet-stream')
+            backend.remove([path])
+            if close_each:
+                backend.close()
+            timings.append(time.perf_counter() - start)
+        return timings
@@ -0,0 +1,93 @@
+import io
+import json
+import os
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from members.images import generate_static_variants, generate_variants
+from members.models import Product
+from members.storage import get_storage
+from members.templatetags.image_tags import STATIC_IMAGE_DIR, STATIC_MANIFEST
+from members.versions import bump_versions
+
+STATIC_IMAGE_TAG = re.compile(r"""{%\s*static_image\s+['"]([^'"]+)['"]""")
+
+
+def _referenced_static_images():
+    """Static image paths used through {% static_image %}; other bundled images get no derivatives."""
+    paths = set()
+    for template_dir in (Path(settings.BASE_DIR) / 'members' / 'templates', Path(settings.BASE_DIR) / 'templates'):
+        for template in template_dir.rglob('*.html'):
+            paths.update(STATIC_IMAGE_TAG.findall(template.read_text(encoding='utf-8')))
+    return paths
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills thumbnails (WebP/AVIF) and blur placeholders for existing product images "
+        "and for the bundled images templates show with {% static_image %}. New uploads get them automatically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', action='store_true', help="Only process product images.")
+        parser.add_argument('--static', action='store_true', help="Only process bundled static images.")
+        parser.add_argument('--force', action='store_true', help="Rebuild products that already have derivatives.")
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        do_all = not options['products'] and not options['static']
+        if do_all or options['static']:
+            self._backfill_static()
+        if do_all or options['products']:
+            self._backfill_products(options['force'], options['batch_size'])
+
+    def _backfill_static(self):
+        manifest = {}
+        original_bytes = derivative_bytes = 0
+        for relative_path in sorted(_referenced_static_images()):
+            variants = generate_static_variants(STATIC_IMAGE_DIR, relative_path)
+            manifest[relative_path] = variants
+            original_bytes += os.path.getsize(os.path.join(STATIC_IMAGE_DIR, relative_path))
+            smallest_webp = variants['sources']['image/webp'][0][1]
+            derivative_bytes += os.path.getsize(os.path.join(STATIC_IMAGE_DIR, smallest_webp))
+        with open(STATIC_MANIFEST, 'w') as handle:
+            json.dump(manifest, handle, indent=1, sort_keys=True)
+        # Drop derivatives of images no template references any more
+        kept = {path for variants in manifest.values() for entries in variants['sources'].values() for _, path in entries}
+        derived_dir = os.path.dirname(STATIC_MANIFEST)
+        for name in os.listdir(derived_dir):
+            if name != os.path.basename(STATIC_MANIFEST) and f"img/derived/{name}" not in kept:
+                os.remove(os.path.join(derived_dir, name))
+        self.stdout.write(self.style.SUCCESS(
+            f"Static images: {len(manifest)} processed, originals {original_bytes // 1024} KB, "
+            f"smallest WebP thumbnails {derivative_bytes // 1024} KB."
+        ))
+
+    def _backfill_products(self, force, batch_size):
+        storage = get_storage()
+        products = Product.objects.exclude(image_url__isnull=True).exclude(image_url='').order_by('pk')
+        if not force:
+            products = products.filter(image_variants__isnull=True)
+        done = skipped = failed = 0
+        for product in products.only('pk', 'image_url').iterator(chunk_size=batch_size):
+            original_path = storage.path_from_url(product.image_url)
+            if not original_path:
+                skipped += 1  # Not stored in our bucket
+                continue
+            try:
+                variants = generate_variants(storage, original_path, io.BytesIO(storage.download(original_path)))
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Product {product.pk}: {e}")
+                continue
+            # Only patch if the image wasn't replaced while we were working on it
+            if Product.objects.filter(pk=product.pk, image_url=product.image_url).update(image_variants=variants, updated_at=timezone.now()):
+                bump_versions(['catalog', f'product:{product.pk}'])  # update() skips the post_save receivers
+            done += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Product images: {done} processed, {skipped} skipped, {failed} failed."
+        ))
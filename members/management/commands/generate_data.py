@@ -0,0 +1,292 @@
+import bisect
+import io
+import json
+import random
+from contextlib import contextmanager
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+from members.models import FoodStall, Notification, Order, OrderItem, Payment, Product, Review, User
+
+# Presets for --size; any count can be overridden individually
+SIZES = {
+    'small': {'stalls': 20, 'products': 400, 'customers': 1_000, 'orders': 20_000},
+    'medium': {'stalls': 200, 'products': 10_000, 'customers': 20_000, 'orders': 500_000},
+    'large': {'stalls': 2_000, 'products': 200_000, 'customers': 200_000, 'orders': 10_000_000},
+}
+CATEGORIES = ['Breakfast', 'Lunch', 'Dinner', 'Chicken', 'Pork', 'Beef', 'Pasta', 'Rice', 'Snacks', 'Drinks & Beverages']
+DISHES = ['Adobo', 'Sinigang', 'Tapsilog', 'Pancit', 'Lumpia', 'Sisig', 'Carbonara', 'Fried Chicken', 'Lechon Kawali',
+          'Bulalo', 'Kare-Kare', 'Halo-Halo', 'Turon', 'Iced Tea', 'Garlic Rice', 'Burger Steak', 'Spaghetti', 'Siomai']
+PAYMENT_METHODS = ['Cash', 'GCash', 'Card']
+OPEN_STATUSES = ['Pending', 'Preparing', 'Ready']
+# Share of the day's orders by hour (campus food court): breakfast, a sharp lunch peak, dinner
+HOUR_WEIGHTS = list(accumulate([0, 0, 0, 0, 0, 0, 1, 3, 4, 3, 4, 12, 20, 14, 5, 3, 4, 7, 9, 6, 3, 1, 0, 0]))
+RATING_WEIGHTS = list(accumulate([3, 4, 10, 33, 50]))  # 1..5 stars
+
+
+def _cumulative_zipf(count, exponent):
+    """Cumulative weights where rank r is picked in proportion to 1 / r**exponent."""
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def _pick(rng, cumulative):
+    return bisect.bisect(cumulative, rng.random() * cumulative[-1])
+
+
+def _copy_text(value):
+    """One value in PostgreSQL COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class Loader:
+    """
+    Buffers rows (dicts of field attnames) for one model and writes them in batches:
+    COPY ... FROM STDIN on PostgreSQL, bulk_create elsewhere. Fields a row leaves out
+    get their model default, and auto_now fields the time the loader was created.
+    """
+
+    def __init__(self, model, use_copy):
+        self.model = model
+        self.use_copy = use_copy
+        self.fields = [field for field in model._meta.concrete_fields if not field.generated]
+        # COPY bypasses pre_save, so auto_now columns (updated_at) get the load time here
+        now = timezone.now()
+        self.defaults = {
+            field.attname: now if getattr(field, 'auto_now', False) else field.get_default() for field in self.fields
+        }
+        self.rows = []
+        self.written = 0
+
+    def add(self, **row):
+        self.rows.append(row)
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.use_copy:
+            buffer = io.StringIO()
+            for row in self.rows:
+                buffer.write('\t'.join(_copy_text(row.get(field.attname, self.defaults[field.attname])) for field in self.fields))
+                buffer.write('\n')
+            buffer.seek(0)
+            table = connection.ops.quote_name(self.model._meta.db_table)
+            columns = ', '.join(connection.ops.quote_name(field.column) for field in self.fields)
+            sql = f'COPY {table} ({columns}) FROM STDIN'
+            with connection.cursor() as cursor:
+                raw = cursor.cursor
+                if hasattr(raw, 'copy'):  # psycopg 3
+                    with raw.copy(sql) as copy:
+                        copy.write(buffer.getvalue())
+                else:  # psycopg2
+                    raw.copy_expert(sql, buffer)
+        else:
+            self.model.objects.bulk_create(self.model(**{**self.defaults, **row}) for row in self.rows)
+        self.written += len(self.rows)
+        self.rows = []
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    # bulk_create would overwrite generated order/review/notification times with now()
+    fields = [field for model in models for field in model._meta.concrete_fields if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a reproducible synthetic dataset for benchmarking: stall owners, stalls, products, "
+        "customers, and orders with their payments, items, reviews and notifications. Stall, product and "
+        "customer popularity follow a Zipf distribution and order times peak at lunch. Rows are added "
+        "after the existing ones; loads with COPY on PostgreSQL and batched bulk_create elsewhere."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', choices=SIZES, default='small')
+        parser.add_argument('--stalls', type=int)
+        parser.add_argument('--products', type=int, help="Total products, spread over the stalls.")
+        parser.add_argument('--customers', type=int)
+        parser.add_argument('--orders', type=int)
+        parser.add_argument('--days', type=int, default=90, help="Orders are spread over this many past days.")
+        parser.add_argument('--skew', type=float, default=1.1, help="Zipf exponent for stall, product and customer popularity.")
+        parser.add_argument('--review-rate', type=float, default=0.15, help="Share of completed orders that get a review.")
+        parser.add_argument('--batch-size', type=int, default=20_000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--no-copy', action='store_true', help="Use bulk_create on PostgreSQL too.")
+
+    def handle(self, *args, **options):
+        counts = {name: options[name] if options[name] is not None else value for name, value in SIZES[options['size']].items()}
+        if min(counts.values()) < 1 or counts['products'] < counts['stalls']:
+            raise CommandError("Every count must be positive and there must be at least one product per stall.")
+        use_copy = connection.vendor == 'postgresql' and not options['no_copy']
+        rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.loaders = {model: Loader(model, use_copy) for model in (User, FoodStall, Product, Payment, Order, OrderItem, Review, Notification)}
+        self.next_id = {model: (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1 for model in self.loaders if model is not FoodStall}
+
+        self.stdout.write(
+            f"Generating {counts['stalls']:,} stalls, {counts['products']:,} products, {counts['customers']:,} customers "
+            f"and {counts['orders']:,} orders (seed {options['seed']}, {'COPY' if use_copy else 'bulk_create'})"
+        )
+        with explicit_timestamps(Payment, Order, Review, Notification):
+            stall_ids, products = self._catalog(rng, counts['stalls'], counts['products'])
+            customer_ids = self._users(rng, counts['customers'], 'customer')
+            self._orders(rng, counts['orders'], stall_ids, products, customer_ids, options)
+
+        if connection.vendor == 'postgresql':
+            # Explicit ids were written; move the sequences past them
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), list(self.next_id)):
+                    cursor.execute(sql)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for model, loader in self.loaders.items():
+            self.stdout.write(f"{model._meta.db_table:>14}: {loader.written:,} rows")
+
+    def _take_ids(self, model, count):
+        start = self.next_id[model]
+        self.next_id[model] += count
+        return range(start, start + count)
+
+    def _write(self, *models):
+        for model in models:
+            self.loaders[model].flush()
+
+    def _users(self, rng, count, user_type):
+        ids = self._take_ids(User, count)
+        joined = timezone.now() - timedelta(days=365)
+        loader = self.loaders[User]
+        for user_id in ids:
+            loader.add(
+                id=user_id, username=f'gen-{user_type}-{user_id}', email=f'gen-{user_type}-{user_id}@example.com',
+                first_name=f'{user_type.title()} {user_id}', password='!', user_type=user_type,  # '!' = unusable password
+                date_joined=joined + timedelta(minutes=rng.randrange(525_600)),
+            )
+            if len(loader.rows) >= self.batch_size:
+                self._write(User)
+        self._write(User)
+        return ids
+
+    def _catalog(self, rng, stall_count, product_count):
+        """Stall owners, stalls and products; returns stall ids and {stall id: [(product id, price in cents)]}."""
+        stall_ids = self._users(rng, stall_count, 'shop')
+        for stall_id in stall_ids:
+            self.loaders[FoodStall].add(owner_id=stall_id, stall_name=f'{rng.choice(DISHES)} House {stall_id}',
+                                        service_type=rng.choice(['Pickup', 'Pickup', 'Both']))
+        self._write(FoodStall)
+
+        products = {}
+        product_ids = iter(self._take_ids(Product, product_count))
+        loader = self.loaders[Product]
+        for index, stall_id in enumerate(stall_ids):
+            # Spread the products as evenly as possible; every stall gets at least one
+            share = product_count // stall_count + (1 if index < product_count % stall_count else 0)
+            menu = products[stall_id] = []
+            for _ in range(share):
+                product_id = next(product_ids)
+                cents = rng.randrange(30, 250) * 100
+                menu.append((product_id, cents))
+                loader.add(id=product_id, product_name=f'{rng.choice(DISHES)} #{product_id}', unit_price=Decimal(cents) / 100,
+                           category=rng.choice(CATEGORIES), food_stall_id=stall_id)
+            if len(loader.rows) >= self.batch_size:
+                self._write(Product)
+        self._write(Product)
+        return list(stall_ids), products
+
+    def _order_time(self, rng, now, days):
+        day = now.date() - timedelta(days=rng.randrange(days))
+        hour = _pick(rng, HOUR_WEIGHTS)
+        moment = timezone.make_aware(datetime.combine(day, dt_time(hour)), timezone.get_current_timezone())
+        moment += timedelta(seconds=rng.randrange(3600))
+        return moment if moment <= now else moment - timedelta(days=1)  # Later today hasn't happened yet
+
+    def _orders(self, rng, order_count, stall_ids, products, customer_ids, options):
+        # Popularity ranks are shuffled so the busiest stall or customer isn't always the first id
+        stall_rank = rng.sample(stall_ids, len(stall_ids))
+        customer_rank = rng.sample(list(customer_ids), len(customer_ids))
+        stall_weights = _cumulative_zipf(len(stall_rank), options['skew'])
+        customer_weights = _cumulative_zipf(len(customer_rank), options['skew'])
+        menu_weights = {}  # menu length -> cumulative weights; the first dishes of each menu sell most
+        now = timezone.now()
+        recent = now - timedelta(hours=1)
+
+        payment_ids = iter(self._take_ids(Payment, order_count))
+        item_id = self.next_id[OrderItem]
+        review_id = self.next_id[Review]
+        notification_id = self.next_id[Notification]
+        loaders = self.loaders
+        for order_id in self._take_ids(Order, order_count):
+            stall_id = stall_rank[_pick(rng, stall_weights)]
+            customer_id = customer_rank[_pick(rng, customer_weights)]
+            ordered_at = self._order_time(rng, now, options['days'])
+            if ordered_at >= recent:
+                status = rng.choice(OPEN_STATUSES)
+            else:
+                status = 'Cancelled' if rng.random() < 0.04 else 'Completed'
+
+            menu = products[stall_id]
+            weights = menu_weights.get(len(menu)) or menu_weights.setdefault(len(menu), _cumulative_zipf(len(menu), options['skew']))
+            lines = {}
+            for _ in range(min(len(menu), rng.choice((1, 1, 2, 2, 3, 4)))):
+                product_id, cents = menu[_pick(rng, weights)]
+                lines[product_id] = (cents, lines.get(product_id, (cents, 0))[1] + rng.choice((1, 1, 1, 2)))
+            total = Decimal(sum(cents * quantity for cents, quantity in lines.values())) / 100
+
+            payment_id = next(payment_ids)
+            loaders[Payment].add(
+                id=payment_id, payment_method=rng.choice(PAYMENT_METHODS),
+                payment_status='Paid' if status == 'Completed' else 'Pending', payment_time=ordered_at,
+            )
+            loaders[Order].add(
+                id=order_id, customer_id=customer_id, order_time=ordered_at, order_price=total, total_price=total,
+                order_type='P', queue_id=f'{chr(65 + order_id % 26)}{order_id % 10000:04d}', payment_id=payment_id,
+                food_stall_id=stall_id, status=status,
+                customer_acknowledged_at=ordered_at + timedelta(minutes=30) if status == 'Completed' else None,
+            )
+            for product_id, (cents, quantity) in lines.items():
+                loaders[OrderItem].add(id=item_id, order_id=order_id, product_id=product_id, quantity=quantity,
+                                       price=Decimal(cents) / 100, food_stall_id=stall_id)
+                item_id += 1
+            # One notification per status change the customer has seen
+            if status in OPEN_STATUSES:
+                steps = OPEN_STATUSES[1:OPEN_STATUSES.index(status) + 1]
+            else:
+                steps = ['Preparing', 'Ready', 'Completed'] if status == 'Completed' else ['Cancelled']
+            for minutes, step in enumerate(steps, start=1):
+                loaders[Notification].add(
+                    id=notification_id, user_id=customer_id, order_id=order_id, timestamp=ordered_at + timedelta(minutes=5 * minutes),
+                    message=f'The status of your order #{order_id} has been updated to: {step}.', is_read=ordered_at < recent,
+                )
+                notification_id += 1
+            if status == 'Completed' and rng.random() < options['review_rate']:
+                loaders[Review].add(
+                    id=review_id, customer_id=customer_id, product_id=next(iter(lines)), order_id=order_id,
+                    rating=_pick(rng, RATING_WEIGHTS) + 1, created_at=ordered_at + timedelta(hours=rng.randrange(1, 48)),
+                )
+                review_id += 1
+
+            if len(loaders[Order].rows) >= self.batch_size:
+                # Parents before children: each COPY commits on its own and foreign keys are checked then
+                self._write(Payment, Order, OrderItem, Review, Notification)
+        self._write(Payment, Order, OrderItem, Review, Notification)
+        self.next_id.update({OrderItem: item_id, Review: review_id, Notification: notification_id})
@@ -0,0 +1,165 @@
+import os
+import subprocess
+import sys
+import time
+from decimal import Decimal
+from urllib.parse import urlsplit
+
+import httpx
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from members.loadtest import run_login_burst, run_scenarios, run_ttfb
+from members.models import FoodStall, Product, User
+
+LOCAL_HOSTS = ('', 'localhost', '127.0.0.1', '::1')
+
+
+def _email(username):
+    return f'{username}@loadtest.invalid'
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives peak-hour style traffic at a local server: customers browse, add to cart and "
+        "check out while stalls poll their order board and advance orders. Reports throughput "
+        "and latency percentiles per step. Use with DJANGO_SETTINGS_MODULE=GoldenBites.settings_local "
+        "so the server runs on a local database and fake image storage. With --login-burst it "
+        "instead signs every customer in at once, by username, email or an unknown identifier, "
+        "for --rounds rounds; with --ttfb it measures time to first byte of home and the orders "
+        "board, --samples requests each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--start-server', action='store_true', help="Start gunicorn on --base-url for the run.")
+        parser.add_argument('--workers', type=int, default=4, help="gunicorn workers with --start-server.")
+        parser.add_argument(
+            '--server', choices=['wsgi', 'asgi'], default='wsgi',
+            help="With --start-server: sync WSGI workers, or uvicorn ASGI workers as deployed (see Procfile).",
+        )
+        parser.add_argument('--prepare', action='store_true', help="Create the load-test accounts, stalls and products first.")
+        parser.add_argument('--customers', type=int, default=20, help="Concurrent customer sessions.")
+        parser.add_argument('--stalls', type=int, default=3, help="Concurrent stall sessions.")
+        parser.add_argument('--products-per-stall', type=int, default=20)
+        parser.add_argument('--duration', type=float, default=60, help="Seconds to run.")
+        parser.add_argument('--think-time', type=float, default=0.5, help="Mean pause between a user's steps (seconds).")
+        parser.add_argument('--poll-interval', type=float, default=2, help="Mean pause between order board polls.")
+        parser.add_argument('--password', default='loadtest-password')
+        parser.add_argument('--seed', type=int, default=41)
+        parser.add_argument('--login-burst', action='store_true', help="Benchmark simultaneous sign-ins instead of the scenarios.")
+        parser.add_argument('--rounds', type=int, default=5, help="Bursts to run with --login-burst.")
+        parser.add_argument('--ttfb', action='store_true', help="Measure time to first byte of home and orders instead of the scenarios.")
+        parser.add_argument('--samples', type=int, default=50, help="Requests per page with --ttfb.")
+
+    def handle(self, *args, **options):
+        customers = [f'loadtest-customer-{i}' for i in range(options['customers'])]
+        stalls = [f'loadtest-stall-{i}' for i in range(options['stalls'])]
+        if options['prepare']:
+            self._check_local_database()
+            self._prepare(customers, stalls, options['password'], options['products_per_stall'])
+
+        server = self._start_server(options['base_url'], options['workers'], options['server']) if options['start_server'] else None
+        try:
+            if options['login_burst']:
+                self.stdout.write(
+                    f"Signing {len(customers)} customers in at once against {options['base_url']}, "
+                    f"{options['rounds']} rounds"
+                )
+                recorder, elapsed = run_login_burst(
+                    options['base_url'], self._login_attempts(customers), options['password'],
+                    rounds=options['rounds'], seed=options['seed'],
+                )
+            elif options['ttfb']:
+                self.stdout.write(f"Measuring time to first byte against {options['base_url']}, {options['samples']} requests per page")
+                recorder, elapsed, wire = run_ttfb(
+                    options['base_url'], customers[0], stalls[0], options['password'], samples=options['samples'],
+                )
+                for page, (size, encoding) in wire.items():
+                    self.stdout.write(f"{page}: {size} bytes on the wire ({encoding})")
+            else:
+                self.stdout.write(
+                    f"Running {len(customers)} customers and {len(stalls)} stalls against "
+                    f"{options['base_url']} for {options['duration']:.0f}s"
+                )
+                recorder, elapsed = run_scenarios(
+                    options['base_url'], customers, stalls, options['password'], options['duration'],
+                    think_time=options['think_time'], poll_interval=options['poll_interval'], seed=options['seed'],
+                )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+        self._report(recorder.summary(elapsed))
+
+    def _login_attempts(self, customers):
+        # A third each by username, by email in different case, and by an account that doesn't exist
+        attempts = []
+        for index, username in enumerate(customers):
+            if index % 3 == 0:
+                attempts.append(('sign_in_username', username, 302))
+            elif index % 3 == 1:
+                attempts.append(('sign_in_email', _email(username).upper(), 302))
+            else:
+                attempts.append(('sign_in_unknown', f'nobody-{index}@loadtest.invalid', 200))
+        return attempts
+
+    def _check_local_database(self):
+        # --prepare writes accounts; never against the hosted database
+        if connection.vendor != 'sqlite' and connection.settings_dict['HOST'] not in LOCAL_HOSTS:
+            raise CommandError(
+                f"Refusing to create load-test data on {connection.settings_dict['HOST']}; "
+                "use DJANGO_SETTINGS_MODULE=GoldenBites.settings_local."
+            )
+
+    def _prepare(self, customers, stalls, password, products_per_stall):
+        password_hash = make_password(password)
+        for username in customers:
+            User.objects.update_or_create(username=username, defaults={'password': password_hash, 'email': _email(username), 'user_type': 'customer'})
+        for index, username in enumerate(stalls):
+            owner, _ = User.objects.update_or_create(username=username, defaults={'password': password_hash, 'email': _email(username), 'user_type': 'shop'})
+            stall, _ = FoodStall.objects.get_or_create(owner=owner, defaults={'stall_name': f'Load Test Stall {index}'})
+            missing = products_per_stall - stall.product_set.count()
+            Product.objects.bulk_create(
+                Product(product_name=f'Load Test Dish {index}-{i}', unit_price=Decimal(50 + 5 * (i % 20)), category='Lunch', food_stall=stall)
+                for i in range(max(0, missing))
+            )
+        self.stdout.write(f"Prepared {len(customers)} customers and {len(stalls)} stalls with {products_per_stall} products each")
+
+    def _start_server(self, base_url, workers, interface):
+        address = urlsplit(base_url)
+        # Pages link the hashed static bundles from the manifest, as in production
+        call_command('collectstatic', interactive=False, verbosity=0)
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        if interface == 'asgi':
+            app = ['GoldenBites.asgi:application', '--worker-class', 'uvicorn_worker.UvicornWorker']
+        else:
+            app = ['GoldenBites.wsgi:application']
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', *app,
+             '--bind', address.netloc, '--workers', str(workers), '--log-level', 'warning'],
+            cwd=settings.BASE_DIR, env=env,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {server.returncode}")
+            try:
+                httpx.get(base_url, timeout=1)
+                return server
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f"Server at {base_url} did not come up within 30s")
+
+    def _report(self, rows):
+        self.stdout.write(f"{'step':>20} {'requests':>8} {'errors':>6} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+        for step, requests, errors, rate, p50, p95, p99, slowest in rows:
+            line = (
+                f"{step:>20} {requests:>8} {errors:>6} {rate:>7.1f} {p50 * 1000:>6.0f}ms "
+                f"{p95 * 1000:>6.0f}ms {p99 * 1000:>6.0f}ms {slowest * 1000:>6.0f}ms"
+            )
+            self.stdout.write(self.style.ERROR(line) if errors else line)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from members.images import variant_urls
+from members.models import Product
+from members.storage import get_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Lists the product image bucket, diffs it against Product.image_url/image_variants "
+        "and removes orphaned objects in bulk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report orphans without deleting them.")
+        parser.add_argument(
+            '--min-age-minutes', type=int, default=60,
+            help="Ignore objects newer than this; background uploads may not have patched their product yet.",
+        )
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--prefix', default='', help="Only reconcile objects under this folder.")
+
+    def handle(self, *args, **options):
+        storage = get_storage()
+        referenced = self._referenced_paths(storage)
+        cutoff = timezone.now() - timedelta(minutes=options['min_age_minutes'])
+
+        orphans, too_new, listed = [], 0, 0
+        for path, created_at in storage.list_objects(options['prefix']):
+            listed += 1
+            if path in referenced:
+                continue
+            if created_at is not None and created_at > cutoff:
+                too_new += 1
+                continue
+            orphans.append(path)
+
+        self.stdout.write(
+            f"{listed} objects listed, {len(referenced)} referenced, {len(orphans)} orphaned, "
+            f"{too_new} unreferenced but too new to touch."
+        )
+        if options['dry_run']:
+            for path in orphans:
+                self.stdout.write(f"  would remove {path}")
+            return
+
+        removed = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(orphans), batch_size):
+            batch = orphans[start:start + batch_size]
+            try:
+                storage.remove(batch)  # One multi-path request per batch; retries live in the storage client
+            except Exception as e:
+                self.stderr.write(f"Failed to remove batch starting at {batch[0]}: {e}")
+                continue
+            removed += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} orphaned object(s)."))
+
+    def _referenced_paths(self, storage):
+        referenced = set()
+        rows = Product.objects.exclude(image_url__isnull=True).values_list('image_url', 'image_variants')
+        for image_url, image_variants in rows.iterator(chunk_size=2000):
+            for url in [image_url, *variant_urls(image_variants)]:
+                path = storage.path_from_url(url)
+                if path:
+                    referenced.add(path)
+        return referenced
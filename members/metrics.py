@@ -0,0 +1,305 @@
+"""
+Per-request latency and SQL instrumentation.
+
+MetricsMiddleware times every request and, for a sampled fraction of them
+(METRICS_SAMPLE_RATE), also records SQL query count and time (through
+members/sqlhooks.py, so queries from sync_to_async threads count too), template
+render time and storage (Supabase) call latency. Everything is aggregated per URL name into in-process histograms that
+metrics_view renders in the Prometheus text format. The background image upload pipeline
+(members/uploads.py) reports its job outcomes, latency and queue depth to the same registry.
+
+Each worker process keeps its own registry, so with several gunicorn workers every
+scrape sees one worker; the `pid` label keeps their series apart.
+
+The middleware runs natively in both stacks (WSGI and ASGI), so async views are
+measured without a sync/async hop.
+"""
+import os
+import random
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .sqlhooks import sql_wrapper
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+# Upper bounds of the per-request query count histogram
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, float('inf'))
+# Upper bounds (seconds) of the image upload histograms; an upload includes building its derivatives
+UPLOAD_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30, float('inf'))
+
+
+def _metrics_setting(name, default):
+    return getattr(settings, name, default)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}  # labels tuple -> [bucket counts..., sum, count]
+
+    def observe(self, value, labels):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series.setdefault(labels, [0] * len(self.buckets) + [0.0, 0])
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self, label_names, pid):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self.series.items()):
+            label_text = ','.join(f'{name}="{value}"' for name, value in zip(label_names, labels))
+            label_text = f'{label_text},pid="{pid}"' if label_text else f'pid="{pid}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {series[-2]:.6f}')
+            lines.append(f'{self.name}_count{{{label_text}}} {series[-1]}')
+        return lines
+
+    def reset(self):
+        self.series.clear()
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.series = {}  # labels tuple -> count
+
+    def inc(self, labels, amount=1):
+        self.series[labels] = self.series.get(labels, 0) + amount
+
+    def render(self, label_names, pid):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, count in sorted(self.series.items()):
+            label_text = ''.join(f'{name}="{value}",' for name, value in zip(label_names, labels))
+            lines.append(f'{self.name}{{{label_text}pid="{pid}"}} {count}')
+        return lines
+
+    def reset(self):
+        self.series.clear()
+
+
+class Gauge:
+    """A value read when the registry is rendered, from the function passed to set_function()."""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.function = None
+
+    def set_function(self, function):
+        self.function = function
+
+    def render(self, label_names, pid):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        if self.function is not None:
+            lines.append(f'{self.name}{{pid="{pid}"}} {self.function()}')
+        return lines
+
+    def reset(self):
+        pass
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.metrics = {}  # name -> (Histogram/Counter/Gauge, label names)
+
+    def _register(self, name, factory, label_names):
+        with self._lock:
+            if name not in self.metrics:
+                self.metrics[name] = (factory(), tuple(label_names))
+            return self.metrics[name][0]
+
+    def histogram(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        return self._register(name, lambda: Histogram(name, help_text, buckets), label_names)
+
+    def counter(self, name, help_text, label_names):
+        return self._register(name, lambda: Counter(name, help_text), label_names)
+
+    def gauge(self, name, help_text):
+        return self._register(name, lambda: Gauge(name, help_text), ())
+
+    def observe(self, histogram, value, *labels):
+        with self._lock:
+            histogram.observe(value, labels)
+
+    def inc(self, counter, *labels):
+        with self._lock:
+            counter.inc(labels)
+
+    def render(self):
+        pid = os.getpid()
+        with self._lock:
+            lines = []
+            for metric, label_names in self.metrics.values():
+                lines.extend(metric.render(label_names, pid))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            for metric, _ in self.metrics.values():
+                metric.reset()
+
+
+registry = Registry()
+REQUEST_SECONDS = registry.histogram(
+    'goldenbites_request_duration_seconds', 'Wall time per request.', ['view', 'method', 'status'])
+SQL_SECONDS = registry.histogram(
+    'goldenbites_request_sql_seconds', 'Time spent in SQL per sampled request.', ['view'])
+SQL_QUERIES = registry.histogram(
+    'goldenbites_request_sql_queries', 'SQL queries per sampled request.', ['view'], QUERY_COUNT_BUCKETS)
+TEMPLATE_SECONDS = registry.histogram(
+    'goldenbites_request_template_seconds', 'Template render time per sampled request.', ['view'])
+STORAGE_SECONDS = registry.histogram(
+    'goldenbites_storage_call_seconds', 'Latency of each storage API call.', ['operation'])
+UPLOAD_JOBS = registry.counter(
+    'goldenbites_image_upload_jobs_total', 'Background image upload jobs by outcome.', ['outcome'])
+UPLOAD_SECONDS = registry.histogram(
+    'goldenbites_image_upload_seconds', 'Time to store an image and build its derivatives.', [], UPLOAD_BUCKETS)
+UPLOAD_QUEUE_WAIT_SECONDS = registry.histogram(
+    'goldenbites_image_upload_queue_wait_seconds', 'Time an image upload waited for a worker.', [], UPLOAD_BUCKETS)
+UPLOAD_QUEUE_DEPTH = registry.gauge(
+    'goldenbites_image_upload_queue_depth', 'Image uploads waiting for a worker.')
+
+
+class RequestStats:
+    __slots__ = ('sql_queries', 'sql_seconds', 'template_seconds')
+
+    def __init__(self):
+        self.sql_queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+
+
+# Set for sampled requests only; instrumentation hooks are no-ops when it is None
+_current = ContextVar('request_stats', default=None)
+
+
+def current_stats():
+    return _current.get()
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.sql_queries += 1
+        stats.sql_seconds += time.perf_counter() - start
+
+
+def record_storage_call(operation, seconds):
+    """Called by the storage backends for every API call, including background uploads."""
+    registry.observe(STORAGE_SECONDS, seconds, operation)
+
+
+def record_upload(outcome, upload_seconds=None, queue_wait_seconds=None):
+    """
+    Called by the upload pipeline. outcome is one of enqueued, ran_inline, deduplicated,
+    completed, superseded or failed; the timings are given for finished jobs.
+    """
+    registry.inc(UPLOAD_JOBS, outcome)
+    if upload_seconds is not None:
+        registry.observe(UPLOAD_SECONDS, upload_seconds)
+        registry.observe(UPLOAD_QUEUE_WAIT_SECONDS, queue_wait_seconds)
+
+
+def _instrument_templates():
+    # render() and TemplateResponse both go through the backend Template; includes don't,
+    # so nested templates are not counted twice.
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, '_metrics_wrapped', False):
+        return
+    original_render = Template.render
+
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None:
+            return original_render(self, context, request)
+        start = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            stats.template_seconds += time.perf_counter() - start
+
+    render._metrics_wrapped = True
+    Template.render = render
+
+
+def _view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.url_name or 'unnamed'
+
+
+class MetricsMiddleware:
+    """Placed first in MIDDLEWARE so the wall time covers every other middleware."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = _metrics_setting('METRICS_SAMPLE_RATE', 0.1)
+        _instrument_templates()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _sql_timing(self, stats):
+        return sql_wrapper(_sql_wrapper) if stats is not None else nullcontext()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        stats = RequestStats() if self._sampled() else None
+        token = _current.set(stats)
+        try:
+            with self._sql_timing(stats):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._observe(request, response, start, stats)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        stats = RequestStats() if self._sampled() else None
+        token = _current.set(stats)
+        try:
+            with self._sql_timing(stats):
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._observe(request, response, start, stats)
+
+    def _sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def _observe(self, request, response, start, stats):
+        view = _view_label(request)
+        registry.observe(REQUEST_SECONDS, time.perf_counter() - start, view, request.method, str(response.status_code))
+        if stats is not None:
+            registry.observe(SQL_SECONDS, stats.sql_seconds, view)
+            registry.observe(SQL_QUERIES, stats.sql_queries, view)
+            registry.observe(TEMPLATE_SECONDS, stats.template_seconds, view)
+        return response
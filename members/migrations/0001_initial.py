@@ -1,8 +1,10 @@
-# Generated by Django 5.2.1 on 2025-05-28 02:41
+# Generated by Django 5.2.4 on 2026-10-18 23:31
 
 import django.contrib.auth.models
 import django.contrib.auth.validators
+import django.db.models.deletion
 import django.utils.timezone
+from django.conf import settings
 from django.db import migrations, models
 
 
@@ -11,6 +13,7 @@ class Migration(migrations.Migration):
     initial = True
 
     dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
     ]
 
     operations = [
@@ -28,27 +31,156 @@ class Migration(migrations.Migration):
                 ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
                 ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
                 ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
-                ('full_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('user_type', models.CharField(choices=[('shop', 'Shop Owner'), ('customer', 'Customer')], default='customer', max_length=10)),
+                ('shop_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('id_number', models.CharField(blank=True, max_length=50, null=True)),
                 ('contact_number', models.CharField(blank=True, max_length=20, null=True)),
-                ('user_type', models.CharField(choices=[('customer', 'Customer'), ('shop', 'Shop Owner')], default='customer', max_length=10)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
             ],
             options={
-                'db_table': '"user"',
-                'managed': False,
+                'db_table': 'user',
             },
             managers=[
                 ('objects', django.contrib.auth.models.UserManager()),
             ],
         ),
         migrations.CreateModel(
-            name='FoodStall',
+            name='Order',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_time', models.DateTimeField(auto_now_add=True)),
+                ('order_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('order_summary', models.TextField(blank=True, null=True)),
+                ('order_type', models.CharField(choices=[('P', 'Pickup'), ('D', 'Delivery')], max_length=1)),
+                ('queue_id', models.CharField(blank=True, max_length=50, null=True)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Preparing', 'Preparing'), ('Ready', 'Ready'), ('Out for Delivery', 'Out for Delivery'), ('Completed', 'Completed'), ('Cancelled', 'Cancelled')], default='Pending', max_length=20)),
+                ('customer_acknowledged_at', models.DateTimeField(blank=True, null=True)),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': '"order"',
+            },
+        ),
+        migrations.CreateModel(
+            name='Payment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payment_method', models.CharField(max_length=50)),
+                ('payment_status', models.CharField(max_length=50)),
+                ('payment_time', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'payment',
+            },
+        ),
+        migrations.CreateModel(
+            name='Product',
             fields=[
                 ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_name', models.CharField(max_length=100)),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('category', models.CharField(blank=True, max_length=50, null=True)),
+                ('image_url', models.URLField(blank=True, max_length=2048, null=True)),
+                ('image_variants', models.JSONField(blank=True, null=True)),
+                ('ingredients', models.TextField(blank=True, null=True)),
+                ('details', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'product',
+            },
+        ),
+        migrations.CreateModel(
+            name='FoodStall',
+            fields=[
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
                 ('stall_name', models.CharField(max_length=100)),
+                ('staff_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('service_type', models.CharField(choices=[('Pickup', 'Pickup'), ('Delivery', 'Delivery'), ('Both', 'Both')], default='Pickup', max_length=20)),
             ],
             options={
                 'db_table': 'food_stall',
-                'managed': False,
             },
         ),
+        migrations.CreateModel(
+            name='DeliveryOrder',
+            fields=[
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='members.order')),
+                ('delivery_address', models.CharField(max_length=255)),
+            ],
+            options={
+                'db_table': 'delivery_order',
+            },
+        ),
+        migrations.CreateModel(
+            name='PickupOrder',
+            fields=[
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='members.order')),
+                ('pickup_store', models.CharField(max_length=100)),
+            ],
+            options={
+                'db_table': 'pickup_order',
+            },
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.TextField()),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('is_read', models.BooleanField(default=False)),
+                ('link', models.URLField(blank=True, null=True)),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='members.order')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'notification',
+                'ordering': ['-timestamp'],
+            },
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='payment',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='members.payment'),
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.SmallIntegerField()),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='members.order')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='members.product')),
+            ],
+            options={
+                'db_table': 'review',
+            },
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='food_stall',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='members.foodstall'),
+        ),
+        migrations.CreateModel(
+            name='OrderItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='members.order')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='members.product')),
+                ('food_stall', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='members.foodstall')),
+            ],
+            options={
+                'db_table': 'order_item',
+            },
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='food_stall',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='members.foodstall'),
+        ),
     ]
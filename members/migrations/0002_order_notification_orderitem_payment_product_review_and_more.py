@@ -1,127 +0,0 @@
-# Generated by Django 5.2.1 on 2025-05-28 16:55
-
-import django.db.models.deletion
-from django.db import migrations, models
-
-
-class Migration(migrations.Migration):
-
-    dependencies = [
-        ('members', '0001_initial'),
-    ]
-
-    operations = [
-        migrations.CreateModel(
-            name='Order',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('order_time', models.DateTimeField(auto_now_add=True)),
-                ('order_price', models.DecimalField(decimal_places=2, max_digits=10)),
-                ('total_price', models.DecimalField(decimal_places=2, max_digits=10)),
-                ('order_summary', models.TextField(blank=True, null=True)),
-                ('order_type', models.CharField(choices=[('P', 'Pickup'), ('D', 'Delivery')], max_length=1)),
-                ('queue_id', models.CharField(blank=True, max_length=50, null=True)),
-                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Preparing', 'Preparing'), ('Ready', 'Ready'), ('Out for Delivery', 'Out for Delivery'), ('Completed', 'Completed'), ('Cancelled', 'Cancelled')], default='Pending', max_length=20)),
-                ('customer_acknowledged_at', models.DateTimeField(blank=True, null=True)),
-            ],
-            options={
-                'db_table': '"order"',
-                'managed': False,
-            },
-        ),
-        migrations.CreateModel(
-            name='Notification',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('message', models.TextField()),
-                ('timestamp', models.DateTimeField(auto_now_add=True)),
-                ('is_read', models.BooleanField(default=False)),
-                ('link', models.URLField(blank=True, null=True)),
-            ],
-            options={
-                'db_table': 'notification',
-                'ordering': ['-timestamp'],
-                'managed': False,
-            },
-        ),
-        migrations.CreateModel(
-            name='OrderItem',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('quantity', models.IntegerField()),
-                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
-            ],
-            options={
-                'db_table': 'order_item',
-                'managed': False,
-            },
-        ),
-        migrations.CreateModel(
-            name='Payment',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('payment_method', models.CharField(max_length=50)),
-                ('payment_status', models.CharField(max_length=50)),
-                ('payment_time', models.DateTimeField(auto_now_add=True)),
-            ],
-            options={
-                'db_table': 'payment',
-                'managed': False,
-            },
-        ),
-        migrations.CreateModel(
-            name='Product',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('product_name', models.CharField(max_length=100)),
-                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10)),
-                ('category', models.CharField(blank=True, max_length=50, null=True)),
-                ('image_url', models.URLField(blank=True, max_length=2048, null=True)),
-                ('ingredients', models.TextField(blank=True, null=True)),
-                ('details', models.TextField(blank=True, null=True)),
-            ],
-            options={
-                'db_table': 'product',
-                'managed': False,
-            },
-        ),
-        migrations.CreateModel(
-            name='Review',
-            fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('rating', models.SmallIntegerField()),
-                ('comment', models.TextField(blank=True, null=True)),
-                ('created_at', models.DateTimeField(auto_now_add=True)),
-            ],
-            options={
-                'db_table': 'review',
-                'managed': False,
-            },
-        ),
-        migrations.AlterModelTable(
-            name='user',
-            table='user',
-        ),
-        migrations.CreateModel(
-            name='DeliveryOrder',
-            fields=[
-                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='members.order')),
-                ('delivery_address', models.CharField(max_length=255)),
-            ],
-            options={
-                'db_table': 'delivery_order',
-                'managed': False,
-            },
-        ),
-        migrations.CreateModel(
-            name='PickupOrder',
-            fields=[
-                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='members.order')),
-                ('pickup_store', models.CharField(max_length=100)),
-            ],
-            options={
-                'db_table': 'pickup_order',
-                'managed': False,
-            },
-        ),
-    ]
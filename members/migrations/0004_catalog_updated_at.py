@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0003_user_login_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foodstall',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0004_catalog_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefreshToken',
+            fields=[
+                ('jti', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('family', models.CharField(max_length=32)),
+                ('expires_at', models.DateTimeField()),
+                ('used_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='refresh_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'refresh_token',
+                'indexes': [models.Index(fields=['family'], name='refresh_token_family_idx'), models.Index(fields=['user', 'expires_at'], name='refresh_token_user_exp_idx')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 
 # Models based on the provided SQL script
@@ -18,12 +19,29 @@ class User(AbstractUser):
     contact_number = models.CharField(max_length=20, blank=True, null=True)
 
     class Meta:
-        managed = False
         db_table = 'user' # Using lowercase 'user' as in your SQL
+        indexes = [
+            # Sign-in matches username or email ignoring case (see members/backends.py)
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
 
     def __str__(self):
         return self.username
 
+class TokenUser(User):
+    # request.user for bearer-token requests, built from the access token's claims alone (see
+    # members/tokens.py). Password, email and the other fields not in the token are blank, so
+    # saving it would overwrite the real row with them.
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise NotImplementedError("A user built from an access token can't be saved; load the User row instead.")
+
+    def delete(self, *args, **kwargs):
+        raise NotImplementedError("A user built from an access token can't be deleted; load the User row instead.")
+
 class FoodStall(models.Model):
     owner = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True) # owner_id in SQL, made PK here
     stall_name = models.CharField(max_length=100)
@@ -34,9 +52,9 @@ class FoodStall(models.Model):
         ('Both', 'Both'),
     ]
     service_type = models.CharField(max_length=20, choices=SERVICE_TYPE_CHOICES, default='Pickup')
+    updated_at = models.DateTimeField(auto_now=True) # Version stamp for conditional GET (see members/versions.py)
 
     class Meta:
-        managed = False
         db_table = 'food_stall'
 
     def __str__(self):
@@ -49,11 +67,12 @@ class Product(models.Model):
     category = models.CharField(max_length=50, blank=True, null=True) # From your SQL
     food_stall = models.ForeignKey(FoodStall, on_delete=models.CASCADE) # food_stall_id in SQL
     image_url = models.URLField(max_length=2048, blank=True, null=True) # To store image URL from Supabase Storage
+    image_variants = models.JSONField(blank=True, null=True) # Thumbnails/placeholder built by members/images.py (needs the column added in Supabase)
     ingredients = models.TextField(blank=True, null=True) # Based on UI screenshot
     details = models.TextField(blank=True, null=True) # Based on UI screenshot
+    updated_at = models.DateTimeField(auto_now=True) # Version stamp for conditional GET (see members/versions.py)
 
     class Meta:
-        managed = False
         db_table = 'product'
 
     def __str__(self):
@@ -66,7 +85,6 @@ class Payment(models.Model):
     payment_time = models.DateTimeField(auto_now_add=True) # Corresponds to TIMESTAMPTZ DEFAULT now()
 
     class Meta:
-        managed = False
         db_table = 'payment'
 
     def __str__(self):
@@ -99,8 +117,15 @@ class Order(models.Model):
     customer_acknowledged_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        managed = False
         db_table = '"order"' # Quoted because 'order' is often a reserved keyword
+        indexes = [
+            # Stall order board, dashboard and overview: one status at a time, newest first
+            models.Index(fields=['food_stall', 'status', '-order_time'], name='order_stall_status_time_idx'),
+            # Overview "recent orders" across all statuses
+            models.Index(fields=['food_stall', '-order_time'], name='order_stall_time_idx'),
+            # Customer history, reviews and order tracking
+            models.Index(fields=['customer', 'status', '-order_time'], name='order_customer_status_idx'),
+        ]
 
     def __str__(self):
         return f"Order ID: {self.pk} by {self.customer.username}"
@@ -110,7 +135,6 @@ class PickupOrder(models.Model):
     pickup_store = models.CharField(max_length=100)
 
     class Meta:
-        managed = False
         db_table = 'pickup_order'
 
     def __str__(self):
@@ -121,7 +145,6 @@ class DeliveryOrder(models.Model):
     delivery_address = models.CharField(max_length=255)
 
     class Meta:
-        managed = False
         db_table = 'delivery_order'
 
     def __str__(self):
@@ -136,7 +159,6 @@ class OrderItem(models.Model):
     food_stall = models.ForeignKey(FoodStall, on_delete=models.CASCADE) # food_stall_id in SQL
 
     class Meta:
-        managed = False
         db_table = 'order_item'
         # Consider adding validators for quantity in Django forms/serializers
 
@@ -152,8 +174,13 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True) # Corresponds to TIMESTAMPTZ DEFAULT now()
 
     class Meta:
-        managed = False
         db_table = 'review'
+        indexes = [
+            # "Has this customer reviewed this product for this order?" lookups
+            models.Index(fields=['customer', 'product', 'order'], name='review_customer_product_idx'),
+            # Product page review list, newest first
+            models.Index(fields=['product', '-created_at'], name='review_product_created_idx'),
+        ]
         # Consider adding validators for rating in Django forms/serializers
 
     def __str__(self):
@@ -168,9 +195,32 @@ class Notification(models.Model):
     link = models.URLField(blank=True, null=True) # Optional link, e.g., to the order tracking page
 
     class Meta:
-        managed = False # You will need to create this table in Supabase
         db_table = 'notification'
         ordering = ['-timestamp']
+        indexes = [
+            # Notification list, newest first
+            models.Index(fields=['user', '-timestamp'], name='notification_user_time_idx'),
+            # Unread badge count (see members/notifications.py)
+            models.Index(fields=['user'], name='notification_user_unread_idx', condition=models.Q(is_read=False)),
+        ]
+
+    def __str__(self):
+        return f"Notification for {self.user.username}: {self.message[:50]}"
+class RefreshToken(models.Model):
+    # One row per refresh token handed to an API client (see members/tokens.py). Access tokens
+    # are never stored; they are checked by signature alone.
+    jti = models.CharField(max_length=32, primary_key=True) # Token id, the JWT's "jti" claim
+    family = models.CharField(max_length=32) # jti of the first token of the sign-in it descends from
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='refresh_tokens')
+    expires_at = models.DateTimeField()
+    used_at = models.DateTimeField(null=True, blank=True) # Set when exchanged; a second exchange revokes the family
+
+    class Meta:
+        db_table = 'refresh_token'
+        indexes = [
+            models.Index(fields=['family'], name='refresh_token_family_idx'),
+            models.Index(fields=['user', 'expires_at'], name='refresh_token_user_exp_idx'),
+        ]
 
     def __str__(self):
-        return f"Notification for {self.user.username}: {self.message[:50]}"
\ No newline at end of file
+        return f"Refresh token {self.jti} for user {self.user_id}"
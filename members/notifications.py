@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+
+from .models import Notification
+
+# Per-user counter cache for the bottom_nav notification badge.
+# Stored as {'unread_count': int, 'latest_id': int|None} so a badge poll is a single cache read.
+BADGE_CACHE_KEY = 'notification_badge:{user_id}'
+
+def _badge_cache_key(user_id):
+    return BADGE_CACHE_KEY.format(user_id=user_id)
+
+def get_unread_badge(user_id):
+    key = _badge_cache_key(user_id)
+    badge = cache.get(key)
+    if badge is None:
+        # One aggregate query instead of loading the notification list
+        stats = Notification.objects.filter(user_id=user_id).aggregate(
+            unread_count=Count('id', filter=Q(is_read=False)),
+            latest_id=Max('id'),
+        )
+        badge = {
+            'unread_count': stats['unread_count'] or 0,
+            'latest_id': stats['latest_id'],
+        }
+        cache.set(key, badge, getattr(settings, 'NOTIFICATION_BADGE_CACHE_TIMEOUT', 30))
+    return badge
+
+def invalidate_unread_badge(user_id):
+    cache.delete(_badge_cache_key(user_id))
+
+def badge_etag(badge):
+    # Weak validator built only from the cached counters, so a 304 never touches the DB
+    return f'W/"{badge["unread_count"]}-{badge["latest_id"] or 0}"'
@@ -0,0 +1,155 @@
+"""
+Runtime N+1 query detection.
+
+Every SQL statement run during a request is reduced to a fingerprint (literals,
+placeholders and IN-lists collapsed), so `SELECT ... WHERE id = 1` and `... id = 2`
+count as the same query. When one fingerprint runs NPLUSONE_THRESHOLD times in a
+request, the code responsible is captured: the template and line being rendered if
+any, and the innermost project frame (usually the view or a model __str__).
+
+NPLUSONE_MODE:
+  'strict' - the request fails with NPlusOneError (default under the test runner)
+  'sample' - NPLUSONE_SAMPLE_RATE of requests are checked and offenders are logged
+  'off'    - disabled
+"""
+import functools
+import logging
+import os
+import random
+import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .sqlhooks import sql_wrapper
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IGNORED_FILES = tuple(os.path.join(PROJECT_ROOT, 'members', name) for name in ('nplusone.py', 'metrics.py', 'sqlhooks.py'))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'IN \((?:\s*(?:%s|\?)\s*,)*\s*(?:%s|\?)\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _nplusone_setting(name, default):
+    return getattr(settings, name, default)
+
+
+class NPlusOneError(AssertionError):
+    """Raised in strict mode when a request repeats the same query too often."""
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(sql):
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def _query_origin():
+    """Template name/line being rendered and the innermost project frame, for the current stack."""
+    template_origin = code_origin = None
+    frame = sys._getframe(2)
+    while frame is not None and (template_origin is None or code_origin is None):
+        code = frame.f_code
+        if template_origin is None and code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                template_origin = f"{origin.template_name or origin.name}:{token.lineno}"
+        filename = os.path.abspath(code.co_filename)
+        if (code_origin is None and filename.startswith(PROJECT_ROOT) and filename not in _IGNORED_FILES
+                and os.sep + 'site-packages' + os.sep not in filename):
+            code_origin = f"{os.path.relpath(filename, PROJECT_ROOT)}:{frame.f_lineno} in {code.co_name}"
+        frame = frame.f_back
+    return template_origin, code_origin
+
+
+class QueryTracker:
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.origins = {}  # fingerprint -> (template origin, code origin), captured at the threshold
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        self.counts[key] += 1
+        if self.counts[key] == self.threshold:
+            # Only walk the stack for offenders, once each
+            self.origins[key] = _query_origin()
+        return execute(sql, params, many, context)
+
+    def offenders(self):
+        return [(key, self.counts[key], self.origins[key]) for key in self.origins]
+
+    def report(self, label):
+        lines = [f"N+1 queries in {label}:"]
+        for key, count, (template_origin, code_origin) in self.offenders():
+            where = ', '.join(part for part in (template_origin, code_origin) if part) or 'unknown origin'
+            lines.append(f"  {count}x at {where}: {key[:300]}")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def track_queries(threshold=None):
+    """Tracks every query inside the block, in any thread it reaches; yields the QueryTracker."""
+    tracker = QueryTracker(threshold or _nplusone_setting('NPLUSONE_THRESHOLD', 5))
+    with sql_wrapper(tracker):
+        yield tracker
+
+
+@contextmanager
+def assert_no_nplusone(threshold=None, label='block'):
+    """For tests outside the request cycle: fails if the block repeats a query threshold times."""
+    with track_queries(threshold) as tracker:
+        yield tracker
+    if tracker.offenders():
+        raise NPlusOneError(tracker.report(label))
+
+
+class NPlusOneMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.mode = _nplusone_setting('NPLUSONE_MODE', 'sample')
+        self.sample_rate = _nplusone_setting('NPLUSONE_SAMPLE_RATE', 0.01)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _checked(self):
+        return self.mode == 'strict' or (self.mode == 'sample' and random.random() < self.sample_rate)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._checked():
+            return self.get_response(request)
+        with track_queries() as tracker:
+            response = self.get_response(request)
+        return self._check(request, response, tracker)
+
+    async def __acall__(self, request):
+        if not self._checked():
+            return await self.get_response(request)
+        with track_queries() as tracker:
+            response = await self.get_response(request)
+        return self._check(request, response, tracker)
+
+    def _check(self, request, response, tracker):
+        if tracker.offenders():
+            match = getattr(request, 'resolver_match', None)
+            label = f"{request.method} {request.path}" + (f" ({match.view_name})" if match else '')
+            if self.mode == 'strict':
+                raise NPlusOneError(tracker.report(label))
+            logger.warning(tracker.report(label))
+        return response
@@ -0,0 +1,130 @@
+"""
+Read-replica routing.
+
+When a 'replica' database is configured, read-only catalog and analytics queries go
+there and everything else stays on the primary ('default'):
+
+- Only the models in REPLICA_MODELS are ever read from the replica. Users, sessions and
+  payments are always read from the primary.
+- Reads inside a transaction, inside `primary()` / `@use_primary`, or from a client that
+  wrote within the last REPLICA_READ_YOUR_WRITES_SECONDS go to the primary, so customers
+  and stalls always see their own changes despite replication lag.
+
+ReplicaRoutingMiddleware carries the "recently wrote" state between requests in a
+cookie, since the session itself lives on the primary.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+REPLICA_MODELS = {'product', 'foodstall', 'review', 'order', 'orderitem'}  # members app, lower-cased model names
+PRIMARY_COOKIE = 'db_primary_until'
+
+_pinned = ContextVar('db_pinned_to_primary', default=False)
+_wrote = ContextVar('db_wrote', default=False)
+
+
+def _read_your_writes_seconds():
+    return getattr(settings, 'REPLICA_READ_YOUR_WRITES_SECONDS', 10)
+
+
+@contextmanager
+def primary():
+    """Sends every read inside the block to the primary."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def use_primary(view_func):
+    """View decorator for checkout and status updates: never read from a lagging replica."""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(*args, **kwargs):
+            with primary():
+                return await view_func(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        with primary():
+            return view_func(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if REPLICA_DB_ALIAS not in settings.DATABASES:
+            return None
+        if model._meta.app_label != 'members' or model._meta.model_name not in REPLICA_MODELS:
+            return DEFAULT_DB_ALIAS
+        if _pinned.get() or _wrote.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == 'members':
+            # Session and other framework writes don't affect what the replica serves
+            _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tokens = self._begin(request)
+        try:
+            return self._finish(self.get_response(request))
+        finally:
+            self._reset(tokens)
+
+    async def __acall__(self, request):
+        # Context variables set by queries in sync_to_async threads are copied back here
+        tokens = self._begin(request)
+        try:
+            return self._finish(await self.get_response(request))
+        finally:
+            self._reset(tokens)
+
+    def _begin(self, request):
+        try:
+            recently_wrote = float(request.COOKIES.get(PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            recently_wrote = False
+        return _pinned.set(recently_wrote), _wrote.set(False)
+
+    def _finish(self, response):
+        if _wrote.get():
+            # Keep this client on the primary until the replica has caught up with its write
+            seconds = _read_your_writes_seconds()
+            response.set_cookie(PRIMARY_COOKIE, f"{time.time() + seconds:.0f}", max_age=seconds, httponly=True, samesite='Lax')
+        return response
+
+    def _reset(self, tokens):
+        pinned_token, wrote_token = tokens
+        _pinned.reset(pinned_token)
+        _wrote.reset(wrote_token)
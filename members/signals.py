@@ -0,0 +1,53 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .backends import invalidate_auth_user
+from .catalog import invalidate_product_cards
+from .models import FoodStall, Notification, Product, Review, User
+from .notifications import invalidate_unread_badge
+from .stalls import invalidate_user_stall
+from .versions import bump_versions
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def notification_changed(sender, instance, **kwargs):
+    # Any create, read-state change or delete makes the cached badge stale
+    invalidate_unread_badge(instance.user_id)
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, instance, **kwargs):
+    invalidate_product_cards([instance.pk])
+    # Saves stamp with updated_at; deletes (no `created` argument) with now
+    bump_versions(['catalog', f'product:{instance.pk}'], at=instance.updated_at if 'created' in kwargs else None)
+
+@receiver(post_save, sender=FoodStall)
+def food_stall_changed(sender, instance, created, **kwargs):
+    invalidate_user_stall(instance.owner_id)
+    # Product cards and pages embed the stall name
+    product_ids = [] if created else list(Product.objects.filter(food_stall=instance).values_list('pk', flat=True))
+    invalidate_product_cards(product_ids)
+    bump_versions(['catalog', *(f'product:{product_id}' for product_id in product_ids)], at=instance.updated_at)
+
+@receiver(post_delete, sender=FoodStall)
+def food_stall_deleted(sender, instance, **kwargs):
+    invalidate_user_stall(instance.owner_id)
+    bump_versions(['catalog'])
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    # The product page's review list and rating summary
+    bump_versions([f'reviews:{instance.product_id}'])
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Includes password changes and the last_login update on every sign-in
+    invalidate_auth_user(instance.pk)
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return  # No page shows it
+    # Pages show the signed-in user's details. The catalog pages show nothing from the owner's row
+    # (shops-list.html asks for owner.address, which User doesn't have), so 'catalog' is left alone:
+    # bumping it on every stall sign-in made every customer re-download home, shops and the API.
+    bump_versions([f'user:{instance.pk}'])
@@ -0,0 +1,45 @@
+"""
+Request-scoped SQL execute wrappers that also work under ASGI.
+
+connection.execute_wrapper() only applies to the connection it is entered on, and
+connections belong to a thread. Under ASGI the middlewares run on the event loop while
+views (and sync views behind ASGI) query from sync_to_async threads with their own
+connections, so a wrapper entered by a middleware never saw those queries.
+
+Instead every connection gets one permanent dispatcher when it is opened (registered in
+MembersConfig.ready()), and `sql_wrapper()` adds a wrapper to a context variable the
+dispatcher reads. Context variables follow the request into sync_to_async threads, so the
+wrapper sees every query of the request whichever thread runs it.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import connections
+
+_wrappers = ContextVar('sql_wrappers', default=())
+
+
+def _dispatch(execute, sql, params, many, context):
+    wrappers = _wrappers.get()
+    for wrapper in reversed(wrappers):  # The first one registered runs outermost
+        execute = partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def install_dispatcher(sender=None, connection=None, **kwargs):
+    """connection_created receiver; runs on every reconnect of the same wrapper, so only adds it once."""
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_dispatch)
+
+
+@contextmanager
+def sql_wrapper(wrapper):
+    """Runs wrapper(execute, sql, params, many, context) around every query in this context."""
+    for connection in connections.all(initialized_only=True):
+        install_dispatcher(connection=connection)  # Opened before the receiver was connected
+    token = _wrappers.set((*_wrappers.get(), wrapper))
+    try:
+        yield
+    finally:
+        _wrappers.reset(token)
@@ -0,0 +1,56 @@
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
+from django.shortcuts import redirect
+
+from .models import FoodStall
+
+# Shop owner -> FoodStall, cached per user so shop-side pages don't query the stall on every
+# request. Owners without a stall are cached as NO_STALL. Signals invalidate it on change.
+# Only on when STALL_CACHE_TIMEOUT > 0, which by default needs a shared cache.
+STALL_CACHE_KEY = 'user_stall:{user_id}'
+NO_STALL = 0
+
+def _stall_cache_key(user_id):
+    return STALL_CACHE_KEY.format(user_id=user_id)
+
+def get_user_stall(user):
+    """The FoodStall owned by user, or None."""
+    timeout = getattr(settings, 'STALL_CACHE_TIMEOUT', 0)
+    if timeout <= 0:
+        stall = FoodStall.objects.filter(owner_id=user.pk).first() or NO_STALL
+    else:
+        key = _stall_cache_key(user.pk)
+        stall = cache.get(key)
+        if stall is None:
+            stall = FoodStall.objects.filter(owner_id=user.pk).first() or NO_STALL
+            cache.set(key, stall, timeout)
+    if stall == NO_STALL:
+        return None
+    stall.owner = user  # Templates reach the owner through the stall; it's the signed-in user
+    return stall
+
+def invalidate_user_stall(user_id):
+    cache.delete(_stall_cache_key(user_id))
+
+def shop_owner_required(view_func=None, *, message="You are not authorized to view this page.", redirect_to='home'):
+    """
+    For shop-side views: sends anonymous users to the login page and other non-shop users to
+    `redirect_to` with `message`, and sets request.food_stall to the owner's stall (None if
+    they haven't set one up), resolved once per request from the per-user cache.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return redirect_to_login(request.get_full_path())
+            if request.user.user_type != 'shop':
+                messages.error(request, message)
+                return redirect(redirect_to)
+            request.food_stall = get_user_stall(request.user)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator(view_func) if view_func is not None else decorator
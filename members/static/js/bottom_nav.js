@@ -0,0 +1,21 @@
+// Poll the lightweight badge endpoint. The response carries an ETag and "no-cache",
+// so the browser revalidates with If-None-Match and unchanged badges come back as 304.
+(function() {
+    const badge = document.getElementById('notification-badge');
+    if (!badge) return;
+    const badgeUrl = document.currentScript.dataset.badgeUrl;
+    function refreshBadge() {
+        if (document.hidden) return;
+        fetch(badgeUrl, { credentials: 'same-origin', headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+            .then(response => response.ok ? response.json() : null)
+            .then(data => {
+                if (!data) return;
+                badge.textContent = data.unread_count;
+                badge.dataset.latestId = data.latest_id || '';
+                badge.style.display = data.unread_count > 0 ? '' : 'none';
+            })
+            .catch(() => {});
+    }
+    setInterval(refreshBadge, 30000);
+    document.addEventListener('visibilitychange', refreshBadge);
+})();
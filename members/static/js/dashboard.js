@@ -0,0 +1,54 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function () {
+  // Settings Modal Logic (existing, slightly adapted)
+  const settingsIcon = document.getElementById('settingsIcon');
+  const settingsModal = document.getElementById('settingsModal');
+  const closeModalButton = document.getElementById('closeModal'); // Corrected ID from .close-modal to #closeModal
+
+  if (settingsIcon && settingsModal && closeModalButton) {
+    settingsIcon.addEventListener('click', () => settingsModal.style.display = 'flex');
+    closeModalButton.addEventListener('click', () => settingsModal.style.display = 'none');
+    window.addEventListener('click', e => { 
+      if (e.target === settingsModal) settingsModal.style.display = 'none'; 
+    });
+  }
+
+  const logoutBtn = document.getElementById('logoutBtn');
+  if(logoutBtn) {
+      logoutBtn.addEventListener('click', () => {
+          // Clear any local storage if used for auth tokens or user info
+          // localStorage.removeItem('userToken'); 
+          // localStorage.removeItem('goldenBites_user');
+          // localStorage.removeItem('goldenBites_shopName');
+          window.location.href = pageData.logoutUrl; // Redirect to Django logout view
+      });
+  }
+
+  // Active state for bottom nav
+  const currentPath = window.location.pathname;
+  const navItems = document.querySelectorAll('.nav-bar .nav-item');
+  let dashboardIsActive = false;
+
+  navItems.forEach(item => {
+      const itemPath = item.getAttribute('href');
+      if (itemPath && currentPath.startsWith(itemPath)) {
+           if (item.id === 'homeNav'){
+              dashboardIsActive = true;
+           } else {
+              // item.classList.add('active'); // Let Django handle initial active state via class on link
+           }
+      } else {
+          item.classList.remove('active');
+      }
+  });
+  // Ensure "Home" (dashboard) is active if on dashboard page
+  if (dashboardIsActive || currentPath.includes(pageData.dashboardUrl)) {
+       navItems.forEach(opt => opt.classList.remove('active'));
+       document.getElementById('homeNav')?.classList.add('active');
+  }
+
+  // Removed old localStorage based navigation and user info loading functions
+  // as this page now primarily uses Django context and standard navigation.
+});
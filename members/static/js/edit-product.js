@@ -0,0 +1,32 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function() {
+    const imageUploadInput = document.getElementById(pageData.productImageId);
+    const imagePreviewBox = document.getElementById('imagePreviewBox');
+    const imagePreview = document.getElementById('imagePreview');
+    const cameraIcon = document.getElementById('cameraIcon');
+
+    if (imageUploadInput && imagePreviewBox && imagePreview && cameraIcon) {
+        imagePreviewBox.addEventListener('click', function() {
+            imageUploadInput.click();
+        });
+
+        imageUploadInput.addEventListener('change', function(event) {
+            const file = event.target.files[0];
+            if (file) {
+                const reader = new FileReader();
+                reader.onload = function(e) {
+                    imagePreview.src = e.target.result;
+                    imagePreview.style.display = 'block';
+                    cameraIcon.style.display = 'none';
+                }
+                reader.readAsDataURL(file);
+            } else {
+                imagePreview.src = '';
+                imagePreview.style.display = 'none';
+                cameraIcon.style.display = 'block';
+            }
+        });
+    }
+});
@@ -0,0 +1,365 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+// Custom modal functions
+function showCustomConfirm(message) {
+    return new Promise((resolve) => {
+        const modal = document.getElementById('custom-confirm-modal');
+        const confirmMessage = document.getElementById('confirm-message');
+        const confirmYes = document.getElementById('confirm-yes');
+        const confirmNo = document.getElementById('confirm-no');
+
+        confirmMessage.textContent = message;
+        modal.classList.add('active');
+
+        const handleYes = () => {
+            modal.classList.remove('active');
+            confirmYes.removeEventListener('click', handleYes);
+            confirmNo.removeEventListener('click', handleNo);
+            resolve(true);
+        };
+
+        const handleNo = () => {
+            modal.classList.remove('active');
+            confirmYes.removeEventListener('click', handleYes);
+            confirmNo.removeEventListener('click', handleNo);
+            resolve(false);
+        };
+
+        confirmYes.addEventListener('click', handleYes);
+        confirmNo.addEventListener('click', handleNo);
+    });
+}
+
+// Common utility functions (copied from app.js for this page's self-containment)
+const utils = {
+    // Format price to 2 decimal places with ₱ symbol
+    formatPrice: function(price) {
+        return `₱${parseFloat(price).toFixed(2)}`;
+    },
+
+    // Capitalize first letter of a string
+    capitalizeFirstLetter: function(string) {
+        if (!string) return '';
+        return string.charAt(0).toUpperCase() + string.slice(1);
+    },
+
+    // Show toast notification (simplified for this page)
+    showToast: function(message, iconType) {
+        let toastContainer = document.getElementById('toast-container');
+        if (!toastContainer) {
+            toastContainer = document.createElement('div');
+            toastContainer.id = 'toast-container';
+            toastContainer.style.position = 'fixed';
+            toastContainer.style.bottom = '20px';
+            toastContainer.style.left = '50%';
+            toastContainer.style.transform = 'translateX(-50%)';
+            toastContainer.style.zIndex = '1000';
+            document.body.appendChild(toastContainer);
+        }
+        const toast = document.createElement('div');
+        toast.style.backgroundColor = 'rgba(0, 0, 0, 0.8)';
+        toast.style.color = 'white';
+        toast.style.padding = '10px 20px';
+        toast.style.borderRadius = '4px';
+        toast.style.marginBottom = '10px';
+        toast.style.fontSize = '14px';
+        toast.textContent = message;
+        toastContainer.appendChild(toast);
+        setTimeout(() => {
+            toast.remove();
+        }, 3000);
+    }
+};
+
+// Product data (copied from app.js for consistency)
+const productData = {
+    products: {
+        'pancake': {
+            id: 'pancake',
+            name: 'Pancake',
+            price: 20.00,
+            image: pageData.pancakeImage,
+            rating: 4.5,
+            category: 'breakfast',
+            is_popular: true,
+            is_recommended: false,
+            description: 'A classic breakfast staple, our pancakes are fluffy and golden brown. Served with your choice of syrup and butter.'
+        },
+        'waffle': {
+            id: 'waffle',
+            name: 'Waffle',
+            price: 20.00,
+            image: pageData.waffleImage,
+            rating: 3.8,
+            category: 'breakfast',
+            is_popular: true,
+            is_recommended: false,
+            description: 'Crispy on the outside and soft on the inside, our waffles are a delightful treat.'
+        },
+        'adobo': {
+            id: 'adobo',
+            name: 'Adobo',
+            price: 75.00,
+            image: pageData.adoboImage,
+            rating: 4.2,
+            category: 'dinner',
+            is_popular: true,
+            is_recommended: false,
+            description: 'A Filipino favorite, our adobo is marinated in soy sauce, vinegar, and spices.'
+        },
+        'hotsilog': {
+            id: 'hotsilog',
+            name: 'Hotsilog',
+            price: 75.00,
+            image: pageData.hotsilogImage,
+            rating: 4.7,
+            category: 'breakfast',
+            is_popular: true,
+            is_recommended: false,
+            description: 'A Filipino breakfast classic with hotdog, fried rice, and egg.'
+        },
+        'turon': {
+            id: 'turon',
+            name: 'Turon',
+            price: 15.00,
+            image: pageData.turonImage,
+            rating: 4.3,
+            category: 'dessert',
+            is_popular: false,
+            is_recommended: true,
+            description: 'Sweet banana wrapped in spring roll wrapper and fried to golden perfection.'
+        },
+        'sopas': {
+            id: 'sopas',
+            name: 'Sopas',
+            price: 35.00,
+            image: pageData.sopasImage,
+            rating: 4.1,
+            category: 'soup',
+            is_popular: false,
+            is_recommended: true,
+            description: 'A creamy Filipino macaroni soup with chicken and vegetables.'
+        }
+    },
+
+    // Get product by ID
+    getProduct: function(productId) {
+        return this.products[productId] || null;
+    },
+
+    // Get all products
+    getAllProducts: function() {
+        return Object.values(this.products);
+    }
+};
+
+// Favorites functionality (copied and adapted from app.js for consistency)
+const favoritesSystem = {
+    // Get favorites from localStorage
+    getFavorites: function() {
+        return JSON.parse(localStorage.getItem('favorites')) || [];
+    },
+
+    // Remove a product from favorites
+    removeFavorite: function(productId) {
+        const favorites = this.getFavorites();
+        const updatedFavorites = favorites.filter(item => item.id !== productId);
+        localStorage.setItem('favorites', JSON.stringify(updatedFavorites));
+        utils.showToast('Removed from favorites', 'heart-broken'); // Show toast
+        this.renderFavorites(); // Re-render after removal
+        return true;
+    },
+
+    // Add product to cart
+    addToCart: function(product) {
+        const cartItems = JSON.parse(localStorage.getItem('cartItems')) || [];
+
+        // Create new cart item
+        const newItem = {
+            id: product.id,
+            name: product.name,
+            price: product.price,
+            quantity: 1,
+            addons: [],
+            image: product.image
+        };
+
+        // Add to cart
+        cartItems.push(newItem);
+
+        // Save to localStorage
+        localStorage.setItem('cartItems', JSON.stringify(cartItems));
+        utils.showToast(`${product.name} added to cart`, 'cart'); // Show toast
+    },
+
+    // Render favorites on the page
+    renderFavorites: function(filter = 'all') {
+        const favoritesGrid = document.getElementById('favorites-grid');
+        const emptyFavorites = document.getElementById('empty-favorites');
+        const favorites = this.getFavorites();
+
+        // Clear favorites grid
+        if (favoritesGrid) favoritesGrid.innerHTML = '';
+
+        let visibleCount = 0;
+
+        if (favorites.length === 0) {
+            if (favoritesGrid) favoritesGrid.style.display = 'none';
+            if (emptyFavorites) emptyFavorites.style.display = 'flex';
+            return;
+        }
+
+        favorites.forEach(item => {
+            const matchesFilter = (filter === 'all' || item.category === filter);
+
+            if (matchesFilter) {
+                const favoriteItem = document.createElement('div');
+                favoriteItem.className = 'favorite-item';
+                favoriteItem.setAttribute('data-category', item.category);
+                favoriteItem.setAttribute('data-id', item.id); // Add data-id for easy removal
+
+                favoriteItem.innerHTML = `
+                    <div class="favorite-img-container">
+                        <img src="${item.image}" alt="${item.name}" class="favorite-img" onerror="this.onerror=null;this.src='https://placehold.co/150x140/E0E0E0/333333?text=No+Image';">
+                        <div class="favorite-category">${utils.capitalizeFirstLetter(item.category)}</div>
+                        <div class="favorite-actions">
+                            <button class="favorite-action-btn remove" data-id="${item.id}">
+                                <i class="fas fa-heart-broken"></i>
+                            </button>
+                            <button class="favorite-action-btn cart" data-id="${item.id}">
+                                <i class="fas fa-cart-plus"></i>
+                            </button>
+                        </div>
+                    </div>
+                    <div class="favorite-info">
+                        <a href="${pageData.productDetailUrl.replace('/0/', '/' + item.id + '/')}" class="favorite-name">${item.name}</a>
+                        <div class="favorite-details">
+                            <div class="favorite-rating">
+                                <span class="favorite-star">⭐</span>
+                                <span>${item.rating.toFixed(1)}</span>
+                            </div>
+                            <div class="favorite-price">${utils.formatPrice(item.price)}</div>
+                        </div>
+                    </div>
+                `;
+
+                if (favoritesGrid) favoritesGrid.appendChild(favoriteItem);
+                visibleCount++;
+            }
+        });
+
+        if (visibleCount === 0) {
+            if (favoritesGrid) favoritesGrid.style.display = 'none';
+            if (emptyFavorites) emptyFavorites.style.display = 'flex';
+        } else {
+            if (favoritesGrid) favoritesGrid.style.display = 'grid';
+            if (emptyFavorites) emptyFavorites.style.display = 'none';
+        }
+
+        this.attachEventListeners(); // Attach event listeners after rendering
+    },
+
+    attachEventListeners: function() {
+        const self = this; // Reference to favoritesSystem
+        const removeButtons = document.querySelectorAll('.favorite-action-btn.remove');
+        const addToCartButtons = document.querySelectorAll('.favorite-action-btn.cart');
+        const favoritesGrid = document.getElementById('favorites-grid');
+        const editButton = document.getElementById('edit-favorites');
+
+        // Remove functionality
+        removeButtons.forEach(button => {
+            button.removeEventListener('click', self.handleRemoveClick); // Prevent duplicate listeners
+            button.addEventListener('click', self.handleRemoveClick);
+        });
+
+        // Add to cart functionality
+        addToCartButtons.forEach(button => {
+            button.removeEventListener('click', self.handleAddToCartClick); // Prevent duplicate listeners
+            button.addEventListener('click', self.handleAddToCartClick);
+        });
+
+        // Edit mode toggle
+        if (editButton) {
+            editButton.removeEventListener('click', self.handleEditClick); // Prevent duplicate listeners
+            editButton.addEventListener('click', self.handleEditClick);
+        }
+    },
+
+    handleRemoveClick: async function(e) {
+        e.preventDefault();
+        e.stopPropagation();
+
+        const productId = this.getAttribute('data-id');
+        const favoriteItem = this.closest('.favorite-item');
+
+        const confirmed = await showCustomConfirm('Remove this item from your favorites?');
+        if (confirmed) {
+            favoriteItem.style.opacity = '0';
+            favoriteItem.style.transform = 'scale(0.8)';
+
+            setTimeout(() => {
+                favoritesSystem.removeFavorite(productId); // Call the system's remove method
+            }, 300);
+        }
+    },
+
+    handleAddToCartClick: function(e) {
+        e.preventDefault();
+        e.stopPropagation();
+
+        const productId = this.getAttribute('data-id');
+        const product = productData.getProduct(productId);
+
+        if (product) {
+            favoritesSystem.addToCart(product); // Call the system's add to cart method
+
+            // Visual feedback
+            this.innerHTML = '<i class="fas fa-check"></i>';
+            this.style.backgroundColor = '#28c76f';
+            this.style.color = 'white';
+
+            setTimeout(() => {
+                this.innerHTML = '<i class="fas fa-cart-plus"></i>';
+                this.style.backgroundColor = '';
+                this.style.color = '';
+            }, 1500);
+        }
+    },
+
+    handleEditClick: function() {
+        const favoritesGrid = document.getElementById('favorites-grid');
+        const removeButtons = document.querySelectorAll('.favorite-action-btn.remove');
+        const addToCartButtons = document.querySelectorAll('.favorite-action-btn.cart');
+
+        const isEditing = favoritesGrid.classList.toggle('editing');
+        this.innerHTML = isEditing ? 
+            '<i class="fas fa-check"></i> Done' : 
+            '<i class="fas fa-edit"></i> Edit';
+
+        removeButtons.forEach(btn => {
+            btn.style.display = isEditing ? 'flex' : 'none';
+        });
+
+        addToCartButtons.forEach(btn => {
+            btn.style.display = isEditing ? 'none' : 'flex';
+        });
+    }
+};
+
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Initial render of favorites
+    favoritesSystem.renderFavorites();
+
+    // Filter functionality
+    const filterButtons = document.querySelectorAll('.filter-btn');
+    filterButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            filterButtons.forEach(btn => btn.classList.remove('active'));
+            this.classList.add('active');
+            const filter = this.getAttribute('data-filter');
+            favoritesSystem.renderFavorites(filter);
+        });
+    });
+});
@@ -0,0 +1,54 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function () {
+    // Optional: Client-side active state for category tabs if needed for SPA-like feel
+    // without page reload, though current setup reloads with query params.
+    const categoryButtons = document.querySelectorAll('.category-button');
+    const currentUrlParams = new URLSearchParams(window.location.search);
+    const currentCategory = currentUrlParams.get('category');
+
+    categoryButtons.forEach(button => {
+        if ((!currentCategory && button.dataset.category === 'All') || button.dataset.category === currentCategory) {
+            // button.classList.add('active'); // Django template already handles this
+        }
+        button.addEventListener('click', function(event) {
+            // Optional: if you wanted to handle filtering via JS instead of page reload
+            // event.preventDefault();
+            // const selectedCat = this.dataset.category;
+            // window.location.href = `${pageData.foodListUrl}?category=${encodeURIComponent(selectedCat)}`;
+        });
+    });
+
+    // Active state for bottom nav
+    const currentPath = window.location.pathname;
+    const navItems = document.querySelectorAll('.nav-bar .nav-item');
+    let foodListIsActive = false;
+    navItems.forEach(item => {
+        const itemPath = item.getAttribute('href');
+        if (itemPath && currentPath.startsWith(itemPath)) { // Use startsWith for more flexible matching
+             if (item.id === 'foodlistNav'){
+                foodListIsActive = true;
+             } else {
+                item.classList.add('active');
+             }
+        } else {
+            item.classList.remove('active');
+        }
+    });
+    // Ensure "Menu" is active if on food_list page, overriding broader matches
+    if (foodListIsActive || currentPath.includes(pageData.foodListUrl)) {
+         navItems.forEach(opt => opt.classList.remove('active'));
+         document.getElementById('foodlistNav')?.classList.add('active');
+    }
+
+
+    // Message dismissal (optional)
+    const messages = document.querySelectorAll('.messages li');
+    messages.forEach(message => {
+        message.addEventListener('click', function() {
+            this.style.opacity = '0';
+            setTimeout(() => this.remove(), 300);
+        });
+    });
+    });
@@ -0,0 +1,91 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+// Data storage using localStorage
+const USER_KEY = "goldenBites_user";
+const RESET_TOKENS_KEY = "goldenBites_resetTokens";
+
+document.addEventListener('DOMContentLoaded', function() {
+    initForgotPasswordPage();
+});
+
+function initForgotPasswordPage() {
+    const forgotPasswordForm = document.getElementById("forgotPasswordForm");
+    const messageContainer = document.getElementById("forgotPasswordMessage");
+
+    if (forgotPasswordForm) {
+        forgotPasswordForm.addEventListener("submit", function(e) {
+            e.preventDefault();
+
+            const email = document.getElementById("forgotEmail").value.trim();
+
+            if (!email) {
+                showMessage(messageContainer, "Please enter your email address.", "error");
+                return;
+            }
+
+            // In a real Django application, you would send this data to a Django view
+            // to handle the password reset process.
+            // For this frontend simulation, we'll continue with the local storage logic.
+            const token = generateResetToken(email);
+
+            if (token) {
+                // Simulate email sent
+                showMessage(messageContainer, "Reset link sent! Check your email.", "success");
+
+                // Simulate redirect to reset password page
+                setTimeout(() => {
+                    window.location.href = `/reset-password/?token=${token}&email=${encodeURIComponent(email)}`;
+                }, 2000);
+            } else {
+                showMessage(messageContainer, "Email not found. Please check and try again.", "error");
+            }
+        });
+    }
+
+    // Setup back button to go to sign-in page
+    const backIcon = document.querySelector(".back-icon");
+    if (backIcon) {
+        backIcon.addEventListener("click", function() {
+            window.location.href = pageData.signInUrl;
+        });
+    }
+}
+
+function generateResetToken(email) {
+    const resetTokens = JSON.parse(localStorage.getItem(RESET_TOKENS_KEY)) || [];
+
+    // Check if user exists (simplified with local storage)
+    const user = JSON.parse(localStorage.getItem(USER_KEY));
+    if (!user || user.email !== email) {
+        return null;
+    }
+
+    // Generate a token (in a real app, this would be a secure random token)
+    const token = Math.random().toString(36).substring(2, 15) + Math.random().toString(36).substring(2, 15);
+
+    // Store the token with the email and expiration time (24 hours)
+    const expiresAt = new Date();
+    expiresAt.setHours(expiresAt.getHours() + 24);
+
+    const resetToken = {
+        email,
+        token,
+        expiresAt: expiresAt.toISOString(),
+    };
+
+    // Remove any existing tokens for this email
+    const filteredTokens = resetTokens.filter((t) => t.email !== email);
+    filteredTokens.push(resetToken);
+
+    localStorage.setItem(RESET_TOKENS_KEY, JSON.stringify(filteredTokens));
+
+    return token;
+}
+
+function showMessage(container, message, type) {
+    if (container) {
+        container.textContent = message;
+        container.className = `message-container ${type}`;
+    }
+}
@@ -0,0 +1,102 @@
+        document.addEventListener('DOMContentLoaded', function() {
+            // Settings Modal Logic
+            const settingsModal = document.getElementById('settingsModal');
+            const settingsIcon = document.getElementById('settings-icon');
+            const settingsModalClose = document.getElementById('settingsModalClose');
+
+            if (settingsIcon) {
+                settingsIcon.onclick = function() {
+                    if (settingsModal) settingsModal.style.display = 'flex'; // Use flex for centering
+                }
+            }
+            if (settingsModalClose) {
+                settingsModalClose.onclick = function() {
+                    if (settingsModal) settingsModal.style.display = 'none';
+                }
+            }
+            window.onclick = function(event) {
+                if (event.target == settingsModal) {
+                    settingsModal.style.display = 'none';
+                }
+            }
+
+
+
+
+            const homeSearchInput = document.getElementById('homeSearchInput');
+            const homeSearchButton = document.getElementById('homeSearchButton');
+            const productGrid = document.querySelector('.product-grid');
+            const allProductCards = productGrid ? Array.from(productGrid.getElementsByClassName('product-card')) : [];
+            const noItemsMessage = document.querySelector('.no-items-message');
+            const originalNoItemsText = noItemsMessage ? noItemsMessage.querySelector('p').textContent : "No Food Items Found";
+            const originalNoItemsSubtext = noItemsMessage ? noItemsMessage.querySelector('.subtext').textContent : "No items available at the moment. Please check back later.";
+
+            function filterProductsOnHome() {
+    const searchTerm = homeSearchInput.value.toLowerCase().trim();
+    let visibleCount = 0;
+    allProductCards.forEach(card => {
+        const name = card.dataset.productName || '';
+        const desc = card.dataset.productDescription || '';
+        const category = card.dataset.productCategory || '';
+        if (
+            name.includes(searchTerm) ||
+            desc.includes(searchTerm) ||
+            category.includes(searchTerm)
+        ) {
+            card.style.display = '';
+            visibleCount++;
+        } else {
+            card.style.display = 'none';
+        }
+    });
+    if (visibleCount === 0) {
+        if (productGrid) productGrid.style.display = 'none';
+        if (noItemsMessage) noItemsMessage.style.display = 'block';
+    } else {
+        if (productGrid) productGrid.style.display = 'grid';
+        if (noItemsMessage) noItemsMessage.style.display = 'none';
+    }
+}
+
+            if (homeSearchInput && homeSearchButton) {
+                homeSearchInput.addEventListener('input', filterProductsOnHome);
+                homeSearchButton.addEventListener('click', filterProductsOnHome);
+            }
+
+            // Initial state check for the noItemsMessage if products are initially empty
+            if (allProductCards.length === 0 && noItemsMessage && productGrid) {
+                productGrid.style.display = 'none';
+                noItemsMessage.style.display = 'block';
+            } else if (noItemsMessage) {
+                noItemsMessage.style.display = 'none'; // Hide if there are products
+            }
+
+            // Category chip active state based on URL parameter (already handled by Django template)
+            // Smooth scroll for category chips (optional, if many categories)
+            const categoriesScroll = document.querySelector('.categories-scroll');
+            if (categoriesScroll) {
+                categoriesScroll.addEventListener('wheel', function(e) {
+                    // If the element can't scroll horizontally (content fits within view), 
+                    // do nothing and let the event bubble up for normal page scroll.
+                    if (categoriesScroll.scrollWidth <= categoriesScroll.clientWidth) {
+                        return;
+                    }
+
+                    let scrolledHorizontally = false;
+                    // Prioritize deltaX if it's clearly a horizontal scroll action
+                    if (Math.abs(e.deltaX) > Math.abs(e.deltaY) && e.deltaX !== 0) {
+                        categoriesScroll.scrollLeft += e.deltaX;
+                        scrolledHorizontally = true;
+                    } else if (e.deltaY !== 0) { 
+                        // If deltaY is present (and more significant or deltaX is 0), use it for horizontal scroll
+                        categoriesScroll.scrollLeft += e.deltaY;
+                        scrolledHorizontally = true;
+                    }
+
+                    if (scrolledHorizontally) {
+                        // If we did scroll horizontally, prevent the default vertical scroll of the page.
+                        e.preventDefault();
+                    }
+                }, { passive: false }); // Required for preventDefault to work effectively in wheel events
+            }
+        });
@@ -0,0 +1,51 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Get form elements
+    const loginForm = document.getElementById('loginForm');
+    const emailInput = document.getElementById('email');
+    const passwordInput = document.getElementById('password');
+    const emailError = document.getElementById('email-error');
+    const passwordError = document.getElementById('password-error');
+
+    // Add form submission handler
+    if (loginForm) {
+        loginForm.addEventListener('submit', function(e) {
+            console.log("Login form submitted."); // Debug log
+
+            // Reset error messages
+            if (emailError) emailError.style.display = 'none';
+            if (passwordError) passwordError.style.display = 'none';
+            console.log("Error messages reset."); // Debug log
+
+            // Get form values
+            const email = emailInput ? emailInput.value.trim() : '';
+            const password = passwordInput ? passwordInput.value.trim() : '';
+
+            console.log(`Attempting login with Email: "${email}", Password: "${password}"`); // Debug log
+
+            // Validate email
+            if (!email) {
+                if (emailError) {
+                    emailError.textContent = 'Please enter your email';
+                    emailError.style.display = 'block';
+                }
+                e.preventDefault(); // Prevent form submission if client-side validation fails
+                console.log("Email validation failed: Email is empty. Form submission prevented."); // Debug log
+                return;
+            }
+
+            // Validate password
+            if (!password) {
+                if (passwordError) {
+                    passwordError.textContent = 'Please enter your password';
+                    passwordError.style.display = 'block';
+                }
+                e.preventDefault(); // Prevent form submission if client-side validation fails
+                console.log("Password validation failed: Password is empty. Form submission prevented."); // Debug log
+                return;
+            }
+
+            console.log("Client-side validation passed for login. Form will be submitted to Django."); // Debug log
+            // Django will handle actual authentication and redirection
+        });
+    }
+});
@@ -0,0 +1,219 @@
+// Function to show custom alert modal
+function showAlert(title, message) {
+    const modal = document.getElementById('customAlertModal');
+    const titleElement = document.getElementById('customAlertTitle');
+    const messageElement = document.getElementById('customAlertMessage');
+    const okButton = document.getElementById('customAlertOkButton');
+
+    titleElement.textContent = title;
+    messageElement.textContent = message;
+    modal.style.display = 'flex'; // Show the modal
+
+    okButton.onclick = function() {
+        modal.style.display = 'none'; // Hide the modal when OK is clicked
+    };
+}
+
+// Function to show custom confirmation modal (not used in this page, but included for consistency)
+function showConfirm(title, message) {
+    return new Promise((resolve) => {
+        const modal = document.getElementById('customConfirmModal');
+        const titleElement = document.getElementById('customConfirmTitle');
+        const messageElement = document.getElementById('customConfirmMessage');
+        const yesButton = document.getElementById('customConfirmYesButton');
+        const noButton = document.getElementById('customConfirmNoButton');
+
+        titleElement.textContent = title;
+        messageElement.textContent = message;
+        modal.style.display = 'flex';
+
+        const cleanup = () => {
+            yesButton.onclick = null;
+            noButton.onclick = null;
+            modal.style.display = 'none';
+        };
+
+        yesButton.onclick = () => {
+            cleanup();
+            resolve(true);
+        };
+
+        noButton.onclick = () => {
+            cleanup();
+            resolve(false);
+        };
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Initialize notifications
+    initNotifications();
+});
+
+function initNotifications() {
+    // Get DOM elements
+    const notificationList = document.getElementById('notification-list');
+    const emptyNotifications = document.getElementById('empty-notifications');
+    const markAllReadBtn = document.getElementById('mark-all-read');
+    const filterButtons = document.querySelectorAll('.filter-btn');
+
+    // Add event listener to mark all as read button
+    if (markAllReadBtn) {
+        markAllReadBtn.addEventListener('click', function() {
+            // Mark all notifications as read
+            const unreadItems = document.querySelectorAll('.notification-item.unread');
+            unreadItems.forEach(item => {
+                item.classList.remove('unread');
+                const markReadBtn = item.querySelector('.mark-read');
+                if (markReadBtn) {
+                    markReadBtn.style.display = 'none';
+                }
+            });
+
+            // Show toast notification
+            showToast('All notifications marked as read');
+        });
+    }
+
+    // Add event listeners to filter buttons
+    filterButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            // Remove active class from all buttons
+            filterButtons.forEach(btn => btn.classList.remove('active'));
+
+            // Add active class to clicked button
+            this.classList.add('active');
+
+            // Get filter value
+            const filter = this.getAttribute('data-filter');
+
+            // Filter notifications
+            filterNotifications(filter);
+        });
+    });
+
+    // Add event listeners to mark as read buttons
+    const markReadButtons = document.querySelectorAll('.mark-read');
+    markReadButtons.forEach(button => {
+        button.addEventListener('click', function(e) {
+            e.stopPropagation();
+
+            const notificationItem = this.closest('.notification-item');
+            const notificationId = this.dataset.id; // Or notificationItem.dataset.notificationId
+
+            // Mark notification as read
+            if (notificationItem) {
+                // TODO: Add AJAX call here to mark as read on the server
+                // For now, just update UI
+                notificationItem.classList.remove('unread');
+                this.style.display = 'none';
+
+                // Show toast notification
+                showToast('Notification marked as read');
+                // Potentially update "unread" filter count if active
+                if (document.querySelector('.filter-btn.active[data-filter="unread"]')) {
+                    filterNotifications('unread');
+                }
+            }
+        });
+    });
+
+    // Function to filter notifications
+    function filterNotifications(filter) {
+        const notificationItems = document.querySelectorAll('.notification-item');
+        let visibleCount = 0;
+
+        notificationItems.forEach(item => {
+            const type = item.getAttribute('data-type');
+            const isUnread = item.classList.contains('unread');
+
+            if (filter === 'all' || 
+                (filter === type) || 
+                (filter === 'unread' && isUnread)) {
+                item.style.display = 'block';
+                visibleCount++;
+            } else {
+                item.style.display = 'none';
+            }
+        });
+
+        // Show/hide empty state
+        if (visibleCount === 0) {
+            if (notificationList) notificationList.style.display = 'none';
+            if (emptyNotifications) emptyNotifications.style.display = 'flex';
+        } else {
+            if (notificationList) notificationList.style.display = 'flex';
+            if (emptyNotifications) emptyNotifications.style.display = 'none';
+        }
+
+        // Hide date separators with no visible notifications
+        const dateSeparators = document.querySelectorAll('.date-separator');
+        dateSeparators.forEach(separator => {
+            let nextElement = separator.nextElementSibling;
+            let hasVisibleNotification = false;
+
+            // Check if there's a visible notification after this separator
+            // and before the next separator
+            while (nextElement && !nextElement.classList.contains('date-separator')) {
+                if (nextElement.classList.contains('notification-item') && 
+                    nextElement.style.display !== 'none') {
+                    hasVisibleNotification = true;
+                    break;
+                }
+                nextElement = nextElement.nextElementSibling;
+            }
+
+            separator.style.display = hasVisibleNotification ? 'flex' : 'none';
+        });
+    }
+
+    // Function to show toast notification
+    function showToast(message) {
+        // Create toast container if it doesn't exist
+        let toastContainer = document.getElementById('toast-container');
+        if (!toastContainer) {
+            toastContainer = document.createElement('div');
+            toastContainer.id = 'toast-container';
+            toastContainer.style.position = 'fixed';
+            toastContainer.style.bottom = '20px';
+            toastContainer.style.left = '50%';
+            toastContainer.style.transform = 'translateX(-50%)';
+            toastContainer.style.zIndex = '1000';
+            document.body.appendChild(toastContainer);
+        }
+
+        // Create toast element
+        const toast = document.createElement('div');
+        toast.style.backgroundColor = 'rgba(0, 0, 0, 0.8)';
+        toast.style.color = 'white';
+        toast.style.padding = '10px 20px';
+        toast.style.borderRadius = '4px';
+        toast.style.marginBottom = '10px';
+        toast.style.fontSize = '14px';
+        toast.textContent = message;
+
+        // Add to container
+        toastContainer.appendChild(toast);
+
+        // Remove after 3 seconds
+        setTimeout(() => {
+            toast.remove();
+        }, 3000);
+    }
+
+    // Initial call to filter/show correct state
+    if (document.querySelector('.filter-btn.active')) {
+         filterNotifications(document.querySelector('.filter-btn.active').dataset.filter);
+    } else {
+        filterNotifications('all'); // Default if no filter is active (should not happen with new setup)
+    }
+
+    // Check initial empty state after loading dynamic content
+    const initialItems = notificationList.querySelectorAll('.notification-item');
+    if (initialItems.length === 0 && emptyNotifications) {
+        notificationList.style.display = 'none';
+        emptyNotifications.style.display = 'flex';
+    } else if (emptyNotifications) {
+         emptyNotifications.style.display = 'none';
+    }
+}
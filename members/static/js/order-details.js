@@ -0,0 +1,196 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function() {
+    const csrfToken = pageData.csrfToken;
+    const batchUrl = pageData.cartBatchUrl;
+    const DEBOUNCE_MS = 400; // Rapid +/- clicks are coalesced into one request
+    const MAX_QUANTITY = 99;
+
+    // productId -> desired quantity (0 = remove), waiting to be sent
+    let pendingQuantities = new Map();
+    let flushTimer = null;
+    let requestInFlight = false;
+
+    function formatPeso(amount) {
+        return `₱${Number(amount).toFixed(2).replace(/\B(?=(\d{3})+(?!\d))/g, ",")}`;
+    }
+
+    function scheduleFlush() {
+        clearTimeout(flushTimer);
+        flushTimer = setTimeout(flushOperations, DEBOUNCE_MS);
+    }
+
+    function queueQuantity(cartItemDiv, quantity) {
+        const quantityEl = cartItemDiv.querySelector('.quantity-input');
+        quantityEl.textContent = quantity; // Optimistic; the server response is authoritative
+        if (quantity === 0) {
+            cartItemDiv.style.display = 'none';
+        }
+        pendingQuantities.set(cartItemDiv.dataset.productId, quantity);
+        scheduleFlush();
+    }
+
+    function flushOperations() {
+        if (requestInFlight) {
+            scheduleFlush(); // Keep operations in order: wait for the previous batch
+            return;
+        }
+        if (pendingQuantities.size === 0) {
+            return;
+        }
+        const operations = Array.from(pendingQuantities, ([productId, quantity]) => (
+            quantity === 0 ? { op: 'remove', product_id: productId } : { op: 'set', product_id: productId, quantity: quantity }
+        ));
+        pendingQuantities = new Map();
+        requestInFlight = true;
+
+        fetch(batchUrl, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken,
+                'X-Requested-With': 'XMLHttpRequest'
+            },
+            body: JSON.stringify({ operations: operations })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.cart) {
+                renderCart(data.cart);
+            }
+            if (!data.success) {
+                showToast(data.error || 'Failed to update your cart.', 'error');
+            }
+        })
+        .catch(error => {
+            console.error('Error updating cart:', error);
+            showToast('An error occurred. Please refresh the page.', 'error');
+        })
+        .finally(() => {
+            requestInFlight = false;
+        });
+    }
+
+    function renderCart(cart) {
+        const serverItems = new Map(cart.items.map(item => [String(item.id), item]));
+        document.querySelectorAll('.cart-item').forEach(cartItemDiv => {
+            const productId = cartItemDiv.dataset.productId;
+            if (pendingQuantities.has(productId)) {
+                return; // Changed again since this batch was sent; the next response will cover it
+            }
+            const item = serverItems.get(productId);
+            if (!item) {
+                cartItemDiv.remove();
+                return;
+            }
+            cartItemDiv.style.display = '';
+            cartItemDiv.querySelector('.quantity-input').textContent = item.quantity;
+            cartItemDiv.querySelector('.item-subtotal-value').textContent = Number(item.item_total).toFixed(2).replace(/\B(?=(\d{3})+(?!\d))/g, ",");
+        });
+
+        const grandTotalAmountEl = document.getElementById('grand-total-amount');
+        const proceedButtonAmountEl = document.getElementById('proceed-button-amount');
+        const totalItemsCountEl = document.getElementById('total-items-count');
+        const totalCartPriceDisplay = document.getElementById('total-cart-price-display');
+        if (grandTotalAmountEl) grandTotalAmountEl.textContent = formatPeso(cart.total_price);
+        if (proceedButtonAmountEl) proceedButtonAmountEl.textContent = formatPeso(cart.total_price);
+        if (totalCartPriceDisplay) totalCartPriceDisplay.textContent = formatPeso(cart.total_price);
+        if (totalItemsCountEl) totalItemsCountEl.textContent = cart.total_items;
+        checkEmptyCart();
+    }
+
+    document.querySelectorAll('.qty-btn').forEach(button => {
+        button.addEventListener('click', function() {
+            const cartItemDiv = this.closest('.cart-item');
+            let quantity = parseInt(cartItemDiv.querySelector('.quantity-input').textContent);
+            if (this.dataset.action === 'increase') {
+                if (quantity >= MAX_QUANTITY) return;
+                quantity++;
+            } else {
+                quantity = Math.max(quantity - 1, 0); // Reaching 0 removes the item
+            }
+            queueQuantity(cartItemDiv, quantity);
+        });
+    });
+
+    document.querySelectorAll('.delete-item-btn').forEach(button => {
+        button.addEventListener('click', function(event) {
+            event.preventDefault(); // The href is the no-JavaScript fallback
+            queueQuantity(this.closest('.cart-item'), 0);
+        });
+    });
+
+    // Don't lose a pending change when the customer heads to payment straight after clicking
+    const proceedLinks = document.querySelectorAll('#proceed-to-payment-btn, #process-payment-link');
+    proceedLinks.forEach(link => {
+        link.addEventListener('click', function(event) {
+            if (pendingQuantities.size === 0 && !requestInFlight) return;
+            event.preventDefault();
+            clearTimeout(flushTimer);
+            flushOperations();
+            const waitForCart = setInterval(() => {
+                if (pendingQuantities.size === 0 && !requestInFlight) {
+                    clearInterval(waitForCart);
+                    window.location.href = link.href;
+                }
+            }, 50);
+        });
+    });
+
+    function checkEmptyCart() {
+        const itemsContainer = document.querySelector('.cart-items-container');
+        const emptyCartMessage = document.querySelector('.empty-cart-message');
+        const hasItems = Array.from(document.querySelectorAll('.cart-item')).some(item => item.style.display !== 'none');
+
+        if (itemsContainer) itemsContainer.style.display = hasItems ? 'block' : 'none';
+        document.querySelectorAll('.bottom-summary-bar').forEach(bar => {
+            bar.style.display = hasItems ? 'flex' : 'none';
+        });
+        if (emptyCartMessage) emptyCartMessage.style.display = hasItems ? 'none' : 'block';
+        const appContainer = document.querySelector('.app-container');
+        if (appContainer) appContainer.style.paddingBottom = hasItems ? '140px' : '80px';
+    }
+
+    // Django messages auto-hide
+    setTimeout(() => {
+        document.querySelectorAll('.messages-container .alert').forEach(message => {
+            message.style.transition = 'opacity 0.5s ease';
+            message.style.opacity = '0';
+            setTimeout(() => message.remove(), 500);
+        });
+    }, 5000);
+
+    // Toast notification function (basic implementation)
+    function showToast(message, type = 'info') {
+        const toastContainer = document.getElementById('toast-notifications') || createToastContainer();
+        const toast = document.createElement('div');
+        toast.className = `toast toast-${type}`;
+        toast.textContent = message;
+        toastContainer.appendChild(toast);
+        setTimeout(() => {
+            toast.classList.add('show');
+            setTimeout(() => {
+                toast.classList.remove('show');
+                setTimeout(() => toast.remove(), 500);
+            }, 3000);
+        }, 100); // Slight delay to trigger animation
+    }
+
+    function createToastContainer() {
+        let container = document.getElementById('toast-notifications');
+        if (!container) {
+            container = document.createElement('div');
+            container.id = 'toast-notifications';
+            container.style.position = 'fixed';
+            container.style.top = '20px';
+            container.style.right = '20px';
+            container.style.zIndex = '2000';
+            container.style.display = 'flex';
+            container.style.flexDirection = 'column';
+            container.style.gap = '10px';
+            document.body.appendChild(container);
+        }
+        return container;
+    }
+});
@@ -0,0 +1,239 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+// Function to show custom alert modal
+function showAlert(title, message) {
+    const modal = document.getElementById('customAlertModal');
+    const titleElement = document.getElementById('customAlertTitle');
+    const messageElement = document.getElementById('customAlertMessage');
+    const okButton = document.getElementById('customAlertOkButton');
+
+    titleElement.textContent = title;
+    messageElement.textContent = message;
+    modal.style.display = 'flex'; // Show the modal
+
+    okButton.onclick = function() {
+        modal.style.display = 'none'; // Hide the modal when OK is clicked
+    };
+}
+
+// Function to show custom confirmation modal (not used in this page, but included for consistency)
+function showConfirm(title, message) {
+    return new Promise((resolve) => {
+        const modal = document.getElementById('customConfirmModal');
+        const titleElement = document.getElementById('customConfirmTitle');
+        const messageElement = document.getElementById('customConfirmMessage');
+        const yesButton = document.getElementById('customConfirmYesButton');
+        const noButton = document.getElementById('customConfirmNoButton');
+
+        titleElement.textContent = title;
+        messageElement.textContent = message;
+        modal.style.display = 'flex';
+
+        const cleanup = () => {
+            yesButton.onclick = null;
+            noButton.onclick = null;
+            modal.style.display = 'none';
+        };
+
+        yesButton.onclick = () => {
+            cleanup();
+            resolve(true);
+        };
+
+        noButton.onclick = () => {
+            cleanup();
+            resolve(false);
+        };
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Constants for localStorage keys
+    const REVENUE_DATA_KEY = 'goldenBites_revenueData'; // Shared with dashboard
+    const SHOP_NAME_KEY = 'goldenBites_shopName';
+
+    // Set shop name
+    const shopNameHeading = document.getElementById('shopNameHeading');
+    if (shopNameHeading) {
+        const shopName = localStorage.getItem(SHOP_NAME_KEY) || "Golden Bites Shop";
+        shopNameHeading.textContent = shopName;
+    }
+
+    // Load sales data for default time period (24 hours)
+    loadSalesData('24hours');
+
+    // Add event listeners to time filter options
+    const timeOptions = document.querySelectorAll('.time-option');
+    timeOptions.forEach(option => {
+        option.addEventListener('click', function() {
+            // Remove active class from all options
+            timeOptions.forEach(opt => opt.classList.remove('active'));
+            // Add active class to clicked option
+            this.classList.add('active');
+            // Load sales data for selected time period
+            const period = this.getAttribute('data-period');
+            loadSalesData(period);
+        });
+    });
+
+    // Add event listener to export button
+    const exportBtn = document.getElementById('exportBtn');
+    if (exportBtn) {
+        exportBtn.addEventListener('click', function() {
+            showAlert('Export Data', 'Export functionality would be implemented here.');
+        });
+    }
+
+   // Add event listeners to navigation items and highlight active item
+    const homeNav = document.getElementById('homeNav');
+    const ordersNav = document.getElementById('ordersNav');
+    const ordersummaryNav = document.getElementById('ordersummaryNav');
+    const overviewNav = document.getElementById('overviewNav');
+    const addButton = document.getElementById('addButton');
+
+    // Define a mapping of nav elements to their URLs
+    const navMap = {
+        homeNav: pageData.dashboardUrl,
+        ordersNav: pageData.ordersUrl,
+        addButton: pageData.addItemUrl,
+        overviewNav: pageData.orderSummaryUrl,
+        ordersummaryNav: pageData.overviewUrl
+    };
+
+    // Get current path
+    const currentPath = window.location.pathname;
+
+    // Loop through the map and set click + active logic
+    Object.entries(navMap).forEach(([id, url]) => {
+        const navItem = document.getElementById(id);
+        if (navItem) {
+            // Set click handler
+            navItem.addEventListener('click', function () {
+                window.location.href = url;
+            });
+
+            // Set active class based on URL match
+            const tempLink = document.createElement('a');
+            tempLink.href = url;
+            if (tempLink.pathname === currentPath) {
+                navItem.classList.add('active');
+            } else {
+                navItem.classList.remove('active');
+            }
+        }
+    });
+
+    // Handle Add button separately (no active state, unless you want it)
+    if (addButton) {
+        addButton.addEventListener('click', function () {
+            window.location.href = pageData.addItemUrl;
+        });
+    }
+
+
+    // Add event listener to back icon
+    const backIcon = document.getElementById('back-icon');
+    if (backIcon) {
+        backIcon.addEventListener('click', function() {
+            window.history.back();
+        });
+    }
+});
+
+// Function to load sales data
+function loadSalesData(period) {
+    // In a real app, this would fetch data from a server
+    // For demo purposes, we'll use mock data
+
+    let salesData;
+
+    switch (period) {
+        case '12months':
+            salesData = {
+                totalSales: 125000,
+                totalRevenue: 112500,
+                totalOrders: 1250,
+                revenuePeriod: 'May 2024 - May 2025'
+            };
+            break;
+        case '30days':
+            salesData = {
+                totalSales: 42000,
+                totalRevenue: 37800,
+                totalOrders: 420,
+                revenuePeriod: 'Apr 2025 - May 2025'
+            };
+            break;
+        case '7days':
+            salesData = {
+                totalSales: 9800,
+                totalRevenue: 8820,
+                totalOrders: 98,
+                revenuePeriod: 'May 15, 2025 - May 22, 2025'
+            };
+            break;
+        case '24hours':
+        default:
+            salesData = {
+                totalSales: 1500,
+                totalRevenue: 1350,
+                totalOrders: 15,
+                revenuePeriod: 'Today (May 22, 2025)'
+            };
+            break;
+    }
+
+    // Save revenue data to localStorage for sharing with dashboard
+    const revenueData = {
+        totalRevenue: salesData.totalRevenue,
+        period: salesData.revenuePeriod
+    };
+    localStorage.setItem('goldenBites_revenueData', JSON.stringify(revenueData));
+
+    // Update UI with sales data
+    updateSalesUI(salesData);
+}
+
+// Function to update UI with sales data
+function updateSalesUI(data) {
+    // Format currency
+    const formatCurrency = (amount) => {
+        return new Intl.NumberFormat('en-PH', {
+            style: 'currency',
+            currency: 'PHP',
+            minimumFractionDigits: 2,
+            maximumFractionDigits: 2
+        }).format(amount).replace('PHP', '₱');
+    };
+
+    // Update total sales
+    const totalSalesElement = document.getElementById('totalSales');
+    if (totalSalesElement) {
+        totalSalesElement.textContent = formatCurrency(data.totalSales);
+    }
+
+    // Update total revenue
+    const totalRevenueElement = document.getElementById('totalRevenue');
+    if (totalRevenueElement) {
+        totalRevenueElement.textContent = formatCurrency(data.totalRevenue);
+    }
+
+    // Update total orders
+    const totalOrdersElement = document.getElementById('totalOrders');
+    if (totalOrdersElement) {
+        totalOrdersElement.textContent = data.totalOrders;
+    }
+
+    // Update revenue amount
+    const revenueAmountElement = document.getElementById('revenueAmount');
+    if (revenueAmountElement) {
+        revenueAmountElement.textContent = formatCurrency(data.totalRevenue);
+    }
+
+    // Update revenue period
+    const revenuePeriodElement = document.getElementById('revenuePeriod');
+    if (revenuePeriodElement) {
+        revenuePeriodElement.textContent = data.revenuePeriod;
+    }
+}
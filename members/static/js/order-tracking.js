@@ -0,0 +1,57 @@
+document.addEventListener('DOMContentLoaded', function() {
+        const confirmReceiptBtn = document.getElementById('confirmReceiptBtn');
+
+        if (confirmReceiptBtn) {
+            confirmReceiptBtn.addEventListener('click', function() {
+                const orderId = this.dataset.orderId;
+                this.disabled = true;
+                this.textContent = 'Processing...';
+
+                // Retrieve CSRF token
+                const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]') ? document.querySelector('[name=csrfmiddlewaretoken]').value : getCookie('csrftoken');
+
+                fetch(`/acknowledge_order_receipt/${orderId}/`, {
+                    method: 'POST',
+                    headers: {
+                        'X-CSRFToken': csrfToken,
+                        'Content-Type': 'application/json', // Or 'application/x-www-form-urlencoded' if view expects that
+                        'X-Requested-With': 'XMLHttpRequest'
+                    },
+                    // body: JSON.stringify({}) // No body needed if just order_id in URL
+                })
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success) {
+                        // alert(data.message || 'Order closed successfully!'); // Optional alert
+                        window.location.reload(); // Reload to reflect the change
+                    } else {
+                        alert('Error: ' + (data.error || 'Could not acknowledge receipt.'));
+                        this.disabled = false;
+                        this.textContent = 'Confirm Receipt & Close Order';
+    }
+                })
+                .catch(error => {
+                    console.error('Error acknowledging receipt:', error);
+                    alert('An unexpected error occurred. Please try again.');
+                    this.disabled = false;
+                    this.textContent = 'Confirm Receipt & Close Order';
+                });
+            });
+}
+
+        // Helper function to get CSRF cookie (if not using hidden input)
+        function getCookie(name) {
+            let cookieValue = null;
+            if (document.cookie && document.cookie !== '') {
+                const cookies = document.cookie.split(';');
+                for (let i = 0; i < cookies.length; i++) {
+                    const cookie = cookies[i].trim();
+                    if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                        cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+            break;
+                    }
+    }
+}
+            return cookieValue;
+                }
+    });
@@ -0,0 +1,34 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function () {
+    // Logic for time filter (can be expanded later)
+    const timeOptions = document.querySelectorAll('.time-filter .time-option');
+    timeOptions.forEach(option => {
+        option.addEventListener('click', function() {
+            timeOptions.forEach(opt => opt.classList.remove('active'));
+            this.classList.add('active');
+            // TODO: Add logic to fetch/filter data based on selected time
+            console.log('Time filter selected:', this.textContent);
+        });
+    });
+
+    // Active state for bottom nav (simple version based on current page)
+    // More robust would be to pass active tab from Django view
+    const currentPath = window.location.pathname;
+    const navItems = document.querySelectorAll('.nav-bar .nav-item');
+    navItems.forEach(item => {
+        if (item.getAttribute('href') === currentPath) {
+            item.classList.add('active');
+        } else {
+            item.classList.remove('active'); // Ensure only one is active if hardcoded
+        }
+    });
+    // Specifically make overview active if on overview page (since URL might match)
+     if (currentPath.includes(pageData.overviewUrl)) {
+        document.querySelectorAll('.nav-bar .nav-item').forEach(opt => opt.classList.remove('active'));
+        document.getElementById('overviewNav')?.classList.add('active');
+    }
+
+
+});
@@ -0,0 +1,43 @@
+    document.addEventListener('DOMContentLoaded', function() {
+    // Payment and Pickup Method Selection Highlighting
+    function handleMethodSelection(groupElement) {
+        const options = groupElement.querySelectorAll('.method-option');
+        options.forEach(option => {
+            option.addEventListener('click', function() {
+                // Remove 'selected' from all options in this group
+                options.forEach(opt => opt.classList.remove('selected'));
+                // Add 'selected' to the clicked option
+                this.classList.add('selected');
+                // Ensure the radio button inside is checked
+                const radio = this.querySelector('input[type="radio"]');
+                if (radio) radio.checked = true;
+        });
+
+            // Initial check for pre-selected radios
+            const radio = option.querySelector('input[type="radio"]');
+            if (radio && radio.checked) {
+                option.classList.add('selected');
+            }
+        });
+        }
+
+    const paymentMethodGroup = document.getElementById('payment-method-group');
+    if (paymentMethodGroup) {
+        handleMethodSelection(paymentMethodGroup);
+    }
+
+    const pickupMethodGroup = document.getElementById('pickup-method-group');
+    if (pickupMethodGroup) {
+        handleMethodSelection(pickupMethodGroup);
+            }
+
+    // Auto-hide Django messages
+    setTimeout(() => {
+        const messages = document.querySelectorAll('#messages-container-django .alert');
+        messages.forEach(message => {
+            message.style.transition = 'opacity 0.5s ease';
+            message.style.opacity = '0';
+            setTimeout(() => message.remove(), 500);
+        });
+    }, 7000); // Display for 7 seconds
+});
@@ -0,0 +1,81 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function() {
+  // Get the back button and accept button
+  const backBtn = document.querySelector('.back-icon');
+  const acceptBtn = document.getElementById('acceptBtn');
+
+  // Add event listener to back button
+  if (backBtn) {
+    backBtn.addEventListener('click', function() {
+      // Check if there's a previous page in history
+      if (document.referrer) {
+        window.history.back();
+      } else {
+        // If no referrer, go to register page
+        window.location.href = pageData.registerUrl;
+      }
+    });
+  }
+
+  // Add event listener to accept button
+  if (acceptBtn) {
+    acceptBtn.addEventListener('click', function(e) {
+      e.preventDefault();
+
+      // Store acceptance in localStorage
+      try {
+        localStorage.setItem('termsAccepted', 'true');
+        localStorage.setItem('termsAcceptedDate', new Date().toISOString());
+      } catch (error) {
+        console.error('Error saving to localStorage:', error);
+      }
+
+      // Check if there's a previous page in history
+      if (document.referrer && document.referrer.includes('register')) {
+        window.history.back();
+      } else {
+        // If no referrer or not from register page, go to register page
+        window.location.href = pageData.registerUrl;
+      }
+    });
+  }
+
+  // Add smooth scrolling for better user experience
+  document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    anchor.addEventListener('click', function (e) {
+      e.preventDefault();
+
+      document.querySelector(this.getAttribute('href')).scrollIntoView({
+        behavior: 'smooth'
+      });
+    });
+  });
+
+  // Track reading progress
+  let readingProgress = 0;
+  const policyContainer = document.querySelector('.policy-container');
+
+  if (policyContainer) {
+    window.addEventListener('scroll', function() {
+      const containerHeight = policyContainer.scrollHeight;
+      const scrollPosition = window.scrollY + window.innerHeight;
+      const scrollPercentage = (scrollPosition / containerHeight) * 100;
+
+      // Update reading progress
+      if (scrollPercentage > readingProgress) {
+        readingProgress = scrollPercentage;
+
+        // If user has read at least 70% of the document, consider it as read
+        if (readingProgress >= 70) {
+          try {
+            localStorage.setItem('termsRead', 'true');
+          } catch (error) {
+            console.error('Error saving to localStorage:', error);
+          }
+        }
+      }
+    });
+  }
+});
@@ -0,0 +1,172 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+document.addEventListener('DOMContentLoaded', function() {
+    const pageTopBar = document.getElementById('pageTopBar');
+    const headerTitle = document.getElementById('headerTitle');
+    const heroImage = document.querySelector('.product-image-hero');
+    let titleVisibleThreshold = 100; // Adjust as needed
+
+    if (heroImage) {
+        titleVisibleThreshold = heroImage.offsetHeight - (pageTopBar ? pageTopBar.offsetHeight : 50) - 20; // Show title when image top is almost out of view
+    }
+
+    window.addEventListener('scroll', function() {
+        if (pageTopBar) {
+            if (window.scrollY > 50) { // Apply solid background early
+                pageTopBar.classList.add('scrolled');
+            } else {
+                pageTopBar.classList.remove('scrolled');
+            }
+            if (headerTitle && window.scrollY > titleVisibleThreshold) {
+                 pageTopBar.classList.add('scrolled'); // Ensure it's scrolled if title shows
+        }
+        }
+    });
+
+    // Quantity Selector Logic
+    const decreaseButton = document.getElementById('decreaseQuantity');
+    const increaseButton = document.getElementById('increaseQuantity');
+    const quantityDisplay = document.getElementById('quantityDisplay');
+    const formQuantityInput = document.getElementById('formQuantityInput');
+
+    if (decreaseButton && increaseButton && quantityDisplay && formQuantityInput) {
+        let quantity = parseInt(quantityDisplay.value);
+
+        decreaseButton.addEventListener('click', function() {
+            if (quantity > 1) {
+                quantity--;
+                quantityDisplay.value = quantity;
+                formQuantityInput.value = quantity;
+                increaseButton.disabled = false;
+            }
+            if (quantity === 1) {
+                decreaseButton.disabled = true;
+            }
+        });
+
+        increaseButton.addEventListener('click', function() {
+            quantity++; // Allow to increment indefinitely, or set a max
+            quantityDisplay.value = quantity;
+            formQuantityInput.value = quantity;
+            decreaseButton.disabled = false;
+            // Example: Max quantity
+            // if (quantity >= 10) { increaseButton.disabled = true; }
+        });
+        // Initial state for decrease button
+        if (quantity === 1) {
+            decreaseButton.disabled = true;
+        }
+        }
+
+    // Add to Cart Form Submission (with toast)
+    const addToCartForm = document.getElementById('addToCartForm');
+    const toastElement = document.getElementById('toast');
+
+    if (addToCartForm && toastElement) {
+        addToCartForm.addEventListener('submit', function(event) {
+            event.preventDefault(); // Prevent default form submission
+
+            const formData = new FormData(addToCartForm);
+            fetch(addToCartForm.action, {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'X-CSRFToken': formData.get('csrfmiddlewaretoken'),
+                    'X-Requested-With': 'XMLHttpRequest' // To help Django identify AJAX
+                }
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    toastElement.textContent = data.message || "Item added to cart!";
+                    toastElement.className = "toast show success"; // Add success class for styling
+                    // Redirect to cart page after showing toast
+                    setTimeout(function() { // Add a slight delay so user can see toast
+                        window.location.href = pageData.orderDetailsUrl;
+                    }, 500); // 0.5 second delay
+                } else {
+                    toastElement.textContent = data.error || "Failed to add item.";
+                    toastElement.className = "toast show error"; // Add error class for styling
+                    // No redirect on error, just show toast and hide it after timeout
+                    setTimeout(function(){ toastElement.className = toastElement.className.replace("show", ""); }, 3000);
+                }
+                // Removed the general setTimeout for hiding the toast here, as it's handled per case
+                // setTimeout(function(){ toastElement.className = toastElement.className.replace("show", ""); }, 3000);
+            })
+            .catch(error => {
+                console.error('Error adding to cart:', error);
+                toastElement.textContent = "An error occurred.";
+                toastElement.className = "toast show error";
+                setTimeout(function(){ toastElement.className = toastElement.className.replace("show", ""); }, 3000);
+            });
+        });
+    }
+
+    // Favorite button toggle (example)
+    const favButton = document.getElementById('favButton');
+    if (favButton) {
+        favButton.addEventListener('click', function() {
+            const heartIcon = favButton.querySelector('i');
+            heartIcon.classList.toggle('far'); // Toggle outlined
+            heartIcon.classList.toggle('fas'); // Toggle solid
+            heartIcon.classList.toggle('active'); // Custom active class for color
+            // Add actual favorite/unfavorite logic here (e.g., AJAX call)
+            if (heartIcon.classList.contains('active')) {
+                 toastElement.textContent = "Added to favorites!";
+            } else {
+                 toastElement.textContent = "Removed from favorites!";
+        }
+            toastElement.className = "toast show";
+            setTimeout(function(){ toastElement.className = toastElement.className.replace("show", ""); }, 2000);
+        });
+    }
+});
+    // JavaScript for review sort dropdown
+    const sortReviewsForm = document.getElementById('sortReviewsForm');
+    const sortBySelect = document.getElementById('sort_by_select');
+
+    if (sortBySelect && sortReviewsForm) {
+        // Set current URL to form action to preserve other query params if any
+        // However, for simple sort, window.location.href is fine.
+        // sortReviewsForm.action = window.location.pathname;
+
+        sortBySelect.addEventListener('change', function() {
+            // Construct URL with the selected sort option
+            const selectedSortOption = this.value;
+            const currentUrl = new URL(window.location.href);
+            currentUrl.searchParams.set('sort_by', selectedSortOption);
+            window.location.href = currentUrl.toString();
+        });
+    }
+    // Interactive Star Rating Widget
+    const starRating = document.getElementById('starRating');
+    const ratingInput = document.getElementById('ratingInput');
+    if (starRating && ratingInput) {
+        const stars = starRating.querySelectorAll('.star');
+        stars.forEach((star, idx) => {
+            star.addEventListener('mouseenter', function() {
+                highlightStars(idx + 1);
+            });
+            star.addEventListener('mouseleave', function() {
+                highlightStars(parseInt(ratingInput.value));
+            });
+            star.addEventListener('click', function() {
+                ratingInput.value = idx + 1;
+                highlightStars(idx + 1);
+            });
+        });
+        function highlightStars(rating) {
+            stars.forEach((star, i) => {
+                if (i < rating) {
+                    star.querySelector('i').classList.add('selected');
+                    star.querySelector('i').style.color = '#ffc107';
+                } else {
+                    star.querySelector('i').classList.remove('selected');
+                    star.querySelector('i').style.color = '#e0e0e0';
+                }
+            });
+        }
+        // Initialize on page load
+        highlightStars(parseInt(ratingInput.value));
+    }
@@ -0,0 +1,107 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+// Get email from URL parameters or localStorage
+document.addEventListener('DOMContentLoaded', function() {
+  // Try to get email from URL parameters
+  const urlParams = new URLSearchParams(window.location.search);
+  const email = urlParams.get('email') || localStorage.getItem('resetEmail') || 'user@example.com';
+
+  // Display email
+  document.getElementById('emailDisplay').textContent = email;
+
+  // Store email in localStorage for later use
+  localStorage.setItem('resetEmail', email);
+
+  // Add event listener to back button
+  document.getElementById('back-btn').addEventListener('click', function() {
+    window.history.back();
+  });
+});
+
+// Toggle password visibility
+function togglePasswordVisibility(inputId, toggleElement) {
+  const passwordInput = document.getElementById(inputId);
+  const eyeIcon = toggleElement.querySelector('.eye-icon');
+
+  if (passwordInput.type === 'password') {
+    passwordInput.type = 'text';
+    eyeIcon.src = pageData.eyeOpenImage;
+    // Fallback for missing image
+    eyeIcon.onerror = function() {
+      this.src = 'data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWV5ZSI+PHBhdGggZD0iTTIgMTJzMy02IDEwLTYgMTAgNiAxMCA2LTMgNi0xMCA2LTEwLTYtMTAtNloiLz48Y2lyY2xlIGN4PSIxMiIgY3k9IjEyIiByPSIzIi8+PC9zdmc+';
+    };
+  } else {
+    passwordInput.type = 'password';
+    eyeIcon.src = pageData.eyeCloseImage;
+    // Fallback for missing image
+    eyeIcon.onerror = function() {
+      this.src = 'data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIyNCIgaGVpZ2h0PSIyNCIgdmlld0JveD0iMCAwIDI0IDI0IiBmaWxsPSJub25lIiBzdHJva2U9ImN1cnJlbnRDb2xvciIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiIGNsYXNzPSJsdWNpZGUgbHVjaWRlLWV5ZS1vZmYiPjxwYXRoIGQ9Ik0xNy45NCAxNy45NEExMC4wNyAxMC4wNyAwIDAgMSAxMiAyMGMtNyAwLTExLTgtMTEtOGExOC40NSAxOC40NSAwIDAgMSA1LjA2LTUuOTRNOS45IDQuMjRBOS4xMiA5LjEyIDAgMCAxIDEyIDRjNycgMCAxMSA4IDExIDhhMTguNSAxOC41IDAgMCAxLTIuMTYgMy4xOWm-Ni43Mi0xLjA3YTMgMyAwIDEgMS00LjI0LTQuMjQiLz48bGluZSB4MT0iMSIgeTE9IjEiIHgyPSIyMyIgeTI9IjIzIi8+PC9zdmc+';
+    };
+  }
+}
+
+// Form submission handler
+document.getElementById('resetPasswordForm').addEventListener('submit', function(e) {
+  e.preventDefault();
+
+  const newPassword = document.getElementById('newPassword').value;
+  const confirmPassword = document.getElementById('confirmPassword').value;
+  const messageContainer = document.getElementById('resetPasswordMessage');
+
+  // Clear previous messages
+  messageContainer.innerHTML = '';
+  messageContainer.className = 'message-container';
+
+  // Validate passwords
+  if (newPassword !== confirmPassword) {
+    messageContainer.innerHTML = 'Passwords do not match!';
+    messageContainer.classList.add('error');
+    return;
+  }
+
+  if (newPassword.length < 8) {
+    messageContainer.innerHTML = 'Password must be at least 8 characters long!';
+    messageContainer.classList.add('error');
+    return;
+  }
+
+  // Check for password strength
+  const hasUpperCase = /[A-Z]/.test(newPassword);
+  const hasLowerCase = /[a-z]/.test(newPassword);
+  const hasNumbers = /\d/.test(newPassword);
+  const hasSpecialChar = /[!@#$%^&*(),.?":{}|<>]/.test(newPassword);
+
+  if (!(hasUpperCase && hasLowerCase && hasNumbers)) {
+    messageContainer.innerHTML = 'Password must contain uppercase, lowercase letters and numbers!';
+    messageContainer.classList.add('error');
+    return;
+  }
+
+  if (!hasSpecialChar) {
+    messageContainer.innerHTML = 'Password should include at least one special character!';
+    messageContainer.classList.add('error');
+    return;
+  }
+
+  // Simulate password reset success
+  messageContainer.innerHTML = 'Password reset successful! Redirecting to login...';
+  messageContainer.classList.add('success');
+
+  // In a real app, you would send the new password to the server here
+  try {
+    // Store the email in localStorage for the login page
+    const email = document.getElementById('emailDisplay').textContent;
+    localStorage.setItem('lastResetEmail', email);
+
+    // Clear the reset email
+    localStorage.removeItem('resetEmail');
+  } catch (e) {
+    console.error('Error accessing localStorage:', e);
+  }
+
+  // Redirect to login page after 2 seconds
+  setTimeout(() => {
+    window.location.href = pageData.signInUrl;
+  }, 2000);
+});
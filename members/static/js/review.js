@@ -0,0 +1,30 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const starRating = document.getElementById('starRating');
+    const ratingInput = document.getElementById('ratingInput');
+    if (starRating && ratingInput) {
+        const stars = starRating.querySelectorAll('.star');
+        stars.forEach((star, idx) => {
+            star.addEventListener('mouseenter', function() {
+                highlightStars(idx + 1);
+            });
+            star.addEventListener('mouseleave', function() {
+                highlightStars(parseInt(ratingInput.value));
+            });
+            star.addEventListener('click', function() {
+                ratingInput.value = idx + 1;
+                highlightStars(idx + 1);
+            });
+        });
+        function highlightStars(rating) {
+            stars.forEach((star, i) => {
+                if (i < rating) {
+                    star.querySelector('i').style.color = '#ffc107';
+                } else {
+                    star.querySelector('i').style.color = '#e0e0e0';
+                }
+            });
+        }
+        // Initialize on page load
+        highlightStars(parseInt(ratingInput.value));
+    }
+});
@@ -0,0 +1,86 @@
+document.addEventListener('DOMContentLoaded', function () {
+    const searchInput = document.getElementById('shopProductSearchInput');
+    const searchButton = document.getElementById('shopProductSearchButton');
+    const productGrid = document.querySelector('.product-grid');
+    const allProductCards = productGrid ? Array.from(productGrid.querySelectorAll('.product-card')) : [];
+    const noResultsMessage = document.getElementById('noSearchResultsMessage');
+    const originalNoProductsMessage = document.querySelector('.main-content-shop-products .no-items-message:not(#noSearchResultsMessage)');
+
+    function filterShopProducts() {
+    if (!productGrid) return;
+    const searchTerm = searchInput.value.toLowerCase().trim();
+    let visibleCount = 0;
+    allProductCards.forEach(card => {
+        const name = card.dataset.productName || '';
+        const desc = card.dataset.productDescription || '';
+        const category = card.dataset.productCategory || '';
+        if (
+            name.includes(searchTerm) ||
+            desc.includes(searchTerm) ||
+            category.includes(searchTerm)
+        ) {
+            card.style.display = '';
+            visibleCount++;
+        } else {
+            card.style.display = 'none';
+        }
+    });
+    if (visibleCount === 0) {
+        if (productGrid) productGrid.style.display = 'none';
+        if (noResultsMessage) noResultsMessage.style.display = 'block';
+    } else {
+        if (productGrid) productGrid.style.display = 'grid';
+        if (noResultsMessage) noResultsMessage.style.display = 'none';
+    }
+}
+        if (!productGrid) return; // No products to filter
+
+        const searchTerm = searchInput.value.toLowerCase().trim();
+        let visibleCount = 0;
+
+        allProductCards.forEach(card => {
+            const productName = card.dataset.productName || '';
+            // Add other attributes to search if needed, e.g., product.category
+            // const productDescription = card.dataset.productDescription || '';
+
+            if (productName.includes(searchTerm) /* || productDescription.includes(searchTerm) */) {
+                card.style.display = '';
+                visibleCount++;
+            } else {
+                card.style.display = 'none';
+            }
+        });
+
+        if (visibleCount === 0 && searchTerm !== '') {
+            productGrid.style.display = 'none';
+            if (originalNoProductsMessage) originalNoProductsMessage.style.display = 'none';
+            noResultsMessage.style.display = 'block';
+        } else if (allProductCards.length > 0) {
+            productGrid.style.display = 'grid'; // Or your default display for grid
+            noResultsMessage.style.display = 'none';
+            if (originalNoProductsMessage) originalNoProductsMessage.style.display = visibleCount > 0 ? 'none' : 'block';
+
+        } else { // No products at all initially
+            productGrid.style.display = 'none';
+            noResultsMessage.style.display = 'none';
+            if (originalNoProductsMessage) originalNoProductsMessage.style.display = 'block';
+        }
+    }
+
+    if (searchInput) {
+        searchInput.addEventListener('input', filterShopProducts);
+    }
+    if (searchButton) { // Optional: if you want the button to also trigger filter
+        searchButton.addEventListener('click', filterShopProducts);
+    }
+
+    // Initial state for messages
+    if (allProductCards.length === 0 && originalNoProductsMessage) {
+        if(productGrid) productGrid.style.display = 'none';
+        originalNoProductsMessage.style.display = 'block';
+    } else if (originalNoProductsMessage) {
+         originalNoProductsMessage.style.display = 'none';
+    }
+    if(noResultsMessage) noResultsMessage.style.display = 'none';
+
+});
@@ -0,0 +1,81 @@
+        document.addEventListener('DOMContentLoaded', function() {
+            const searchInput = document.getElementById('shopSearchInput');
+            const searchButton = document.getElementById('shopSearchButton');
+            const shopCardsGrid = document.querySelector('.shop-cards-grid');
+            const allShopCards = shopCardsGrid ? Array.from(shopCardsGrid.getElementsByClassName('shop-card')) : [];
+function filterShops() {
+    const searchTerm = searchInput.value.toLowerCase().trim();
+    let visibleCount = 0;
+    allShopCards.forEach(card => {
+        const name = card.dataset.stallName || '';
+        const address = card.dataset.stallAddress || '';
+        if (name.includes(searchTerm) || address.includes(searchTerm)) {
+            card.style.display = '';
+            visibleCount++;
+        } else {
+            card.style.display = 'none';
+        }
+    });
+    if (visibleCount === 0) {
+        if (shopCardsGrid) shopCardsGrid.style.display = 'none';
+        if (noSearchResultsMessage) noSearchResultsMessage.style.display = 'block';
+    } else {
+        if (shopCardsGrid) shopCardsGrid.style.display = 'grid';
+        if (noSearchResultsMessage) noSearchResultsMessage.style.display = 'none';
+    }
+}
+// Attach events
+if (searchInput) searchInput.addEventListener('input', filterShops);
+if (searchButton) searchButton.addEventListener('click', filterShops);
+            const noShopsMessage = document.querySelector('.no-shops-message'); // Original message if no stalls
+            const noSearchResultsMessage = document.querySelector('.no-search-results-message');
+
+            function filterShops() {
+                if (!shopCardsGrid) return; // Do nothing if there's no grid (e.g. no stalls at all)
+
+                const searchTerm = searchInput.value.toLowerCase().trim();
+                let visibleCount = 0;
+
+                allShopCards.forEach(card => {
+                    const stallNameElement = card.querySelector('.shop-card-info h3');
+                    // Use previously added data-stall-name or fallback to textContent
+                    const stallName = (stallNameElement.dataset.stallName || stallNameElement.textContent).toLowerCase();
+
+                    if (stallName.includes(searchTerm)) {
+                        card.style.display = ''; // Or 'flex' if that was the original display style for .shop-card
+                        visibleCount++;
+                    } else {
+                        card.style.display = 'none';
+                    }
+                });
+
+                if (visibleCount === 0 && searchTerm !== '') {
+                    shopCardsGrid.style.display = 'none';
+                    noSearchResultsMessage.style.display = 'block';
+                } else {
+                    shopCardsGrid.style.display = ''; // Or 'grid' if that was the original
+                    noSearchResultsMessage.style.display = 'none';
+                }
+
+                // If the main "no shops" message is visible, ensure search results message is hidden
+                if (noShopsMessage && getComputedStyle(noShopsMessage).display !== 'none') {
+                    noSearchResultsMessage.style.display = 'none';
+                    if(shopCardsGrid) shopCardsGrid.style.display = 'none'; // also hide grid if main no-shops is showing
+                }
+            }
+
+            if (searchInput && searchButton) {
+                searchInput.addEventListener('input', filterShops);
+                searchButton.addEventListener('click', filterShops);
+            }
+
+            // Initial check in case the page loads with pre-filled search or other states
+            // However, normally we want the "no-shops-message" from Django to take precedence if it's there
+            if (shopCardsGrid) { // Only run filter if there are shops to filter
+                 // If there are no shops initially, the django message will show. 
+                 // The search filter should only apply if there *are* shops.
+            } else if (noSearchResultsMessage) {
+                noSearchResultsMessage.style.display = 'none'; // Ensure it's hidden if no shop grid at all
+            }
+
+        });
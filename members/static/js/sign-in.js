@@ -0,0 +1,41 @@
+// URLs, ids and static paths come from the data-* attributes of this script tag
+const pageData = document.currentScript.dataset;
+
+function togglePasswordVisibility(fieldId, toggleElement) {
+    const passwordField = document.getElementById(fieldId);
+    const eyeIcon = toggleElement.querySelector('.eye-icon');
+    if (passwordField && eyeIcon) { // Ensure elements exist
+    if (passwordField.type === 'password') {
+        passwordField.type = 'text';
+            eyeIcon.src = pageData.eyeOpenImage; 
+    } else {
+        passwordField.type = 'password';
+        eyeIcon.src = pageData.eyeCloseImage;
+        }
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Client-side "Remember me" functionality (optional)
+    const emailInput = document.getElementById(pageData.usernameId);
+    const rememberCheckbox = document.getElementById('remember');
+
+    if (localStorage.getItem('rememberedUsername') && emailInput) {
+        emailInput.value = localStorage.getItem('rememberedUsername');
+        if (rememberCheckbox) rememberCheckbox.checked = true;
+    }
+
+    const loginForm = document.getElementById('loginForm');
+    if (loginForm && rememberCheckbox && emailInput) {
+        loginForm.addEventListener('submit', function() {
+            if (rememberCheckbox.checked) {
+                localStorage.setItem('rememberedUsername', emailInput.value);
+            } else {
+                localStorage.removeItem('rememberedUsername');
+            }
+        });
+    }
+
+    // Custom alert functionality (if needed elsewhere or for client-side only messages)
+    // window.showAlert = function(title, message) { ... } // If you want to make it global
+});
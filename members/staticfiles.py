@@ -0,0 +1,56 @@
+"""
+Static files (the per-page css/ and js/ bundles and images), served by the app servers.
+
+collectstatic writes them to STATIC_ROOT under content-hashed names (css/home.3f2a9c….css)
+with .gz and .br copies next to them (CompressedManifestStaticFilesStorage). {% static %}
+resolves to the hashed name, so those responses are cached for a year as immutable and a
+changed bundle simply gets a new URL. WhiteNoise sends the pre-compressed copy that matches
+Accept-Encoding and answers conditional requests itself.
+
+WhiteNoiseMiddleware only has a sync entry point. Under the ASGI workers a sync middleware
+makes Django run everything below it, views included, through one thread-sensitive
+sync_to_async per request, so StaticFilesMiddleware adds the async path: the lookup is a
+dict hit and only reading a static file goes to a thread.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import HttpResponse
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+def _read_response(static_file, request):
+    # Bundles and images are small; a plain response avoids Django consuming the file
+    # iterator through sync_to_async(list) (with a warning) on the ASGI side
+    response = static_file.get_response(request.method, request.META)
+    body = b''
+    if response.file is not None:
+        with response.file as file:
+            body = file.read()
+    http_response = HttpResponse(body, status=int(response.status))
+    del http_response['Content-Type']
+    for key, value in response.headers:
+        http_response[key] = value
+    return http_response
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # DEBUG: files are looked up on disk on every request
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+        return await sync_to_async(_read_response, thread_sensitive=False)(static_file, request)
@@ -0,0 +1,362 @@
+"""
+Product image storage service.
+
+Views go through get_storage() instead of building a Supabase client per request.
+The backend is created lazily once per process and keeps its httpx connection
+pool (and TLS sessions) alive between uploads and deletes.
+
+Objects are content-addressed: content_path() derives the key from the SHA-256 of
+the bytes, so uploading the same photo twice maps to the same object.
+"""
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import httpx
+from django.conf import settings
+from storage3 import SyncStorageClient
+from storage3.exceptions import StorageApiError
+
+from .metrics import record_storage_call
+
+# Status codes worth retrying: rate limiting and transient server-side failures
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class StorageError(Exception):
+    """Raised when a storage operation fails after all retries."""
+
+
+def _storage_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def content_path(digest, extension):
+    """Storage key for content with the given SHA-256 hex digest, fanned out by prefix."""
+    return f"{digest[:2]}/{digest}{extension.lower()}"
+
+
+def _read_bytes(data):
+    # Backends accept bytes, a file path or a file object
+    if isinstance(data, (str, os.PathLike)):
+        with open(data, 'rb') as source:
+            return source.read()
+    if hasattr(data, 'read'):
+        return data.read()
+    return bytes(data)
+
+
+class StorageBackend:
+    """
+    Interface implemented by every image storage backend. public_prefix is the URL
+    path under which objects are served; path_from_url() relies on it.
+    """
+    public_prefix = '/'
+
+    def upload(self, path, data, content_type, upsert=False):
+        """Stores data (bytes, file path or file object) and returns its public URL."""
+        raise NotImplementedError
+
+    def exists(self, path):
+        raise NotImplementedError
+
+    def remove(self, paths):
+        """Removes several objects in one call. Missing objects are not an error."""
+        raise NotImplementedError
+
+    def download(self, path):
+        raise NotImplementedError
+
+    def list_objects(self, prefix='', page_size=1000):
+        """Yields (path, created_at) for every object under prefix."""
+        raise NotImplementedError
+
+    def public_url(self, path):
+        raise NotImplementedError
+
+    def path_from_url(self, image_url):
+        url_path_part = urlparse(image_url or '').path
+        if url_path_part.startswith(self.public_prefix):
+            return url_path_part[len(self.public_prefix):] or None
+        return None
+
+    def close(self):
+        pass
+
+
+class SupabaseStorageBackend(StorageBackend):
+    """Supabase Storage over a single, reused httpx.Client with keep-alive pooling."""
+
+    def __init__(self, url, key, bucket):
+        self.url = url.rstrip('/')
+        self.bucket = bucket
+        self.max_retries = _storage_setting('SUPABASE_STORAGE_MAX_RETRIES', 2)
+        self.retry_backoff = _storage_setting('SUPABASE_STORAGE_RETRY_BACKOFF', 0.25)
+        self.http_client = httpx.Client(
+            timeout=httpx.Timeout(
+                _storage_setting('SUPABASE_STORAGE_TIMEOUT', 20.0),
+                connect=_storage_setting('SUPABASE_STORAGE_CONNECT_TIMEOUT', 5.0),
+            ),
+            limits=httpx.Limits(
+                max_connections=_storage_setting('SUPABASE_STORAGE_MAX_CONNECTIONS', 10),
+                max_keepalive_connections=_storage_setting('SUPABASE_STORAGE_MAX_KEEPALIVE', 5),
+                keepalive_expiry=_storage_setting('SUPABASE_STORAGE_KEEPALIVE_EXPIRY', 60.0),
+            ),
+            # Transport-level retries only cover connection failures; HTTP errors are retried below
+            transport=httpx.HTTPTransport(retries=1),
+        )
+        self.client = SyncStorageClient(
+            f"{self.url}/storage/v1",
+            {'apiKey': key, 'Authorization': f"Bearer {key}"},
+            http_client=self.http_client,
+        )
+        # Public URLs look like SUPABASE_URL/storage/v1/object/public/BUCKET/path/to/file.jpg
+        self.public_prefix = f"/storage/v1/object/public/{bucket}/"
+
+    def _bucket(self):
+        return self.client.from_(self.bucket)
+
+    def _call(self, name, operation, *args, **kwargs):
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                return operation(*args, **kwargs)
+            except (httpx.TransportError, StorageApiError) as e:
+                error = e
+            finally:
+                # Each attempt is timed on its own, without the backoff below
+                record_storage_call(name, time.perf_counter() - start)
+            status = getattr(error, 'status', None)
+            retryable = isinstance(error, httpx.TransportError) or _is_retryable_status(status)
+            if not retryable or attempt >= self.max_retries:
+                raise StorageError(str(error)) from error
+            # Exponential backoff with jitter so parallel workers don't retry in lockstep
+            time.sleep(self.retry_backoff * (2 ** attempt) * (1 + random.random()))
+            attempt += 1
+
+    def upload(self, path, data, content_type, upsert=False):
+        # A file path is reopened by storage3 on every attempt, so retries re-send the whole file
+        file_options = {'content-type': content_type, 'cache-control': '31536000'}
+        if upsert:
+            file_options['upsert'] = 'true'
+        # storage3 pops keys out of file_options, so every attempt gets a fresh copy
+        self._call('upload', lambda: self._bucket().upload(path=path, file=data, file_options=dict(file_options)))
+        return self.public_url(path)
+
+    def exists(self, path):
+        return self._call('exists', self._bucket().exists, path)
+
+    def remove(self, paths):
+        if paths:
+            self._call('remove', self._bucket().remove, list(paths))
+
+    def download(self, path):
+        return self._call('download', self._bucket().download, path)
+
+    def list_objects(self, prefix='', page_size=1000):
+        offset = 0
+        while True:
+            entries = self._call('list', self._bucket().list, prefix, {'limit': page_size, 'offset': offset})
+            for entry in entries:
+                path = f"{prefix}/{entry['name']}" if prefix else entry['name']
+                if entry.get('id') is None:
+                    # Folders come back without an id
+                    yield from self.list_objects(path, page_size)
+                else:
+                    yield path, _parse_timestamp(entry.get('created_at'))
+            if len(entries) < page_size:
+                return
+            offset += page_size
+
+    def public_url(self, path):
+        return self._bucket().get_public_url(path)
+
+    def close(self):
+        self.http_client.close()
+
+
+class LocalFileSystemStorageBackend(StorageBackend):
+    """
+    Stores objects under LOCAL_STORAGE_ROOT/<bucket>/ for development and tests.
+    Files are served from LOCAL_STORAGE_URL (wired up in members/urls.py when DEBUG is on).
+    """
+
+    def __init__(self, root, base_url, bucket):
+        self.root = os.path.join(root, bucket)
+        self.public_prefix = f"{base_url.rstrip('/')}/{bucket}/"
+
+    def _full_path(self, path):
+        full_path = os.path.normpath(os.path.join(self.root, path))
+        if not full_path.startswith(os.path.normpath(self.root) + os.sep):
+            raise StorageError(f"Refusing path outside the storage root: {path}")
+        return full_path
+
+    def upload(self, path, data, content_type, upsert=False):
+        full_path = self._full_path(path)
+        if os.path.exists(full_path) and not upsert:
+            raise StorageError(f"Object already exists: {path}")
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # Write to a temp name first so readers never see a half-written file
+        temp_path = f"{full_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as handle:
+            handle.write(_read_bytes(data))
+        os.replace(temp_path, full_path)
+        return self.public_url(path)
+
+    def exists(self, path):
+        return os.path.isfile(self._full_path(path))
+
+    def remove(self, paths):
+        for path in paths:
+            try:
+                os.remove(self._full_path(path))
+            except FileNotFoundError:
+                pass
+
+    def download(self, path):
+        with open(self._full_path(path), 'rb') as handle:
+            return handle.read()
+
+    def list_objects(self, prefix='', page_size=1000):
+        start = self._full_path(prefix) if prefix else self.root
+        for directory, _, files in os.walk(start):
+            for name in sorted(files):
+                if name.endswith('.tmp'):
+                    continue
+                full_path = os.path.join(directory, name)
+                path = os.path.relpath(full_path, self.root).replace(os.sep, '/')
+                yield path, datetime.fromtimestamp(os.path.getmtime(full_path), timezone.utc)
+
+    def public_url(self, path):
+        return f"{self.public_prefix}{path}"
+
+
+class FakeStorageBackend(StorageBackend):
+    """
+    In-memory stand-in for Supabase Storage, used for tests and offline benchmarks.
+    FAKE_STORAGE_LATENCY (seconds) simulates the network round trip of each call and
+    FAKE_STORAGE_CONNECT_LATENCY the one-off TCP/TLS setup paid by a new client.
+    """
+
+    def __init__(self, bucket, base_url='http://storage.invalid', latency=0.0, connect_latency=0.0):
+        self.bucket = bucket
+        self.base_url = base_url.rstrip('/')
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self._connected = False
+        self.objects = {}
+        self.upload_count = 0
+        self.public_prefix = f"/storage/v1/object/public/{bucket}/"
+        self._lock = threading.Lock()
+
+    def _simulate_round_trip(self):
+        if not self._connected:
+            self._connected = True
+            if self.connect_latency:
+                time.sleep(self.connect_latency)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def upload(self, path, data, content_type, upsert=False):
+        data = _read_bytes(data)
+        self._simulate_round_trip()
+        with self._lock:
+            if path in self.objects and not upsert:
+                raise StorageError(f"Object already exists: {path}")
+            self.objects[path] = (data, content_type, datetime.now(timezone.utc))
+            self.upload_count += 1
+        return self.public_url(path)
+
+    def exists(self, path):
+        self._simulate_round_trip()
+        with self._lock:
+            return path in self.objects
+
+    def remove(self, paths):
+        if paths:
+            self._simulate_round_trip()
+            with self._lock:
+                for path in paths:
+                    self.objects.pop(path, None)
+
+    def download(self, path):
+        self._simulate_round_trip()
+        with self._lock:
+            return self.objects[path][0]
+
+    def list_objects(self, prefix='', page_size=1000):
+        self._simulate_round_trip()
+        with self._lock:
+            listed = [(path, created_at) for path, (_, _, created_at) in self.objects.items()]
+        return [(path, created_at) for path, created_at in sorted(listed) if path.startswith(prefix)]
+
+    def public_url(self, path):
+        return f"{self.base_url}{self.public_prefix}{path}"
+
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _is_retryable_status(status):
+    try:
+        return int(status) in RETRYABLE_STATUS_CODES
+    except (TypeError, ValueError):
+        return False
+
+
+def _build_backend():
+    backend_name = _storage_setting('STORAGE_BACKEND', 'supabase')
+    if backend_name == 'fake':
+        return FakeStorageBackend(
+            settings.SUPABASE_BUCKET,
+            latency=_storage_setting('FAKE_STORAGE_LATENCY', 0.0),
+            connect_latency=_storage_setting('FAKE_STORAGE_CONNECT_LATENCY', 0.0),
+        )
+    if backend_name == 'local':
+        return LocalFileSystemStorageBackend(
+            _storage_setting('LOCAL_STORAGE_ROOT', os.path.join(settings.BASE_DIR, 'local_storage')),
+            _storage_setting('LOCAL_STORAGE_URL', '/local-storage/'),
+            settings.SUPABASE_BUCKET,
+        )
+    if backend_name == 'supabase':
+        if not settings.SUPABASE_URL or not settings.SUPABASE_KEY or not settings.SUPABASE_BUCKET:
+            raise StorageError("Supabase storage is not configured.")
+        return SupabaseStorageBackend(settings.SUPABASE_URL, settings.SUPABASE_KEY, settings.SUPABASE_BUCKET)
+    raise StorageError(f"Unknown STORAGE_BACKEND: {backend_name}")
+
+
+_backend = None
+_backend_pid = None
+_backend_lock = threading.Lock()
+
+
+def get_storage():
+    """Returns the process-wide storage backend, creating it on first use (and again after a fork)."""
+    global _backend, _backend_pid
+    pid = os.getpid()
+    if _backend is None or _backend_pid != pid:
+        with _backend_lock:
+            if _backend is None or _backend_pid != pid:
+                _backend = _build_backend()
+                _backend_pid = pid
+    return _backend
+
+
+def reset_storage():
+    """Drops the cached backend, e.g. after settings change in tests or benchmarks."""
+    global _backend, _backend_pid
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+        _backend = None
+        _backend_pid = None
@@ -0,0 +1,62 @@
+import json
+import os
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+
+register = template.Library()
+
+DEFAULT_SIZES = '(max-width: 600px) 50vw, 320px'
+STATIC_IMAGE_DIR = os.path.join(settings.BASE_DIR, 'members', 'static')
+STATIC_MANIFEST = os.path.join(STATIC_IMAGE_DIR, 'img', 'derived', 'manifest.json')
+
+
+@lru_cache(maxsize=1)
+def _static_manifest():
+    # Written by `manage.py build_image_derivatives --static`
+    try:
+        with open(STATIC_MANIFEST) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _sources(variants, resolve=lambda url: url):
+    sources = []
+    for content_type, entries in (variants or {}).get('sources', {}).items():
+        srcset = ', '.join(f"{resolve(url)} {width}w" for width, url in entries)
+        sources.append({'type': content_type, 'srcset': srcset})
+    # <source> order matters: the browser takes the first type it supports
+    return sorted(sources, key=lambda source: source['type'] != 'image/avif')
+
+
+@register.inclusion_tag('responsive_image.html')
+def product_image(product, sizes=DEFAULT_SIZES, css_class='', eager=False):
+    """<picture> with AVIF/WebP srcsets, lazy loading and a blur placeholder for a product."""
+    variants = getattr(product, 'image_variants', None)
+    return {
+        'src': product.image_url,
+        'alt': product.product_name,
+        'sources': _sources(variants),
+        'placeholder': (variants or {}).get('placeholder'),
+        'sizes': sizes,
+        'css_class': css_class,
+        'eager': eager,
+    }
+
+
+@register.inclusion_tag('responsive_image.html')
+def static_image(path, alt='', sizes=DEFAULT_SIZES, css_class='', eager=False):
+    """Same as product_image for a bundled static image, using the derivative manifest."""
+    variants = _static_manifest().get(path)
+    return {
+        'src': static(path),
+        'alt': alt,
+        'sources': _sources(variants, resolve=static),
+        'placeholder': (variants or {}).get('placeholder'),
+        'sizes': sizes,
+        'css_class': css_class,
+        'eager': eager,
+    }
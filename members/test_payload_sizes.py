@@ -0,0 +1,78 @@
+"""
+HTML payload check.
+
+Every HTML page from the query-budget routes is rendered against the small seeded
+catalog and its size, raw and gzipped, is compared with payload_sizes.json, per
+template. Stylesheets and scripts belong in static bundles (members/static/css|js,
+hashed and pre-compressed at collectstatic); only small inline snippets are allowed.
+
+After an intentional change, rewrite the baseline and print before -> after sizes:
+
+    PAYLOAD_SIZES_UPDATE=1 python -m pytest -s members/test_payload_sizes.py
+"""
+import gzip
+import json
+import os
+import re
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+
+from .test_query_budgets import CATALOG_SIZES, ROUTES, _client_for, _request, _seed
+
+SIZES_PATH = Path(__file__).with_name('payload_sizes.json')
+UPDATE_SIZES = os.environ.get('PAYLOAD_SIZES_UPDATE') == '1'
+INLINE_ASSET_LIMIT = 1024  # Bytes of CSS or JS a page may still inline
+INLINE_ASSET = re.compile(rb'<(style|script)\b(?![^>]*\bsrc=)[^>]*>(.*?)</\1>', re.DOTALL)
+
+PAGE_ROUTES = [route for route in ROUTES if route.method == 'get' and route.status == 200 and not route.json]
+
+_baseline = json.loads(SIZES_PATH.read_text()) if SIZES_PATH.exists() else {}
+_measured = {}  # template name -> {'bytes': n, 'gzip': n}
+
+
+@pytest.fixture(scope='module')
+def world():
+    atomic = transaction.atomic()
+    atomic.__enter__()
+    try:
+        yield _seed(CATALOG_SIZES['small'])
+    finally:
+        transaction.set_rollback(True)
+        atomic.__exit__(None, None, None)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def write_updated_sizes():
+    yield
+    if UPDATE_SIZES and _measured:
+        print(f"\n{'template':<32} {'before':>9} {'after':>9} {'gzip before':>12} {'gzip after':>11}")
+        for name, size in sorted(_measured.items()):
+            old = _baseline.get(name, {})
+            print(f"{name:<32} {old.get('bytes', '-'):>9} {size['bytes']:>9} {old.get('gzip', '-'):>12} {size['gzip']:>11}")
+        SIZES_PATH.write_text(json.dumps(dict(sorted(_measured.items())), indent=2) + '\n')
+
+
+@pytest.mark.parametrize('route', PAGE_ROUTES, ids=lambda route: route.name)
+def test_payload_size(route, world):
+    cache.clear()
+    response = _request(_client_for(route, world), route, world)
+    assert response.status_code == 200
+    if not response['Content-Type'].startswith('text/html'):
+        pytest.skip('not an HTML page')
+    template = response.templates[0].name
+    size = {'bytes': len(response.content), 'gzip': len(gzip.compress(response.content))}
+    if UPDATE_SIZES:
+        _measured[template] = size
+        return
+
+    for kind, body in INLINE_ASSET.findall(response.content):
+        assert len(body) <= INLINE_ASSET_LIMIT, (
+            f"{template} inlines {len(body)} bytes of <{kind.decode()}>; move it to a static bundle"
+        )
+    # The seeded data is random, so allow some slack over the recorded size
+    assert size['bytes'] <= _baseline[template]['bytes'] * 1.1, (
+        f"{template} is {size['bytes']} bytes, baseline {_baseline[template]['bytes']}"
+    )
@@ -0,0 +1,299 @@
+"""
+Query-budget regression suite.
+
+Every route in members/urls.py is requested as the user type it serves, against
+seeded catalogs of several sizes, and must stay within the query count and response
+time recorded for it in query_budgets.json. The query budget is the same for every
+catalog size, so a view whose query count grows with the data fails here (strict
+N+1 detection, see members/nplusone.py, fails the request itself).
+
+After an intentional change, regenerate the query counts and review the diff:
+
+    QUERY_BUDGETS_UPDATE=1 python -m pytest members/test_query_budgets.py
+
+Response-time ceilings are not regenerated: default_max_ms applies unless a view has
+its own max_ms in the baseline.
+"""
+import json
+import os
+import random
+import time
+from collections import namedtuple
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .cart import set_quantity
+from .models import FoodStall, Notification, Order, OrderItem, Payment, Product, Review, User
+from .tokens import issue_tokens
+from .urls import urlpatterns
+
+BUDGETS_PATH = Path(__file__).with_name('query_budgets.json')
+UPDATE_BUDGETS = os.environ.get('QUERY_BUDGETS_UPDATE') == '1'
+
+CatalogSize = namedtuple('CatalogSize', 'stalls products_per_stall orders_per_stall')
+CATALOG_SIZES = {
+    'small': CatalogSize(stalls=2, products_per_stall=5, orders_per_stall=30),
+    'medium': CatalogSize(stalls=10, products_per_stall=25, orders_per_stall=40),
+    'large': CatalogSize(stalls=30, products_per_stall=60, orders_per_stall=100),
+}
+CATEGORIES = ['Breakfast', 'Lunch', 'Dinner', 'Snacks', 'Drinks & Beverages']
+ITEMS_PER_ORDER = 3
+
+# name: URL name; user: 'anonymous' | 'customer' | 'shop' | 'staff'; kwargs/data: callables of the
+# seeded world; setup(client, world) runs before the measured request; redirect: expected Location
+Route = namedtuple(
+    'Route', 'name user method kwargs data status setup headers json redirect',
+    defaults=('anonymous', 'get', None, None, 200, None, None, False, None),
+)
+
+
+class World:
+    """Ids of the seeded rows the routes are requested with."""
+
+
+def _seed(size):
+    rng = random.Random(40)
+    world = World()
+    owners = User.objects.bulk_create(
+        User(username=f'owner{i}', email=f'owner{i}@example.com', user_type='shop') for i in range(size.stalls)
+    )
+    stalls = FoodStall.objects.bulk_create(
+        FoodStall(owner=owner, stall_name=f'Stall {i}') for i, owner in enumerate(owners)
+    )
+    customers = User.objects.bulk_create(
+        User(username=f'customer{i}', email=f'customer{i}@example.com', first_name=f'Customer {i}')
+        for i in range(max(5, size.stalls))
+    )
+    world.staff = User.objects.create(username='staff', is_staff=True)
+    products = Product.objects.bulk_create(
+        Product(
+            product_name=f'Dish {stall.pk}-{i}', unit_price=Decimal(rng.randint(40, 200)),
+            category=CATEGORIES[i % len(CATEGORIES)], food_stall=stall,
+        )
+        for stall in stalls for i in range(size.products_per_stall)
+    )
+    products_by_stall = {}
+    for product in products:
+        products_by_stall.setdefault(product.food_stall_id, []).append(product)
+
+    statuses = [status for status, _ in Order.STATUS_CHOICES]
+    payments = Payment.objects.bulk_create(
+        Payment(payment_method='Cash', payment_status='Pending on Collection')
+        for _ in range(size.stalls * size.orders_per_stall)
+    )
+    orders = Order.objects.bulk_create(
+        Order(
+            # customer0 is the one the customer routes log in as; a regular at the first three stalls
+            customer=customers[0] if s < 3 and i % 5 == 0 else rng.choice(customers[1:]),
+            food_stall=stall, order_price=Decimal('150.00'), total_price=Decimal('150.00'),
+            order_type='P', queue_id=f'A{i:04d}', payment=payments[s * size.orders_per_stall + i],
+            status=statuses[i % len(statuses)],
+        )
+        for s, stall in enumerate(stalls) for i in range(size.orders_per_stall)
+    )
+    OrderItem.objects.bulk_create(
+        OrderItem(order=order, product=product, quantity=rng.randint(1, 3), price=product.unit_price, food_stall_id=order.food_stall_id)
+        for order in orders for product in rng.sample(products_by_stall[order.food_stall_id], ITEMS_PER_ORDER)
+    )
+    Notification.objects.bulk_create(
+        Notification(user_id=order.customer_id, order=order, message=f'Order #{order.pk} is {order.status}', is_read=rng.random() < 0.5)
+        for order in orders
+    )
+    completed = [order for order in orders if order.status == 'Completed']
+    Review.objects.bulk_create(
+        Review(customer_id=order.customer_id, product=products_by_stall[order.food_stall_id][0], order=order, rating=rng.randint(1, 5))
+        for order in completed
+    )
+
+    world.customer = customers[0]
+    world.shop_owner = owners[0]
+    world.stall_products = products_by_stall[stalls[0].pk]
+    world.product = world.stall_products[0]
+    world.shop_order = next(order for order in orders if order.food_stall_id == stalls[0].pk and order.status == 'Pending')
+    world.completed_order = next(order for order in completed if order.customer_id == world.customer.pk)
+    world.reviewed_product = products_by_stall[world.completed_order.food_stall_id][0]
+    return world
+
+
+def _fill_cart(client, world):
+    session = client.session
+    for product in world.stall_products[:5]:
+        set_quantity(session, product.pk, 2, quoted_price=product.unit_price)
+    session['cart_stall_id'] = world.shop_owner.pk
+    session.save()
+
+
+def _last_order(client, world):
+    session = client.session
+    session['last_order_id'] = world.shop_order.pk
+    session['last_queue_number'] = world.shop_order.queue_id
+    session.save()
+
+
+def _set_password(client, world):
+    world.customer.set_password('pass1234')
+    world.customer.save(update_fields=['password'])
+
+
+def _sign_in_with_token(client, world):
+    world.refresh_token = issue_tokens(world.customer)['refresh']
+
+
+ROUTES = [
+    Route('welcome'),
+    Route('sign_in'),
+    Route('login'),
+    Route('logout', status=302),
+    Route('sign_up'),
+    Route('register'),
+    Route('policy'),
+    Route('policy_admin'),
+    Route('favorites'),
+    Route('forgot_password'),
+    Route('order_summary'),
+    Route('reset_password_confirm'),
+    Route('landing'),
+    Route('product_detail', kwargs=lambda w: {'product_id': w.reviewed_product.pk}),
+    Route('home', user='customer'),
+    Route('shops_list', user='customer'),
+    Route('shop_products', user='customer', kwargs=lambda w: {'stall_owner_id': w.shop_owner.pk}),
+    Route('notifications', user='customer'),
+    Route('notification_badge', user='customer'),
+    Route('order_details', user='customer', setup=_fill_cart),
+    Route('payment', user='customer', setup=_fill_cart),
+    Route('order_tracking', user='customer'),
+    Route('review', user='customer', data=lambda w: {'product_id': w.reviewed_product.pk, 'order_id': w.completed_order.pk}),
+    Route('add_to_cart', user='customer', method='post', kwargs=lambda w: {'product_id': w.product.pk},
+          data=lambda w: {'quantity': 2}, status=302, redirect='order_details'),
+    Route('update_cart_item_quantity', user='customer', method='post', kwargs=lambda w: {'product_id': w.product.pk},
+          data=lambda w: {'quantity': 3}, setup=_fill_cart, headers={'X-Requested-With': 'XMLHttpRequest'}),
+    Route('remove_from_cart', user='customer', method='post', kwargs=lambda w: {'product_id': w.product.pk},
+          setup=_fill_cart, status=302, redirect='order_details'),
+    Route('cart_batch', user='customer', method='post', setup=_fill_cart, json=True,
+          data=lambda w: {'operations': [{'op': 'set', 'product_id': w.product.pk, 'quantity': 4},
+                                         {'op': 'remove', 'product_id': w.stall_products[1].pk}]}),
+    Route('place_order', user='customer', method='post', setup=_fill_cart, status=302, redirect='order_confirmation',
+          data=lambda w: {'payment_method': 'Cash', 'pickup_method': 'pickup', 'order_note': '', 'queue_number': 'A0001'}),
+    Route('order_confirmation', user='customer', setup=_last_order),
+    Route('acknowledge_order_receipt', user='customer', method='post', kwargs=lambda w: {'order_id': w.completed_order.pk}),
+    Route('dashboard', user='shop'),
+    Route('food_list', user='shop'),
+    Route('orders', user='shop'),
+    Route('overview', user='shop'),
+    Route('add-item', user='shop'),
+    Route('edit_product', user='shop', kwargs=lambda w: {'product_id': w.product.pk}),
+    Route('delete_product', user='shop', kwargs=lambda w: {'product_id': w.product.pk}),
+    Route('update_order_status', user='shop', method='post', kwargs=lambda w: {'order_id': w.shop_order.pk},
+          data=lambda w: {'status': 'Preparing'}),
+    Route('order_details_modal', user='shop', kwargs=lambda w: {'order_id': w.shop_order.pk}),
+    Route('metrics', user='staff'),
+    Route('api_stalls'),
+    Route('api_stall_detail', kwargs=lambda w: {'stall_id': w.shop_owner.pk}),
+    Route('api_products', data=lambda w: {'stall': w.shop_owner.pk, 'fields': 'id,name,price,stall_name'}),
+    Route('api_product_detail', kwargs=lambda w: {'product_id': w.product.pk}),
+    Route('api_categories'),
+    Route('api_review_summaries', data=lambda w: {'ids': ','.join(str(product.pk) for product in w.stall_products)}),
+    Route('api_token', method='post', setup=_set_password, json=True,
+          data=lambda w: {'username': w.customer.username, 'password': 'pass1234'}),
+    Route('api_token_refresh', method='post', setup=_sign_in_with_token, json=True, data=lambda w: {'refresh': w.refresh_token}),
+    Route('api_token_revoke', method='post', setup=_sign_in_with_token, json=True, status=204,
+          data=lambda w: {'refresh': w.refresh_token}),
+]
+
+_baseline = json.loads(BUDGETS_PATH.read_text())
+_measured = {}  # route name -> highest query count over all catalog sizes, for QUERY_BUDGETS_UPDATE
+
+
+@pytest.fixture(scope='module', params=list(CATALOG_SIZES), ids=lambda name: f'{name}-catalog')
+def world(request):
+    """Seeds one catalog size for all routes, inside a transaction rolled back afterwards."""
+    atomic = transaction.atomic()
+    atomic.__enter__()
+    try:
+        yield _seed(CATALOG_SIZES[request.param])
+    finally:
+        transaction.set_rollback(True)
+        atomic.__exit__(None, None, None)
+
+
+@pytest.fixture
+def isolated(world):
+    """Rolls back whatever a request writes, and starts each request with cold caches."""
+    cache.clear()
+    atomic = transaction.atomic()
+    atomic.__enter__()
+    try:
+        yield
+    finally:
+        transaction.set_rollback(True)
+        atomic.__exit__(None, None, None)
+        cache.clear()
+
+
+@pytest.fixture(scope='module', autouse=True)
+def write_updated_budgets():
+    yield
+    if UPDATE_BUDGETS and _measured:
+        views = _baseline['views']
+        for name, queries in _measured.items():
+            views.setdefault(name, {})['queries'] = queries
+        _baseline['views'] = dict(sorted(views.items()))
+        BUDGETS_PATH.write_text(json.dumps(_baseline, indent=2) + '\n')
+
+
+def _client_for(route, world):
+    client = Client()
+    user = {'customer': world.customer, 'shop': world.shop_owner, 'staff': world.staff}.get(route.user)
+    if user is not None:
+        client.force_login(user)
+    if route.setup:
+        route.setup(client, world)
+    return client
+
+
+def _request(client, route, world):
+    url = reverse(route.name, kwargs=route.kwargs(world) if route.kwargs else None)
+    data = route.data(world) if route.data else {}
+    extra = {'headers': route.headers} if route.headers else {}
+    if route.json:
+        return client.post(url, json.dumps(data), content_type='application/json', **extra)
+    return getattr(client, route.method)(url, data, **extra)
+
+
+def test_every_route_is_covered():
+    named_routes = {pattern.name for pattern in urlpatterns if pattern.name}
+    assert named_routes == {route.name for route in ROUTES}
+    if not UPDATE_BUDGETS:
+        assert named_routes == set(_baseline['views'])
+
+
+@pytest.mark.parametrize('route', ROUTES, ids=lambda route: route.name)
+def test_query_budget(route, world, isolated):
+    client = _client_for(route, world)
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = _request(client, route, world)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    assert response.status_code == route.status, f"{route.name}: unexpected {response.status_code}"
+    if route.redirect:
+        assert response.url == reverse(route.redirect)
+
+    query_count = len(queries)
+    if UPDATE_BUDGETS:
+        _measured[route.name] = max(query_count, _measured.get(route.name, 0))
+        return
+    budget = _baseline['views'][route.name]
+    sql = '\n'.join(query['sql'][:200] for query in queries.captured_queries)
+    assert query_count <= budget['queries'], (
+        f"{route.name} ran {query_count} queries, budget is {budget['queries']}:\n{sql}"
+    )
+    max_ms = budget.get('max_ms', _baseline['default_max_ms'])
+    assert elapsed_ms <= max_ms, f"{route.name} took {elapsed_ms:.0f} ms, ceiling is {max_ms} ms"
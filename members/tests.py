@@ -1,3 +1,1187 @@
-from django.test import TestCase
+import io
+import json
+import os
+import random
+import gzip
+import importlib.util
+import re
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import brotli
+import jwt
+from asgiref.sync import sync_to_async
+from PIL import Image
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.http import HttpResponse, JsonResponse
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import routers
+from .backends import lookup_users
+from .cart import CartError, apply_operations, get_cart, set_quantity
+from .catalog import get_product_cards
+from .compression import compress_response
+from .deletions import DeletionQueue, flush_deletions
+from .metrics import REQUEST_SECONDS, SQL_QUERIES, UPLOAD_JOBS, Registry as MetricsRegistry, registry as metrics_registry
+from .models import FoodStall, Notification, Order, OrderItem, Payment, Product, Review, User
+from .nplusone import NPlusOneError, assert_no_nplusone, fingerprint, track_queries
+from .routers import PRIMARY_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware, primary, use_primary
+from .stalls import get_user_stall, invalidate_user_stall
+from .storage import get_storage, reset_storage
+from .tokens import TokenAuthenticationMiddleware, issue_tokens
+from .uploads import UploadWorkerPool, enqueue_product_image, wait_for_uploads
+from .warmup import warm_template_cache
+
+
+def _plan_indexes(queryset):
+    """Names of the indexes the database plans to use for queryset, and whether it scans a table instead."""
+    if connection.vendor == 'postgresql':
+        plan = json.loads(queryset.explain(format='json'))
+        nodes, indexes, full_scan = [plan[0]['Plan']], set(), False
+        while nodes:
+            node = nodes.pop()
+            if 'Index Name' in node:
+                indexes.add(node['Index Name'])
+            full_scan = full_scan or node['Node Type'] == 'Seq Scan'
+            nodes.extend(node.get('Plans', []))
+        return indexes, full_scan
+    # SQLite: "SEARCH order USING INDEX name (...)" or "SCAN order" for a full table scan
+    plan = queryset.explain()
+    indexes = set(re.findall(r'USING (?:COVERING )?INDEX (\w+)', plan))
+    return indexes, bool(re.search(r'\bSCAN "?\w+"?(?! USING)', plan))
+
+
+class HotQueryIndexTests(TestCase):
+    """The stall order board, customer history, notifications and review lookups must use their indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(37)
+        owners = User.objects.bulk_create(
+            User(username=f'stall{i}', email=f'stall{i}@example.com', user_type='shop') for i in range(20)
+        )
+        cls.stalls = FoodStall.objects.bulk_create(
+            FoodStall(owner=owner, stall_name=f'Stall {owner.username}') for owner in owners
+        )
+        cls.customers = User.objects.bulk_create(
+            User(username=f'customer{i}', email=f'customer{i}@example.com') for i in range(200)
+        )
+        products = Product.objects.bulk_create(
+            Product(product_name=f'Dish {i}', unit_price=Decimal('50.00'), food_stall=cls.stalls[i % 20])
+            for i in range(200)
+        )
+        statuses = [status for status, _ in Order.STATUS_CHOICES]
+        orders = Order.objects.bulk_create(
+            Order(
+                customer=rng.choice(cls.customers), food_stall=rng.choice(cls.stalls),
+                order_price=Decimal('100.00'), total_price=Decimal('100.00'),
+                order_type='P', status=rng.choice(statuses),
+            )
+            for _ in range(10000)
+        )
+        Notification.objects.bulk_create(
+            Notification(user=rng.choice(cls.customers), order=rng.choice(orders), message='Order update',
+                         is_read=rng.random() < 0.9)
+            for _ in range(10000)
+        )
+        Review.objects.bulk_create(
+            Review(customer=order.customer, product=rng.choice(products), order=order, rating=rng.randint(1, 5))
+            for order in orders[:5000]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')  # Give the planner real statistics for the seeded data
+
+    def assertUsesIndex(self, queryset, index_name):
+        indexes, full_scan = _plan_indexes(queryset)
+        self.assertIn(index_name, indexes, f"{index_name} not used; plan:\n{queryset.explain()}")
+        self.assertFalse(full_scan, f"Full table scan; plan:\n{queryset.explain()}")
+
+    def test_stall_orders_by_status(self):
+        # orders_view / dashboard_view / overview_view
+        queryset = Order.objects.filter(food_stall=self.stalls[0], status='Pending').order_by('-order_time')
+        self.assertUsesIndex(queryset, 'order_stall_status_time_idx')
+
+    def test_stall_recent_orders(self):
+        queryset = Order.objects.filter(food_stall=self.stalls[0]).order_by('-order_time')[:3]
+        self.assertUsesIndex(queryset, 'order_stall_time_idx')
+
+    def test_customer_orders_by_status(self):
+        # order_history_view / order_tracking_view
+        queryset = Order.objects.filter(customer=self.customers[0], status='Completed').order_by('-order_time')
+        self.assertUsesIndex(queryset, 'order_customer_status_idx')
+
+    def test_running_orders(self):
+        # dashboard_view counts the open orders of one stall
+        queryset = Order.objects.filter(food_stall=self.stalls[0], status__in=['Pending', 'Preparing', 'Ready'])
+        self.assertUsesIndex(queryset.values('pk'), 'order_stall_status_time_idx')
+
+    def test_notifications_newest_first(self):
+        queryset = Notification.objects.filter(user=self.customers[0]).order_by('-timestamp')
+        self.assertUsesIndex(queryset, 'notification_user_time_idx')
+
+    def test_unread_notifications_use_partial_index(self):
+        queryset = Notification.objects.filter(user=self.customers[0], is_read=False)
+        self.assertUsesIndex(queryset.values('pk'), 'notification_user_unread_idx')
+
+    def test_review_lookup(self):
+        review = Review.objects.first()
+        queryset = Review.objects.filter(customer_id=review.customer_id, product_id=review.product_id, order_id=review.order_id)
+        self.assertUsesIndex(queryset, 'review_customer_product_idx')
+
+    def test_sign_in_lookup(self):
+        # members.backends.UsernameOrEmailBackend
+        queryset = lookup_users('Customer7@Example.com')
+        self.assertUsesIndex(queryset, 'user_username_lower_idx')
+        self.assertUsesIndex(queryset, 'user_email_lower_idx')
+
+
+class NPlusOneDetectorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create(username='owner', user_type='shop')
+        cls.stall = FoodStall.objects.create(owner=owner, stall_name='Stall')
+        Product.objects.bulk_create(
+            Product(product_name=f'Dish {i}', unit_price=Decimal('10.00'), food_stall=cls.stall) for i in range(6)
+        )
+
+    def test_fingerprint_ignores_literals_and_in_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM product WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"),
+            fingerprint("SELECT * FROM product WHERE id IN (%s) AND name = 'y' LIMIT 5"),
+        )
+
+    def test_per_row_queries_are_flagged(self):
+        with self.assertRaisesRegex(NPlusOneError, r'6x at members/tests\.py'):
+            with assert_no_nplusone(threshold=5):
+                for product in Product.objects.all():
+                    product.food_stall.stall_name  # One query per product
+
+    def test_select_related_passes(self):
+        with assert_no_nplusone(threshold=5):
+            for product in Product.objects.select_related('food_stall'):
+                product.food_stall.stall_name
+
+
+class GenerateDataCommandTests(TestCase):
+    def generate(self, seed):
+        call_command('generate_data', stalls=4, products=20, customers=30, orders=300, seed=seed, stdout=io.StringIO())
+
+    def test_rows_respect_relationships(self):
+        self.generate(seed=1)
+        self.assertEqual(FoodStall.objects.count(), 4)
+        self.assertEqual(Order.objects.count(), 300)
+        self.assertEqual(Payment.objects.count(), 300)
+        self.assertFalse(OrderItem.objects.exclude(product__food_stall=F('food_stall')).exists())
+        self.assertFalse(OrderItem.objects.exclude(order__food_stall=F('food_stall')).exists())
+        self.assertFalse(Order.objects.filter(customer__user_type='shop').exists())
+        self.assertFalse(Review.objects.exclude(order__status='Completed').exists())
+        self.assertFalse(Notification.objects.exclude(user=F('order__customer')).exists())
+
+    def test_same_seed_same_data(self):
+        self.generate(seed=7)
+        # Timestamps are relative to now; everything else is fixed by the seed
+        first = list(Order.objects.order_by('pk').values_list('food_stall_id', 'customer_id', 'total_price'))
+        Order.objects.all().delete()
+        Product.objects.all().delete()
+        User.objects.all().delete()
+        self.generate(seed=7)
+        second = list(Order.objects.order_by('pk').values_list('food_stall_id', 'customer_id', 'total_price'))
+        self.assertEqual(first, second)
+
+
+class NotificationBadgeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create(username='customer')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.customer)
+        self.read = Notification.objects.create(user=self.customer, message='Order placed', is_read=True)
+        self.unread = Notification.objects.create(user=self.customer, message='Ready for pickup')
+
+    def _badge(self, etag=None):
+        return self.client.get(reverse('notification_badge'), headers={'If-None-Match': etag} if etag else {})
+
+    def test_badge_json(self):
+        response = self._badge()
+        self.assertEqual(response.json(), {'unread_count': 1, 'latest_id': self.unread.pk})
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertEqual(response['ETag'], f'W/"1-{self.unread.pk}"')
+
+    def test_unchanged_badge_is_answered_from_the_cache(self):
+        etag = self._badge()['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self._badge(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([q for q in queries if 'FROM "notification"' in q['sql']], queries.captured_queries)
+
+    def test_notification_changes_invalidate_the_badge(self):
+        etag = self._badge()['ETag']
+        newer = Notification.objects.create(user=self.customer, message='Completed')
+        response = self._badge(etag)
+        self.assertEqual(response.json(), {'unread_count': 2, 'latest_id': newer.pk})
+
+        self.unread.is_read = True
+        self.unread.save()
+        response = self._badge(response['ETag'])
+        self.assertEqual(response.json(), {'unread_count': 1, 'latest_id': newer.pk})
+
+        newer.delete()
+        response = self._badge(response['ETag'])
+        self.assertEqual(response.json(), {'unread_count': 0, 'latest_id': self.unread.pk})
+
+
+@override_settings(STALL_CACHE_TIMEOUT=300)
+class StallResolutionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create(username='owner', user_type='shop')
+        cls.stall = FoodStall.objects.create(owner=cls.owner, stall_name='Stall')
+        cls.customer = User.objects.create(username='customer')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_stall_is_cached_per_user(self):
+        with self.assertNumQueries(1):
+            get_user_stall(self.owner)
+        with self.assertNumQueries(0):
+            stall = get_user_stall(self.owner)
+            self.assertEqual(stall.owner, self.owner)
+
+    def test_saving_the_stall_invalidates_it(self):
+        get_user_stall(self.owner)
+        self.stall.stall_name = 'Renamed'
+        self.stall.save()
+        self.assertEqual(get_user_stall(self.owner).stall_name, 'Renamed')
+
+    def test_owner_without_stall(self):
+        owner = User.objects.create(username='new-owner', user_type='shop')
+        self.assertIsNone(get_user_stall(owner))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_user_stall(owner))
+
+    def test_shop_pages_skip_the_stall_query_once_cached(self):
+        self.client.force_login(self.owner)
+        self.client.get(reverse('food_list'))  # Warms the session user too
+        invalidate_user_stall(self.owner.pk)
+        with CaptureQueriesContext(connection) as cold:
+            self.client.get(reverse('food_list'))
+        with CaptureQueriesContext(connection) as warm:
+            self.client.get(reverse('food_list'))
+        self.assertEqual(len(warm), len(cold) - 1)
+
+    @override_settings(STALL_CACHE_TIMEOUT=0)
+    def test_per_worker_cache_reads_the_stall_every_time(self):
+        get_user_stall(self.owner)
+        FoodStall.objects.filter(pk=self.stall.pk).update(stall_name='Renamed on another worker')
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_stall(self.owner).stall_name, 'Renamed on another worker')
+
+    def test_customers_are_turned_away(self):
+        self.client.force_login(self.customer)
+        response = self.client.get(reverse('orders'))
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+
+
+class UsernameOrEmailBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='Maria', email='Maria.Santos@Example.com', password='secret-pass')
+        cls.other = User.objects.create_user(username='maria.santos@example.com', email='other@example.com', password='other-pass')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_username_or_email_ignoring_case(self):
+        self.assertEqual(authenticate(username='maria', password='secret-pass'), self.user)
+        self.assertEqual(authenticate(username=' other@EXAMPLE.com ', password='other-pass'), self.other)
+        self.assertIsNone(authenticate(username='maria', password='wrong'))
+
+    def test_username_match_wins_over_an_email(self):
+        # 'maria.santos@example.com' is one user's username and the other's email
+        self.assertEqual(authenticate(username='Maria.Santos@example.com', password='other-pass'), self.other)
+        self.assertIsNone(authenticate(username='Maria.Santos@example.com', password='secret-pass'))
+
+    def test_shared_email_is_ambiguous(self):
+        User.objects.create_user(username='twin1', email='twins@example.com', password='twin-pass')
+        User.objects.create_user(username='twin2', email='twins@example.com', password='twin-pass')
+        self.assertIsNone(authenticate(username='twins@example.com', password='twin-pass'))
+        self.assertIsNotNone(authenticate(username='twin1', password='twin-pass'))
+
+    def test_unknown_identifier_still_hashes(self):
+        with mock.patch('django.contrib.auth.base_user.make_password') as make_password, self.assertNumQueries(1):
+            self.assertIsNone(authenticate(username='nobody@example.com', password='whatever'))
+        make_password.assert_called_once_with('whatever')
+
+    @override_settings(AUTH_USER_CACHE_TIMEOUT=300)
+    def test_session_user_is_cached_in_a_shared_cache(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('home'))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('home'))
+        self.assertFalse([q for q in queries if 'FROM "user"' in q['sql']], queries.captured_queries)
+
+    def test_per_worker_cache_reads_the_user_every_time(self):
+        self.client.force_login(self.user)
+        cache.set(f'auth_user:{self.user.pk}', self.user)  # A copy another worker cached before the change
+        User.objects.filter(pk=self.user.pk).update(is_active=False)  # Saved elsewhere: no invalidation here
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.startswith(reverse('login')))
+
+    def test_password_change_signs_out_other_sessions(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('home'))
+        self.user.set_password('new-pass')
+        self.user.save()
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.startswith(reverse('login')))
+
+    def test_sign_in_with_email(self):
+        response = self.client.post(reverse('login'), {'username': 'MARIA.SANTOS@example.com', 'password': 'secret-pass'})
+        # The email belongs to self.user, but it is also self.other's username, which wins
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(reverse('login'), {'username': 'Other@Example.com', 'password': 'other-pass'})
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.other.pk)
+
+
+class AsyncViewTests(TestCase):
+    """product_detail and shop_products are async views; AsyncClient runs them through the ASGI handler."""
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create(username='owner', user_type='shop')
+        cls.stall = FoodStall.objects.create(owner=owner, stall_name='Stall')
+        cls.customer = User.objects.create(username='customer')
+        cls.product = Product.objects.create(product_name='Adobo', unit_price=Decimal('80.00'), category='lunch ', food_stall=cls.stall)
+        Product.objects.create(product_name='Taho', unit_price=Decimal('20.00'), category='Drinks & Beverages', food_stall=cls.stall)
+        order = Order.objects.create(customer=cls.customer, food_stall=cls.stall, order_price=Decimal('80.00'),
+                                     total_price=Decimal('80.00'), order_type='P', status='Completed')
+        for rating in (5, 5, 3):
+            Review.objects.create(customer=cls.customer, product=cls.product, order=order, rating=rating)
+
+    async def test_product_detail_review_summary(self):
+        response = await self.async_client.get(reverse('product_detail', args=[self.product.pk]), {'sort_by': 'lowest_rating'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_reviews'], 3)
+        self.assertEqual(response.context['average_rating'], 4.3)
+        self.assertEqual(response.context['rating_distribution'], {1: 0, 2: 0, 3: 1, 4: 0, 5: 2})
+        self.assertEqual([review.rating for review in response.context['reviews']], [3, 5, 5])
+
+    async def test_product_detail_not_found(self):
+        response = await self.async_client.get(reverse('product_detail', args=[self.product.pk + 100]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_shop_products(self):
+        await self.async_client.aforce_login(self.customer)
+        url = reverse('shop_products', args=[self.stall.pk])
+        response = await self.async_client.get(url, {'category': 'Drinks & Beverages'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['categories'], ['Drinks & Beverages', 'Lunch'])
+        self.assertEqual([product.product_name for product in response.context['products']], ['Taho'])
+        self.assertEqual(response.context['user'], self.customer)
+
+    async def test_shop_products_requires_login(self):
+        response = await self.async_client.get(reverse('shop_products', args=[self.stall.pk]))
+        self.assertEqual(response.status_code, 302)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        metrics_registry.reset()
+
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram('test_seconds', 'Test timings.', ['view'], buckets=(0.1, 1, float('inf')))
+        for value in (0.05, 0.5, 0.7, 3):
+            registry.observe(histogram, value, 'home')
+        self.assertEqual(registry.render().splitlines(), [
+            '# HELP test_seconds Test timings.',
+            '# TYPE test_seconds histogram',
+            f'test_seconds_bucket{{view="home",pid="{os.getpid()}",le="0.1"}} 1',
+            f'test_seconds_bucket{{view="home",pid="{os.getpid()}",le="1"}} 3',
+            f'test_seconds_bucket{{view="home",pid="{os.getpid()}",le="+Inf"}} 4',
+            f'test_seconds_sum{{view="home",pid="{os.getpid()}"}} 4.250000',
+            f'test_seconds_count{{view="home",pid="{os.getpid()}"}} 4',
+        ])
+        registry.reset()
+        self.assertEqual(registry.render().splitlines(), ['# HELP test_seconds Test timings.', '# TYPE test_seconds histogram'])
+
+    def test_requests_are_timed_per_view(self):
+        self.client.get(reverse('login'))
+        self.assertEqual(REQUEST_SECONDS.series[('login', 'GET', '200')][-1], 1)
+        self.assertFalse(SQL_QUERIES.series)  # METRICS_SAMPLE_RATE is 0 under the test settings
+
+    def test_scrape_is_staff_only_without_a_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.client.force_login(User.objects.create(username='customer'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.client.force_login(User.objects.create(username='admin', is_staff=True))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# TYPE goldenbites_request_duration_seconds histogram', response.content.decode())
+
+
+@override_settings(METRICS_SAMPLE_RATE=1)
+class AsyncInstrumentationTests(TestCase):
+    """Under ASGI views query from sync_to_async threads; SQL metrics and N+1 tracking must follow them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create(username='owner', user_type='shop')
+        cls.stall = FoodStall.objects.create(owner=owner, stall_name='Stall')
+        cls.customer = User.objects.create(username='customer')
+        cls.product = Product.objects.create(product_name='Adobo', unit_price=Decimal('80.00'), food_stall=cls.stall)
+
+    def setUp(self):
+        metrics_registry.reset()
+
+    def _sql_queries(self, view):
+        series = SQL_QUERIES.series.get((view,))
+        return series[-2] if series else None
+
+    async def test_async_view_sql_is_counted(self):
+        response = await self.async_client.get(reverse('product_detail', args=[self.product.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self._sql_queries('product_detail'), 0)
+
+    async def test_sync_view_behind_asgi_sql_is_counted(self):
+        await self.async_client.aforce_login(self.customer)
+        response = await self.async_client.get(reverse('shops_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self._sql_queries('shops_list'), 0)
+
+    async def test_nplusone_tracking_follows_sync_to_async(self):
+        def repeated():
+            return [Product.objects.filter(pk=pk).exists() for pk in range(3)]
+
+        with track_queries(threshold=3) as tracker:
+            await sync_to_async(repeated)()
+        self.assertEqual(len(tracker.offenders()), 1)
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create(username='owner', user_type='shop')
+        cls.stall = FoodStall.objects.create(owner=owner, stall_name='Stall')
+        cls.customer = User.objects.create(username='customer', first_name='Ana')
+        cls.product = Product.objects.create(product_name='Adobo', unit_price=Decimal('80.00'), category='Lunch', food_stall=cls.stall)
+        cls.order = Order.objects.create(customer=cls.customer, food_stall=cls.stall, order_price=Decimal('80.00'),
+                                         total_price=Decimal('80.00'), order_type='P', status='Completed')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.customer)
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_page_is_not_rebuilt(self):
+        url = reverse('home')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('private', first['Cache-Control'])
+        with CaptureQueriesContext(connection) as queries:
+            second = self.revalidate(url, first)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertFalse(second.templates)
+        self.assertFalse([q for q in queries if 'FROM "product"' in q['sql']], queries.captured_queries)
+
+    def test_if_modified_since(self):
+        url = reverse('shops_list')
+        first = self.client.get(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, 304)
+
+    def test_catalog_changes_invalidate(self):
+        for url in (reverse('home'), reverse('shops_list'), reverse('shop_products', args=[self.stall.pk])):
+            first = self.client.get(url)
+            self.stall.stall_name = f'Renamed for {url}'
+            self.stall.save()
+            self.assertEqual(self.revalidate(url, first).status_code, 200, url)
+
+    def test_stall_sign_in_leaves_the_catalog_alone(self):
+        urls = (reverse('home'), reverse('shops_list'), reverse('shop_products', args=[self.stall.pk]))
+        first = {url: self.client.get(url) for url in urls}
+        owner = self.stall.owner
+        owner.set_password('pass1234')
+        owner.save()
+        Client().login(username='owner', password='pass1234')  # Saves last_login
+        for url in urls:
+            self.assertEqual(self.revalidate(url, first[url]).status_code, 304, url)
+
+    def test_product_detail_follows_product_and_reviews(self):
+        url = reverse('product_detail', args=[self.product.pk])
+        first = self.client.get(url)
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+        review = Review.objects.create(customer=self.customer, product=self.product, order=self.order, rating=4)
+        second = self.revalidate(url, first)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.context['total_reviews'], 1)
+        review.delete()
+        self.assertEqual(self.revalidate(url, second).status_code, 200)
+        third = self.client.get(url)
+        self.product.unit_price = Decimal('85.00')
+        self.product.save()
+        self.assertEqual(self.revalidate(url, third).status_code, 200)
+
+    def test_other_products_are_unaffected(self):
+        other = Product.objects.create(product_name='Taho', unit_price=Decimal('20.00'), food_stall=self.stall)
+        url = reverse('product_detail', args=[self.product.pk])
+        first = self.client.get(url)
+        other.unit_price = Decimal('25.00')
+        other.save()
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+
+    def test_etag_is_per_user_and_badge(self):
+        url = reverse('home')
+        first = self.client.get(url)
+        Notification.objects.create(user=self.customer, order=self.order, message='Ready for pickup')
+        self.assertEqual(self.revalidate(url, first).status_code, 200)
+        second = self.client.get(url)
+        self.client.force_login(User.objects.create(username='someone-else'))
+        self.assertEqual(self.revalidate(url, second).status_code, 200)
+
+    def test_pending_messages_render_the_page(self):
+        url = reverse('home')
+        first = self.client.get(url)
+        self.client.post(reverse('add_to_cart', args=[self.product.pk]), {'quantity': 1})  # Leaves a flash message
+        response = self.revalidate(url, first)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(list(response.context['messages']))
+
+
+class StaticFilesMiddlewareTests(TestCase):
+    """Collected bundles are served by StaticFilesMiddleware, pre-compressed, on both handlers."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.static_root = tempfile.TemporaryDirectory()
+        bundle = Path(cls.static_root.name, 'css', 'home.0123456789ab.css')
+        bundle.parent.mkdir()
+        bundle.write_bytes(b'body { margin: 0; }\n' * 100)
+        bundle.with_name(bundle.name + '.br').write_bytes(b'brotli bytes')
+        cls.enterClassContext(override_settings(STATIC_ROOT=cls.static_root.name))
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.static_root.cleanup()
+
+    def test_serves_compressed_copy(self):
+        response = self.client.get('/static/css/home.0123456789ab.css', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(b''.join(response.streaming_content), b'brotli bytes')
+        plain = self.client.get('/static/css/home.0123456789ab.css')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(len(b''.join(plain.streaming_content)), 2000)
+        response.close()
+        plain.close()
+
+    async def test_async_handler(self):
+        response = await self.async_client.get('/static/css/home.0123456789ab.css', headers={'Accept-Encoding': 'br'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/css; charset="utf-8"')
+        self.assertEqual(response.content, b'brotli bytes')
+        revalidated = await self.async_client.get('/static/css/home.0123456789ab.css', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+        # Everything else falls through to the views
+        response = await self.async_client.get(reverse('welcome'))
+        self.assertEqual(response.status_code, 200)
+
+
+class CompressionTests(TestCase):
+    def compress(self, response, accept_encoding='br, gzip'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return compress_response(request, response)
+
+    def test_pages_are_compressed(self):
+        page = self.client.get(reverse('welcome')).content
+        response = self.client.get(reverse('welcome'), HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(brotli.decompress(response.content), page)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        response = self.client.get(reverse('welcome'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), page)
+        self.assertFalse(self.client.get(reverse('welcome')).has_header('Content-Encoding'))
+
+    def test_json_is_compressed(self):
+        response = self.compress(JsonResponse({'items': list(range(200))}))
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+    def test_skipped_responses(self):
+        self.assertFalse(self.compress(HttpResponse('small')).has_header('Content-Encoding'))
+        self.assertFalse(self.compress(HttpResponse(b'\0' * 1000, content_type='image/png')).has_header('Content-Encoding'))
+        encoded = HttpResponse(b'x' * 1000, headers={'Content-Encoding': 'br'})
+        self.assertEqual(self.compress(encoded).content, b'x' * 1000)
+
+    def test_etag_is_weakened(self):
+        response = self.compress(HttpResponse('x' * 1000, headers={'ETag': '"abc"'}))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_html_that_may_reflect_input_gets_padded_gzip(self):
+        factory, page = RequestFactory(), 'x' * 1000
+        for request in (factory.get('/', {'q': 'search'}), factory.post('/', {'note': 'hi'})):
+            request.META['HTTP_ACCEPT_ENCODING'] = 'br, gzip'
+            self.assertEqual(compress_response(request, HttpResponse(page))['Content-Encoding'], 'gzip')
+        request = factory.get('/', {'ids': '1,2'}, HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(compress_response(request, JsonResponse({'items': list(range(200))}))['Content-Encoding'], 'br')
+
+
+class TemplateWarmupTests(TestCase):
+    def test_compiles_project_templates(self):
+        templates = list(Path(__file__).with_name('templates').rglob('*.html'))
+        self.assertEqual(warm_template_cache(), len(templates))
+
+
+class CatalogAPITests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create(username='owner', user_type='shop')
+        cls.stall = FoodStall.objects.create(owner=owner, stall_name='Stall')
+        other = FoodStall.objects.create(owner=User.objects.create(username='other', user_type='shop'), stall_name='Other')
+        cls.products = [
+            Product.objects.create(product_name=name, unit_price=Decimal('50.00'), category=category, food_stall=cls.stall)
+            for name, category in [('Adobo', 'lunch '), ('Sinigang', 'Lunch'), ('Taho', 'Drinks & Beverages'), ('Turon', None)]
+        ]
+        Product.objects.create(product_name='Pancit', unit_price=Decimal('60.00'), category='Lunch', food_stall=other)
+        customer = User.objects.create(username='customer')
+        order = Order.objects.create(customer=customer, food_stall=cls.stall, order_price=Decimal('50.00'),
+                                     total_price=Decimal('50.00'), order_type='P', status='Completed')
+        for rating in (5, 4, 4):
+            Review.objects.create(customer=customer, product=cls.products[0], order=order, rating=rating)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cursor_pagination(self):
+        url, names = reverse('api_products') + '?stall=%d&limit=3&fields=name' % self.stall.pk, []
+        while url:
+            page = self.client.get(url).json()
+            names += [product['name'] for product in page['results']]
+            url = page['next']
+        self.assertEqual(names, ['Adobo', 'Sinigang', 'Taho', 'Turon'])
+
+    def test_sparse_fields(self):
+        response = self.client.get(reverse('api_product_detail', args=[self.products[0].pk]), {'fields': 'id,price,stall_name'})
+        self.assertEqual(response.json(), {'id': self.products[0].pk, 'price': '50.00', 'stall_name': 'Stall'})
+        response = self.client.get(reverse('api_products'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.json()['error'])
+
+    def test_bulk_ids(self):
+        ids = [self.products[2].pk, 9999, self.products[0].pk]
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api_products'), {'ids': ','.join(map(str, ids)), 'fields': 'id'})
+        self.assertEqual(response.json(), {'results': [{'id': ids[0]}, {'id': ids[2]}], 'next': None})
+        self.assertEqual(self.client.get(reverse('api_products'), {'ids': '1,x'}).status_code, 400)
+
+    def test_conditional_get(self):
+        url = reverse('api_products')
+        first = self.client.get(url)
+        self.assertEqual(first['Cache-Control'], 'public, max-age=60')
+        self.assertNotIn('Cookie', first.get('Vary', ''))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        self.products[1].unit_price = Decimal('55.00')
+        self.products[1].save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+    def test_categories(self):
+        response = self.client.get(reverse('api_categories'), {'stall': self.stall.pk})
+        self.assertEqual(response.json()['results'], [
+            {'name': 'Drinks & Beverages', 'product_count': 1},
+            {'name': 'Lunch', 'product_count': 2},
+        ])
+        products = self.client.get(reverse('api_products'), {'category': 'LUNCH', 'fields': 'name'}).json()['results']
+        self.assertEqual([product['name'] for product in products], ['Adobo', 'Sinigang', 'Pancit'])
+
+    def test_review_summaries(self):
+        url = reverse('api_review_summaries')
+        response = self.client.get(url, {'ids': f'{self.products[0].pk},{self.products[1].pk}'})
+        summary, empty = response.json()['results']
+        self.assertEqual(summary['review_count'], 3)
+        self.assertEqual(summary['average_rating'], 4.3)
+        self.assertEqual(summary['distribution'], {'1': 0, '2': 0, '3': 0, '4': 2, '5': 1})
+        self.assertEqual(empty['review_count'], 0)
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+    def test_errors(self):
+        response = self.client.get(reverse('api_stall_detail', args=[9999]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'error': 'Not found.'})
+        self.assertEqual(self.client.get(reverse('api_stalls'), {'cursor': 'nonsense'}).status_code, 400)
+        self.assertEqual(self.client.post(reverse('api_stalls')).status_code, 405)
+
+
+class TokenAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username='owner', password='pass1234', user_type='shop')
+        stall = FoodStall.objects.create(owner=cls.owner, stall_name='Stall')
+        cls.customer = User.objects.create_user(username='customer', email='customer@example.com', password='pass1234')
+        cls.order = Order.objects.create(customer=cls.customer, food_stall=stall, order_price=Decimal('50.00'),
+                                         total_price=Decimal('50.00'), order_type='P', status='Pending')
+
+    def setUp(self):
+        cache.clear()
+
+    def _obtain(self, username, password='pass1234'):
+        return self.client.post(reverse('api_token'), {'username': username, 'password': password}, content_type='application/json')
+
+    def _refresh(self, refresh):
+        return self.client.post(reverse('api_token_refresh'), {'refresh': refresh}, content_type='application/json')
+
+    def test_obtain(self):
+        response = self._obtain('CUSTOMER@example.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {'access', 'refresh', 'token_type', 'expires_in'})
+        self.assertIn('no-store', response['Cache-Control'])
+        self.assertEqual(self._obtain('customer', 'wrong').status_code, 401)
+
+    def test_hot_ajax_paths_skip_session_and_user_reads(self):
+        # No CSRF token and no session cookie: the bearer token is the whole authentication
+        client = Client(enforce_csrf_checks=True, headers={'Authorization': 'Bearer ' + self._obtain('owner').json()['access']})
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(reverse('update_order_status', args=[self.order.pk]), {'status': 'Completed'})
+        self.assertEqual(response.json(), {'success': True, 'new_status': 'Completed'})
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('django_session', sql)
+        self.assertNotRegex(sql, r'FROM "user"')
+
+        client = Client(enforce_csrf_checks=True, headers={'Authorization': 'Bearer ' + self._obtain('customer').json()['access']})
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(reverse('acknowledge_order_receipt', args=[self.order.pk]))
+        self.assertTrue(response.json()['success'])
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('django_session', sql)
+        self.assertNotRegex(sql, r'FROM "user"')
+
+    def test_bad_tokens_get_401(self):
+        refresh = issue_tokens(self.customer)['refresh']
+        url = reverse('acknowledge_order_receipt', args=[self.order.pk])
+        with override_settings(ACCESS_TOKEN_LIFETIME=-1):
+            expired = issue_tokens(self.customer)['access']
+        forged = jwt.encode({'typ': 'access', 'sub': str(self.owner.pk), 'exp': 2 ** 40}, 'not-the-key', algorithm='HS256')
+        for token in (expired, refresh, forged):
+            response = self.client.post(url, headers={'Authorization': f'Bearer {token}'})
+            self.assertEqual(response.status_code, 401)
+            self.assertIn('invalid_token', response['WWW-Authenticate'])
+
+    def test_token_user_cannot_be_saved(self):
+        def view(request):
+            request.user.first_name = 'Changed'
+            request.user.save()
+
+        request = RequestFactory().get('/', headers={'Authorization': 'Bearer ' + issue_tokens(self.customer)['access']})
+        with self.assertRaises(NotImplementedError):
+            TokenAuthenticationMiddleware(view)(request)
+        customer = User.objects.get(pk=self.customer.pk)
+        self.assertEqual((customer.email, customer.first_name), ('customer@example.com', ''))
+        self.assertTrue(customer.check_password('pass1234'))
+
+    @override_settings(METRICS_TOKEN='scraper-secret')
+    def test_other_bearer_tokens_are_left_to_the_view(self):
+        response = self.client.get(reverse('metrics'), headers={'Authorization': 'Bearer scraper-secret'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(reverse('metrics'), headers={'Authorization': 'Bearer wrong'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_refresh_rotates(self):
+        first = issue_tokens(self.customer)
+        second = self._refresh(first['refresh']).json()
+        self.assertNotEqual(second['refresh'], first['refresh'])
+        self.assertEqual(self._refresh(second['refresh']).status_code, 200)
+
+    def test_reused_refresh_token_revokes_the_sign_in(self):
+        stolen = issue_tokens(self.customer)['refresh']
+        current = self._refresh(stolen).json()['refresh']
+        other_device = issue_tokens(self.customer)['refresh']
+        response = self._refresh(stolen)
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('invalid_grant', response['WWW-Authenticate'])
+        self.assertEqual(self._refresh(current).status_code, 401)
+        self.assertEqual(self._refresh(other_device).status_code, 200)
+
+    def test_refresh_rechecks_the_user(self):
+        refresh = issue_tokens(self.customer)['refresh']
+        User.objects.filter(pk=self.customer.pk).update(is_active=False)
+        self.assertEqual(self._refresh(refresh).status_code, 401)
+
+    def test_revoke(self):
+        refresh = issue_tokens(self.customer)['refresh']
+        response = self.client.post(reverse('api_token_revoke'), {'refresh': refresh}, content_type='application/json')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self._refresh(refresh).status_code, 401)
+
+    def test_production_profile_requires_a_secret_key(self):
+        with mock.patch.dict(os.environ, {'DJANGO_SECRET_KEY': ''}):
+            with self.assertRaises(ImproperlyConfigured):
+                spec = importlib.util.find_spec('GoldenBites.settings_production')
+                spec.loader.exec_module(importlib.util.module_from_spec(spec))
+        self.assertNotIn(settings.JWT_SIGNING_KEY, Path(settings.BASE_DIR, 'GoldenBites', 'settings.py').read_text())
+
+
+def _image_upload(color, name='photo.png'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (200, 150), color).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class ImageDeduplicationTests(TestCase):
+    def setUp(self):
+        flush_deletions()
+        reset_storage()
+        self.addCleanup(reset_storage)
+        self.storage = get_storage()
+        self.stall = FoodStall.objects.create(owner=User.objects.create(username='owner', user_type='shop'), stall_name='Stall')
+
+    def _product(self, name, color=None):
+        product = Product.objects.create(product_name=name, unit_price=Decimal('10.00'), food_stall=self.stall)
+        if color:
+            enqueue_product_image(product, _image_upload(color))
+            product.refresh_from_db()
+        return product
+
+    def _paths(self, product):
+        urls = [product.image_url, *(url for entries in product.image_variants['sources'].values() for _, url in entries)]
+        return [self.storage.path_from_url(url) for url in urls]
+
+    def test_same_image_is_stored_once(self):
+        first = self._product('First', 'red')
+        metrics_registry.reset()
+        with mock.patch.object(self.storage, 'upload', wraps=self.storage.upload) as upload:
+            second = self._product('Second', 'red')
+        upload.assert_not_called()
+        self.assertEqual((second.image_url, second.image_variants), (first.image_url, first.image_variants))
+        self.assertEqual(UPLOAD_JOBS.series[('deduplicated',)], 1)
+
+    def test_shared_image_is_kept_until_no_product_uses_it(self):
+        first, second = self._product('First', 'red'), self._product('Second', 'red')
+        red_paths = self._paths(first)
+        enqueue_product_image(first, _image_upload('blue'))
+        flush_deletions()
+        self.assertTrue(all(path in self.storage.objects for path in red_paths))
+        enqueue_product_image(second, _image_upload('green'))
+        flush_deletions()
+        self.assertFalse(any(path in self.storage.objects for path in red_paths))
+
+    def test_reuse_cancels_a_pending_deletion(self):
+        first = self._product('First', 'red')
+        red_paths = self._paths(first)
+        enqueue_product_image(first, _image_upload('blue'))  # Queues the red image for deletion
+        exists = self.storage.exists
+
+        def exists_then_flush(path):
+            found = exists(path)
+            flush_deletions()  # The queue flushes between the dedup check and the product update
+            return found
+
+        second = self._product('Second')
+        with mock.patch.object(self.storage, 'exists', side_effect=exists_then_flush):
+            enqueue_product_image(second, _image_upload('red'))
+        second.refresh_from_db()
+        self.assertEqual(self._paths(second), red_paths)
+        flush_deletions()
+        self.assertTrue(all(path in self.storage.objects for path in red_paths))
+
+    def test_object_removed_by_another_process_is_restored(self):
+        first = self._product('First', 'red')
+        red_paths, red_url = self._paths(first), first.image_url
+        enqueue_product_image(first, _image_upload('blue'))
+        exists = self.storage.exists
+        checks = []
+
+        def exists_then_remove(path):
+            found = exists(path)
+            if not checks:
+                # Another worker's batch passed its reference check earlier and removes the object now
+                self.storage.remove(red_paths)
+            checks.append(path)
+            return found
+
+        second = self._product('Second')
+        with mock.patch.object(self.storage, 'exists', side_effect=exists_then_remove):
+            enqueue_product_image(second, _image_upload('red'))
+        second.refresh_from_db()
+        self.assertEqual(second.image_url, red_url)
+        self.assertTrue(all(path in self.storage.objects for path in red_paths))
+
+
+class UploadWorkerPoolTests(TransactionTestCase):
+    # Not TestCase: the worker threads have their own connections and must see committed rows
+
+    def setUp(self):
+        flush_deletions()
+        reset_storage()
+        self.addCleanup(reset_storage)
+        metrics_registry.reset()
+        stall = FoodStall.objects.create(owner=User.objects.create(username='owner', user_type='shop'), stall_name='Stall')
+        self.product = Product.objects.create(product_name='Adobo', unit_price=Decimal('10.00'), food_stall=stall)
+
+    @override_settings(IMAGE_UPLOAD_BACKGROUND=True)
+    def test_upload_runs_on_a_worker(self):
+        job = enqueue_product_image(self.product, _image_upload('red'))
+        wait_for_uploads()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.image_url, get_storage().public_url(job.bucket_path))
+        self.assertFalse(os.path.exists(job.spool_path))
+        self.assertEqual(UPLOAD_JOBS.series[('completed',)], 1)
+        scrape = metrics_registry.render()
+        self.assertIn(f'goldenbites_image_upload_jobs_total{{outcome="completed",pid="{os.getpid()}"}} 1', scrape)
+        self.assertIn(f'goldenbites_image_upload_seconds_count{{pid="{os.getpid()}"}} 1', scrape)
+        self.assertIn(f'goldenbites_image_upload_queue_depth{{pid="{os.getpid()}"}} 0', scrape)
+
+    @override_settings(IMAGE_UPLOAD_BACKGROUND=True)
+    def test_full_queue_runs_the_upload_inline(self):
+        pool = UploadWorkerPool(workers=0, max_queue=1)
+        pool.submit(None)  # Nothing drains it
+        with mock.patch('members.uploads._get_pool', return_value=pool):
+            enqueue_product_image(self.product, _image_upload('red'))
+        self.product.refresh_from_db()
+        self.assertTrue(self.product.image_url)
+        self.assertEqual(UPLOAD_JOBS.series[('ran_inline',)], 1)
+
+    def test_newer_edit_wins_over_the_upload(self):
+        stale = Product.objects.get(pk=self.product.pk)
+        enqueue_product_image(self.product, _image_upload('red'))
+        self.product.refresh_from_db()
+        job = enqueue_product_image(stale, _image_upload('blue'))  # Queued before the red one landed
+        self.assertEqual(Product.objects.get(pk=self.product.pk).image_url, self.product.image_url)
+        self.assertEqual(UPLOAD_JOBS.series[('superseded',)], 1)
+        flush_deletions()
+        self.assertFalse(get_storage().exists(job.bucket_path))
+        self.assertTrue(get_storage().exists(get_storage().path_from_url(self.product.image_url)))
+
+
+class DeletionQueueTests(TestCase):
+    def setUp(self):
+        self.queue = DeletionQueue(batch_size=2, flush_interval=3600, max_attempts=2)
+        self.storage = mock.Mock()
+        patcher = mock.patch('members.deletions.get_storage', return_value=self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_flushes_in_batches(self):
+        self.queue.add(['a', 'b', 'c'])
+        self.queue.add(['c', 'd', 'e'])
+        self.assertEqual(self.queue.flush(), 5)
+        self.assertEqual([len(call.args[0]) for call in self.storage.remove.call_args_list], [2, 2, 1])
+        self.assertEqual(self.queue.pending, {})
+
+    def test_failed_batch_backs_off_then_is_abandoned(self):
+        self.storage.remove.side_effect = ConnectionError('storage is down')
+        self.queue.add(['a', 'b'])
+        self.assertEqual(self.queue.flush(), 0)
+        self.assertEqual(self.queue.pending, {'a': [1, None], 'b': [1, None]})
+        self.assertGreater(self.queue.retry_after, time.monotonic() + 3600)  # Doubled after the first failure
+        self.assertEqual(self.queue.flush(), 0)
+        self.assertEqual(self.queue.pending, {})
+        self.assertEqual(self.queue.abandoned, 2)
+
+    def test_requeued_paths_are_removed_once_storage_recovers(self):
+        self.storage.remove.side_effect = [ConnectionError('storage is down'), None, None]
+        self.queue.add(['a', 'b', 'c'])
+        self.assertEqual(self.queue.flush(), 0)
+        self.assertEqual(self.queue.flush(), 3)
+        self.assertEqual(self.queue.abandoned, 0)
+
+
+class CartOperationsTests(TestCase):
+    def setUp(self):
+        self.session = {}
+        set_quantity(self.session, 1, 2, quoted_price=Decimal('10.00'))
+        set_quantity(self.session, 2, 1, quoted_price=Decimal('20.00'))
+        self.session['cart_stall_id'] = 7
+
+    def test_removing_a_missing_line_is_a_no_op(self):
+        # A double click or a stale tab must not sink the rest of the batch
+        apply_operations(self.session, [
+            {'op': 'remove', 'product_id': 1},
+            {'op': 'remove', 'product_id': 1},
+            {'op': 'remove', 'product_id': 99},
+            {'op': 'set', 'product_id': 2, 'quantity': 3},
+        ])
+        self.assertEqual(get_cart(self.session), {'2': 3})
+        self.assertEqual(self.session['cart_prices'], {'2': '20.00'})
+
+    def test_setting_zero_removes_the_line(self):
+        apply_operations(self.session, [{'op': 'set', 'product_id': 1, 'quantity': '0'}])
+        self.assertEqual(get_cart(self.session), {'2': 1})
+        apply_operations(self.session, [{'op': 'set', 'product_id': 2, 'quantity': 0}])
+        self.assertEqual(get_cart(self.session), {})
+        self.assertNotIn('cart_stall_id', self.session)
+
+    def test_an_invalid_operation_leaves_the_cart_untouched(self):
+        for operation in (
+            {'op': 'set', 'product_id': 1, 'quantity': 'many'},
+            {'op': 'set', 'product_id': 1, 'quantity': 100},
+            {'op': 'set', 'product_id': 99, 'quantity': 1},
+            {'op': 'add', 'product_id': 1},
+            'remove',
+        ):
+            with self.subTest(operation=operation):
+                with self.assertRaises(CartError):
+                    apply_operations(self.session, [{'op': 'set', 'product_id': 1, 'quantity': 5}, operation])
+                self.assertEqual(get_cart(self.session), {'1': 2, '2': 1})
+        with self.assertRaises(CartError):
+            apply_operations(self.session, [])
+
+
+class CheckoutPricingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create(username='owner', user_type='shop')
+        FoodStall.objects.create(owner=cls.owner, stall_name='Stall')
+        cls.product = Product.objects.create(product_name='Adobo', unit_price=Decimal('50.00'), food_stall_id=cls.owner.pk)
+        cls.customer = User.objects.create(username='customer')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.customer)
+        session = self.client.session
+        set_quantity(session, self.product.pk, 2, quoted_price=self.product.unit_price)
+        session['cart_stall_id'] = self.owner.pk
+        session.save()
+
+    def _place_order(self):
+        return self.client.post(reverse('place_order'), {'payment_method': 'Cash', 'pickup_method': 'pickup', 'queue_number': 'A0001'})
+
+    def test_checkout_uses_the_current_price_not_a_stale_card(self):
+        get_product_cards([self.product.pk])  # This worker caches the card at 50.00
+        # Edited on another worker: update() skips this worker's post_save invalidation
+        Product.objects.filter(pk=self.product.pk).update(unit_price=Decimal('65.00'))
+
+        self.assertRedirects(self._place_order(), reverse('payment'), fetch_redirect_response=False)
+        self.assertFalse(Order.objects.exists())
+
+        # The new price has been shown; ordering now charges it
+        self.assertRedirects(self._place_order(), reverse('order_confirmation'), fetch_redirect_response=False)
+        order = Order.objects.get()
+        self.assertEqual(order.total_price, Decimal('130.00'))
+        self.assertEqual(order.orderitem_set.get().price, Decimal('65.00'))
+
+    def test_cart_page_shows_the_current_price_not_a_stale_card(self):
+        get_product_cards([self.product.pk])
+        Product.objects.filter(pk=self.product.pk).update(unit_price=Decimal('65.00'))
+        response = self.client.get(reverse('order_details'))
+        self.assertEqual([str(message) for message in response.context['messages']],
+                         ["The price of 'Adobo' changed from ₱50.00 to ₱65.00."])
+        self.assertEqual(self.client.session['cart_prices'], {str(self.product.pk): '65.00'})
+        response = self.client.get(reverse('payment'))
+        self.assertFalse(list(response.context['messages']))
+
+    def test_a_price_change_is_shown_once(self):
+        self.product.unit_price = Decimal('55.00')
+        self.product.save()
+        response = self.client.get(reverse('order_details'))
+        self.assertEqual([str(message) for message in response.context['messages']],
+                         ["The price of 'Adobo' changed from ₱50.00 to ₱55.00."])
+        self.assertTrue(response.context['cart_items'][0]['price_changed'])
+        self.assertEqual(self.client.session['cart_prices'], {str(self.product.pk): '55.00'})
+        response = self.client.get(reverse('order_details'))
+        self.assertFalse(list(response.context['messages']))
+        self.assertRedirects(self._place_order(), reverse('order_confirmation'), fetch_redirect_response=False)
+
+
+
+class RecordingReplicaRouter(ReplicaRouter):
+    """ReplicaRouter that records where each read would go but runs it on the test database."""
+    reads = []
+
+    def db_for_read(self, model, **hints):
+        self.reads.append((model._meta.model_name, super().db_for_read(model, **hints)))
+        return 'default'
+
+
+@mock.patch.dict(settings.DATABASES, {'replica': {}})
+@override_settings(DATABASE_ROUTERS=['members.tests.RecordingReplicaRouter'])
+class ReplicaRoutingTests(TransactionTestCase):
+    # Not TestCase: reads inside its transaction would always go to the primary
+
+    def setUp(self):
+        owner = User.objects.create(username='owner', user_type='shop')
+        FoodStall.objects.create(owner=owner, stall_name='Stall')
+        self.product = Product.objects.create(product_name='Adobo', unit_price=Decimal('50.00'), food_stall_id=owner.pk)
+        cache.clear()
+
+    def _read_aliases(self, func):
+        """Databases func's reads are routed to, starting like a fresh request."""
+        RecordingReplicaRouter.reads = []
+        token = routers._wrote.set(False)
+        try:
+            func()
+        finally:
+            routers._wrote.reset(token)
+        return {alias for _, alias in RecordingReplicaRouter.reads}
+
+    def test_catalog_reads_use_the_replica(self):
+        self.assertEqual(self._read_aliases(lambda: list(Product.objects.all())), {'replica'})
+
+    def test_product_card_misses_load_from_the_primary(self):
+        self.assertEqual(self._read_aliases(lambda: get_product_cards([self.product.pk])), {'default'})
+
+    def test_pinned_reads_use_the_primary(self):
+        def in_block():
+            with primary():
+                list(Product.objects.all())
+
+        self.assertEqual(self._read_aliases(in_block), {'default'})
+        self.assertEqual(self._read_aliases(use_primary(lambda: list(Product.objects.all()))), {'default'})
+        self.assertEqual(self._read_aliases(lambda: list(User.objects.all())), {'default'})
+
+    def test_reads_after_a_write_use_the_primary(self):
+        def write_then_read():
+            Product.objects.filter(pk=self.product.pk).update(unit_price=Decimal('55.00'))
+            RecordingReplicaRouter.reads = []
+            list(Product.objects.all())
+
+        self.assertEqual(self._read_aliases(write_then_read), {'default'})
+
+    def test_middleware_pins_a_client_that_wrote(self):
+        def view(request):
+            if request.method == 'POST':
+                Product.objects.filter(pk=self.product.pk).update(unit_price=Decimal('55.00'))
+            RecordingReplicaRouter.reads = []
+            list(Product.objects.all())
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+        self.assertNotIn(PRIMARY_COOKIE, middleware(factory.get('/')).cookies)
+        self.assertEqual({alias for _, alias in RecordingReplicaRouter.reads}, {'replica'})
+
+        cookie = middleware(factory.post('/')).cookies[PRIMARY_COOKIE]
+        self.assertGreater(float(cookie.value), time.time())
+
+        request = factory.get('/')
+        request.COOKIES[PRIMARY_COOKIE] = cookie.value
+        middleware(request)
+        self.assertEqual({alias for _, alias in RecordingReplicaRouter.reads}, {'default'})
+
+        request.COOKIES[PRIMARY_COOKIE] = str(time.time() - 1)  # The replica has caught up
+        middleware(request)
+        self.assertEqual({alias for _, alias in RecordingReplicaRouter.reads}, {'replica'})
@@ -0,0 +1,16 @@
+"""Latency summaries shared by the benchmark and load test commands."""
+import statistics
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list; fraction is 0-1."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def timing_summary(label, timings):
+    """One report line with the count, mean, p50 and p95 of timings (seconds) in ms."""
+    ordered = sorted(timings)
+    return (
+        f"{label:>16}: n={len(ordered)} mean={statistics.mean(ordered) * 1000:.1f} ms "
+        f"p50={statistics.median(ordered) * 1000:.1f} ms p95={percentile(ordered, 0.95) * 1000:.1f} ms"
+    )
@@ -0,0 +1,206 @@
+"""
+Bearer tokens for API and kitchen-display clients.
+
+    POST /api/v1/token/           {"username", "password"} -> {"access", "refresh", "token_type", "expires_in"}
+    POST /api/v1/token/refresh/   {"refresh"} -> a new pair; the refresh token sent is used up
+    POST /api/v1/token/revoke/    {"refresh"} -> 204; ends that sign-in on every device holding its tokens
+
+Access tokens are JWTs signed with JWT_SIGNING_KEY (HS256) that expire after
+ACCESS_TOKEN_LIFETIME seconds. They carry the user's id, username, first name, type and staff
+flag. TokenAuthenticationMiddleware checks an "Authorization: Bearer" header by signature and
+expiry alone and builds request.user from the claims. The existing @login_required views
+(add_to_cart, update_order_status, acknowledge_order_receipt, ...) then serve token clients
+without reading the session or the user row. Bearer requests skip the CSRF check, since browsers
+never attach that header on their own. A bad or expired token is answered with a 401 instead
+of the login redirect. Bearer values that aren't JWTs at all (the /metrics/ scraper's
+METRICS_TOKEN) are left for the view to check.
+
+Refresh tokens are JWTs as well, each backed by a RefreshToken row. A refresh token can be
+exchanged once (rotation). Presenting a used one again means it was copied, so every token
+descended from the same sign-in (its family) is revoked. Exchanging re-reads the user, so a
+deactivation or a change of user type reaches token clients within one access-token lifetime.
+"""
+import json
+import secrets
+import time
+from datetime import timedelta
+
+import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .models import RefreshToken, TokenUser, User
+
+ALGORITHM = 'HS256'
+
+class TokenError(ValueError):
+    """A refresh token that can't be exchanged; the message is returned to the client."""
+
+def _signing_key():
+    return getattr(settings, 'JWT_SIGNING_KEY', settings.SECRET_KEY)
+
+def _access_lifetime():
+    return getattr(settings, 'ACCESS_TOKEN_LIFETIME', 300)
+
+def _refresh_lifetime():
+    return getattr(settings, 'REFRESH_TOKEN_LIFETIME', 14 * 24 * 3600)
+
+def _encode(claims, lifetime):
+    now = int(time.time())
+    return jwt.encode({**claims, 'iat': now, 'exp': now + lifetime}, _signing_key(), algorithm=ALGORITHM)
+
+def decode_token(token, token_type):
+    """The claims of a valid, unexpired token of token_type ('access' or 'refresh'); raises jwt.InvalidTokenError."""
+    claims = jwt.decode(token, _signing_key(), algorithms=[ALGORITHM], options={'require': ['exp', 'sub', 'typ']})
+    if claims['typ'] != token_type:
+        raise jwt.InvalidTokenError(f"Not an {token_type} token")
+    return claims
+
+def issue_tokens(user, family=None):
+    """An access and a refresh token for user; family continues an earlier sign-in."""
+    jti = secrets.token_hex(16)
+    family = family or jti
+    now = timezone.now()
+    if family == jti:
+        # New sign-in: drop this user's expired refresh tokens (used ones are kept until then to spot replays)
+        RefreshToken.objects.filter(user=user, expires_at__lte=now).delete()
+    RefreshToken.objects.create(jti=jti, family=family, user=user, expires_at=now + timedelta(seconds=_refresh_lifetime()))
+    access = _encode({
+        'typ': 'access', 'sub': str(user.pk), 'username': user.username, 'name': user.first_name,
+        'type': user.user_type, 'staff': user.is_staff,
+    }, _access_lifetime())
+    refresh = _encode({'typ': 'refresh', 'sub': str(user.pk), 'jti': jti, 'fam': family}, _refresh_lifetime())
+    return {'access': access, 'refresh': refresh, 'token_type': 'Bearer', 'expires_in': _access_lifetime()}
+
+def rotate_refresh_token(token):
+    """Exchanges a refresh token for a new pair, using it up; raises TokenError."""
+    try:
+        claims = decode_token(token, 'refresh')
+    except jwt.InvalidTokenError:
+        raise TokenError("The refresh token is invalid or has expired.")
+    now = timezone.now()
+    tokens = None
+    with transaction.atomic():
+        # Marking the row used is the compare-and-set: of two concurrent exchanges only one updates it
+        exchanged = RefreshToken.objects.filter(jti=claims['jti'], used_at__isnull=True, expires_at__gt=now).update(used_at=now)
+        if exchanged:
+            user = User.objects.filter(pk=claims['sub'], is_active=True).first()
+            if user is not None:
+                tokens = issue_tokens(user, family=claims['fam'])
+        elif RefreshToken.objects.filter(jti=claims['jti'], used_at__isnull=False).exists():
+            RefreshToken.objects.filter(family=claims['fam']).delete()  # Replayed: end the sign-in
+    if tokens is None:
+        raise TokenError("The refresh token is invalid, revoked or already used.")
+    return tokens
+
+def revoke_refresh_token(token):
+    """Revokes every refresh token of the sign-in token belongs to; raises TokenError."""
+    try:
+        claims = decode_token(token, 'refresh')
+    except jwt.InvalidTokenError:
+        raise TokenError("The refresh token is invalid or has expired.")
+    RefreshToken.objects.filter(family=claims['fam']).delete()
+
+def _token_user(claims):
+    # A User with just the claims: enough for is_authenticated, pk, user_type and foreign-key
+    # filters, without a query. Fields not in the token are blank, so TokenUser refuses to save.
+    user = TokenUser(
+        pk=int(claims['sub']), username=claims['username'], first_name=claims.get('name', ''),
+        user_type=claims['type'], is_staff=claims.get('staff', False), is_active=True,
+    )
+    user._state.adding = False
+    return user
+
+def _unauthorized(error, description):
+    response = JsonResponse({'error': description}, status=401)
+    response['WWW-Authenticate'] = f'Bearer error="{error}", error_description="{description}"'
+    return response
+
+class TokenAuthenticationMiddleware:
+    """Sets request.user from a bearer access token; must come after AuthenticationMiddleware."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        rejected = self._authenticate(request)
+        return rejected if rejected is not None else self.get_response(request)
+
+    async def __acall__(self, request):
+        rejected = self._authenticate(request)
+        return rejected if rejected is not None else await self.get_response(request)
+
+    def _authenticate(self, request):
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        token = token.strip()
+        if scheme.lower() != 'bearer' or not token:
+            return None
+        try:
+            jwt.get_unverified_header(token)
+        except jwt.DecodeError:
+            return None  # Not a JWT, e.g. the metrics scraper's METRICS_TOKEN: the view decides
+        try:
+            claims = decode_token(token, 'access')
+        except jwt.InvalidTokenError:
+            return _unauthorized('invalid_token', "The access token is invalid or has expired.")
+        user = _token_user(claims)
+
+        async def auser():
+            return user
+
+        request.user = user
+        request.auser = auser
+        request._dont_enforce_csrf_checks = True  # Bearer tokens aren't sent by browsers on their own
+        return None
+
+def _payload(request):
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    return request.POST
+
+@csrf_exempt
+@require_POST
+@never_cache
+def obtain_token_view(request):
+    data = _payload(request)
+    user = authenticate(request, username=data.get('username'), password=data.get('password'))
+    if user is None:
+        return JsonResponse({'error': 'Invalid username/email or password.'}, status=401)
+    return JsonResponse(issue_tokens(user))
+
+@csrf_exempt
+@require_POST
+@never_cache
+def refresh_token_view(request):
+    try:
+        tokens = rotate_refresh_token(str(_payload(request).get('refresh', '')))
+    except TokenError as error:
+        return _unauthorized('invalid_grant', str(error))
+    return JsonResponse(tokens)
+
+@csrf_exempt
+@require_POST
+@never_cache
+def revoke_token_view(request):
+    try:
+        revoke_refresh_token(str(_payload(request).get('refresh', '')))
+    except TokenError as error:
+        return _unauthorized('invalid_grant', str(error))
+    return HttpResponse(status=204)
@@ -0,0 +1,211 @@
+"""
+Background product image uploads.
+
+The view spools the uploaded file to disk and saves the product straight away.
+A small per-process worker pool then pushes the file to storage and patches
+Product.image_url. Until that happens templates show their usual no-image state.
+
+Objects are keyed by content hash, so re-uploading a photo that is already stored
+(e.g. a stall re-submitting the same image while editing a price) skips the upload.
+A reused object may be queued for deletion after the product that used it changed
+image: the job cancels that deletion first, and once the product points at the
+object it checks again in case another process removed it in between.
+"""
+import hashlib
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .catalog import invalidate_product_cards
+from .deletions import cancel_deletion, schedule_deletion
+from .images import generate_variants, variant_urls
+from .metrics import UPLOAD_QUEUE_DEPTH, record_upload
+from .models import Product
+from .storage import content_path, get_storage
+from .versions import bump_versions
+
+logger = logging.getLogger(__name__)
+
+
+def _upload_setting(name, default):
+    return getattr(settings, name, default)
+
+
+@dataclass
+class UploadJob:
+    product_id: int
+    spool_path: str
+    bucket_path: str
+    content_type: str
+    expected_image_url: str | None  # image_url at enqueue time; only this value gets replaced
+    expected_image_variants: dict | None = None  # Derivatives of the image being replaced
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def spool_upload(uploaded_file):
+    """
+    Streams an UploadedFile to a temp file in chunks instead of reading it into memory,
+    hashing it on the way. Returns (spool_path, sha256 hex digest).
+    """
+    spool_dir = _upload_setting('IMAGE_UPLOAD_SPOOL_DIR', None) or tempfile.gettempdir()
+    os.makedirs(spool_dir, exist_ok=True)
+    extension = os.path.splitext(uploaded_file.name)[1]
+    spool_path = os.path.join(spool_dir, f"upload-{uuid.uuid4()}{extension}")
+    digest = hashlib.sha256()
+    with open(spool_path, 'wb') as spool:
+        for chunk in uploaded_file.chunks():
+            digest.update(chunk)
+            spool.write(chunk)
+    return spool_path, digest.hexdigest()
+
+
+def _process(job):
+    started = time.monotonic()
+    storage = get_storage()
+    try:
+        new_url = storage.public_url(job.bucket_path)
+        # Another product may already use this exact image; reuse its object and derivatives
+        new_variants = Product.objects.filter(
+            image_url=new_url, image_variants__isnull=False
+        ).values_list('image_variants', flat=True).first()
+        cancel_deletion(new_url)
+        deduplicated = new_variants is not None or storage.exists(job.bucket_path)
+        if deduplicated:
+            record_upload('deduplicated')
+        else:
+            # Pass the spool path rather than an open handle so each retry re-reads the file.
+            # Same key means same bytes, so overwriting a concurrent upload is harmless.
+            storage.upload(job.bucket_path, job.spool_path, job.content_type, upsert=True)
+        if new_variants is None:
+            try:
+                new_variants = generate_variants(storage, job.bucket_path, job.spool_path)
+            except Exception:
+                # Derivatives are an optimisation; templates fall back to the original
+                logger.exception("Could not build image derivatives for product %s", job.product_id)
+        upload_seconds = time.monotonic() - started
+        # Compare-and-set: a newer edit (or a delete) wins over this upload
+        updated = Product.objects.filter(pk=job.product_id, image_url=job.expected_image_url).update(
+            image_url=new_url, image_variants=new_variants, updated_at=timezone.now()
+        )
+        if updated:
+            # QuerySet.update() doesn't send post_save, so drop the cached product card and
+            # move the page versions forward here
+            invalidate_product_cards([job.product_id])
+            bump_versions(['catalog', f'product:{job.product_id}'])
+            # Only removed if no other product still references the old image (checked at flush time)
+            schedule_deletion(
+                (storage.path_from_url(url) for url in [job.expected_image_url, *variant_urls(job.expected_image_variants)]),
+                source_url=job.expected_image_url,
+            )
+            if deduplicated and not storage.exists(job.bucket_path):
+                # Another process removed the shared object after its reference check ran (before
+                # the update above); same key, same bytes, so put it and its derivatives back
+                storage.upload(job.bucket_path, job.spool_path, job.content_type, upsert=True)
+                generate_variants(storage, job.bucket_path, job.spool_path)
+            record_upload('completed', upload_seconds, started - job.enqueued_at)
+            logger.info("Uploaded image for product %s in %.2fs (queued %.2fs)",
+                        job.product_id, upload_seconds, started - job.enqueued_at)
+        else:
+            schedule_deletion(
+                [job.bucket_path, *(storage.path_from_url(url) for url in variant_urls(new_variants))],
+                source_url=new_url,
+            )
+            record_upload('superseded', upload_seconds, started - job.enqueued_at)
+    except Exception:
+        record_upload('failed')
+        logger.exception("Background upload failed for product %s", job.product_id)
+    finally:
+        try:
+            os.remove(job.spool_path)
+        except OSError:
+            pass
+
+
+class UploadWorkerPool:
+    def __init__(self, workers, max_queue):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.threads = []
+        for index in range(workers):
+            thread = threading.Thread(target=self._run, name=f"image-upload-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                _process(job)
+            finally:
+                # Worker threads keep their own DB connection; don't let it outlive CONN_MAX_AGE
+                close_old_connections()
+                self.queue.task_done()
+
+    def submit(self, job):
+        self.queue.put_nowait(job)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+UPLOAD_QUEUE_DEPTH.set_function(lambda: _pool.queue.qsize() if _pool is not None else 0)
+
+
+def _get_pool():
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = UploadWorkerPool(
+                    _upload_setting('IMAGE_UPLOAD_WORKERS', 2),
+                    _upload_setting('IMAGE_UPLOAD_MAX_QUEUE', 50),
+                )
+                _pool_pid = pid
+    return _pool
+
+
+def enqueue_product_image(product, uploaded_file):
+    """
+    Spools the file and schedules the upload. When the queue is full the upload runs
+    inline instead, so a burst degrades to the old synchronous behaviour rather than
+    dropping images. Returns None when the product already shows this exact image.
+    """
+    spool_path, digest = spool_upload(uploaded_file)
+    bucket_path = content_path(digest, os.path.splitext(uploaded_file.name)[1])
+    if product.image_url and product.image_url == get_storage().public_url(bucket_path):
+        os.remove(spool_path)
+        record_upload('deduplicated')
+        return None
+    job = UploadJob(
+        product_id=product.pk,
+        spool_path=spool_path,
+        bucket_path=bucket_path,
+        content_type=uploaded_file.content_type,
+        expected_image_url=product.image_url,
+        expected_image_variants=product.image_variants,
+    )
+    record_upload('enqueued')
+    if not _upload_setting('IMAGE_UPLOAD_BACKGROUND', True):
+        _process(job)
+        return job
+    try:
+        _get_pool().submit(job)
+    except queue.Full:
+        record_upload('ran_inline')
+        _process(job)
+    return job
+
+
+def wait_for_uploads():
+    """Blocks until every queued upload has been processed (used by tests and benchmarks)."""
+    if _pool is not None:
+        _pool.queue.join()
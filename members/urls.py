@@ -15,8 +15,10 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 # members/urls.py
-from django.urls import path
-from . import views # . means from the current package/app
+from django.conf import settings
+from django.urls import path, re_path
+from django.views.static import serve
+from . import api, tokens, views # . means from the current package/app
 
 urlpatterns = [
     path('', views.welcome_view, name='welcome'), # For your main landing page if it exists
@@ -32,6 +34,8 @@ urlpatterns = [
     path('forgot-password/', views.forgot_password_view, name='forgot_password'),
     path('home/', views.home_view, name='home'),
     path('notifications/', views.notifications_view, name='notifications'),
+    path('notifications/badge/', views.notification_badge_view, name='notification_badge'),
+    path('metrics/', views.metrics_view, name='metrics'),
     path('order-details/', views.order_details_view, name='order_details'),
     path('order-summary/', views.order_summary_view, name='order_summary'),
     path('order-tracking/', views.order_tracking_view, name='order_tracking'),
@@ -51,9 +55,29 @@ urlpatterns = [
     path('add_to_cart/<int:product_id>/', views.add_to_cart_view, name='add_to_cart'),
     path('cart/update/<int:product_id>/', views.update_cart_item_quantity_view, name='update_cart_item_quantity'),
     path('cart/remove/<int:product_id>/', views.remove_from_cart_view, name='remove_from_cart'),
+    path('cart/batch/', views.cart_batch_view, name='cart_batch'),
     path('place_order/', views.place_order_view, name='place_order'),
     path('order_confirmation/', views.order_confirmation_view, name='order_confirmation'),
     path('orders/update_status/<int:order_id>/', views.update_order_status_view, name='update_order_status'),
     path('orders/details/<int:order_id>/', views.order_details_modal_view, name='order_details_modal'),
     path('acknowledge_order_receipt/<int:order_id>/', views.acknowledge_order_receipt_view, name='acknowledge_order_receipt'),
+
+    # Read-only JSON catalog API (see members/api.py)
+    path('api/v1/stalls/', api.stalls, name='api_stalls'),
+    path('api/v1/stalls/<int:stall_id>/', api.stall_detail, name='api_stall_detail'),
+    path('api/v1/products/', api.products, name='api_products'),
+    path('api/v1/products/<int:product_id>/', api.product_detail, name='api_product_detail'),
+    path('api/v1/categories/', api.categories, name='api_categories'),
+    path('api/v1/review-summaries/', api.review_summaries, name='api_review_summaries'),
+
+    # Bearer tokens for API and kitchen-display clients (see members/tokens.py)
+    path('api/v1/token/', tokens.obtain_token_view, name='api_token'),
+    path('api/v1/token/refresh/', tokens.refresh_token_view, name='api_token_refresh'),
+    path('api/v1/token/revoke/', tokens.revoke_token_view, name='api_token_revoke'),
 ]
+
+# Development only: serve images written by the 'local' storage backend
+if settings.DEBUG and settings.STORAGE_BACKEND == 'local':
+    urlpatterns += [
+        re_path(rf'^{settings.LOCAL_STORAGE_URL.strip("/")}/(?P<path>.*)$', serve, {'document_root': settings.LOCAL_STORAGE_ROOT}),
+    ]
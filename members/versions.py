@@ -0,0 +1,128 @@
+"""
+Version stamps for conditional GET on the catalog pages.
+
+Each resource has a stamp in the cache (a timestamp in microseconds). Signals move it
+forward whenever the resource changes:
+
+    catalog         any product or stall, and shop owners' details (home, shops_list, shop_products)
+    product:<id>    the product and its stall's name (product_detail)
+    reviews:<id>    the product's reviews, i.e. its review summary (product_detail)
+    user:<id>       the signed-in user, whose name and details the pages show
+
+Product and FoodStall saves use the row's updated_at as the stamp. A missing stamp
+(evicted, expired, or never set in this worker's local-memory cache) is recreated as
+"now". That can turn a 304 into a 200 but never the reverse. With a per-worker cache a
+change is picked up by the other workers once their stamp expires (VERSION_CACHE_TIMEOUT),
+as for the product cards; with REDIS_URL set, right away.
+
+@conditional_page builds the ETag from the stamps, the user and, on pages with the
+bottom navigation, their notification badge. It answers If-None-Match and
+If-Modified-Since with a 304 before the view runs. The JSON catalog API (members/api.py)
+builds public validators from the same stamps with validators().
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .notifications import get_unread_badge
+
+VERSION_CACHE_KEY = 'version:{scope}'
+
+def _version_cache_key(scope):
+    return VERSION_CACHE_KEY.format(scope=scope)
+
+def _now():
+    return time.time_ns() // 1000
+
+def _timeout():
+    return getattr(settings, 'VERSION_CACHE_TIMEOUT', 300)
+
+def get_versions(scopes):
+    """{scope: stamp} for the given scopes, creating missing stamps."""
+    keys = {_version_cache_key(scope): scope for scope in scopes}
+    cached = cache.get_many(keys)
+    versions = {keys[key]: stamp for key, stamp in cached.items()}
+    missing = {key: _now() for key, scope in keys.items() if scope not in versions}
+    if missing:
+        cache.set_many(missing, _timeout())
+        versions.update({keys[key]: stamp for key, stamp in missing.items()})
+    return versions
+
+def bump_versions(scopes, at=None):
+    """Moves the stamps forward, to `at` (a datetime, e.g. the row's updated_at) or now."""
+    stamp = int(at.timestamp() * 1_000_000) if at is not None else _now()
+    cache.set_many({_version_cache_key(scope): stamp for scope in scopes}, _timeout())
+
+def validators(scopes, parts=()):
+    """(weak ETag, Last-Modified timestamp) from the scopes' stamps and any extra ETag parts."""
+    versions = get_versions(scopes)
+    parts = [*parts, *(f'{scope}={versions[scope]}' for scope in scopes)]
+    etag = 'W/"%s"' % hashlib.sha1('|'.join(parts).encode()).hexdigest()[:20]
+    last_modified = int(max(versions.values()) / 1_000_000) if versions else None
+    return etag, last_modified
+
+def _validators(request, scopes, badge):
+    user = request.user
+    scopes = list(scopes)
+    parts = []
+    if user.is_authenticated:
+        scopes.append(f'user:{user.pk}')
+        parts.append(f'u{user.pk}')
+        if badge:
+            unread = get_unread_badge(user.pk)
+            parts.append(f"{unread['unread_count']}-{unread['latest_id'] or 0}")
+    return validators(scopes, parts)
+
+def _conditional_response(request, scopes, badge):
+    """(304 response or None, etag, last_modified)."""
+    if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+        # Pending flash messages are only shown by a freshly rendered page
+        return None, None, None
+    etag, last_modified = _validators(request, scopes, badge)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return response, etag, last_modified
+
+def _add_validators(response, etag, last_modified):
+    if etag is not None and response.status_code in (200, 304):
+        response.headers.setdefault('ETag', etag)
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+    # Personalised pages: browsers may keep them but must revalidate, which sends If-None-Match
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+def conditional_page(scopes_func, badge=False):
+    """
+    View decorator: scopes_func(request, *args, **kwargs) names the version stamps the page
+    is built from; badge=True for pages that include bottom_nav.html. Unchanged pages are
+    answered with a 304 without running the view.
+    Async views compute the validators on the request's database thread, since the session,
+    user and badge are read through the sync ORM on a cache miss.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                request.user = await request.auser()  # One user lookup for the validators and the view
+                response, etag, last_modified = await sync_to_async(_conditional_response)(
+                    request, scopes_func(request, *args, **kwargs), badge,
+                )
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return _add_validators(response, etag, last_modified)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response, etag, last_modified = _conditional_response(request, scopes_func(request, *args, **kwargs), badge)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return _add_validators(response, etag, last_modified)
+        return wrapper
+    return decorator
@@ -1,56 +1,71 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 # from django.contrib.auth.forms import UserCreationForm # No longer needed
 from .forms import ShopOwnerSignUpForm, CustomerSignUpForm, CustomAuthenticationForm, ProductForm, ReviewForm # Import the new forms and CustomAuthenticationForm
 from django.contrib import messages
-from django.contrib.auth import login, authenticate, logout # Import authenticate and logout
+from django.contrib.auth import login, logout # Import login and logout
 from django.contrib.auth.decorators import login_required # For restricting access
 from django.conf import settings # To get Supabase credentials
-from supabase import create_client, Client # Supabase client
-import os # For path manipulation if needed
+from .storage import get_storage # Process-wide pooled storage client
+from .uploads import enqueue_product_image # Background image upload pipeline
+from .images import variant_urls # Derivative URLs stored on Product.image_variants
+from .deletions import schedule_deletion # Batched, retried image removal
 import uuid # For generating unique filenames
 from .models import FoodStall, Product, Order, OrderItem, Payment, Notification, Review # Ensure Product, Order, and Payment are imported
-from urllib.parse import urlparse # For parsing image URL to get path
 from django.urls import reverse # For reverse URL resolution
 from django.http import JsonResponse, HttpResponse # For potential AJAX responses, though redirecting for now
 from django.utils import timezone # For current date
 from django.db import transaction # For atomic operations
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_POST, require_GET, condition
+from django.views.decorators.cache import cache_control
 from django.db.utils import IntegrityError # For IntegrityError
 from datetime import date, timedelta # For date calculations
-from django.db.models import Sum, Count, Avg # Import Sum, Count, and Avg for aggregation
+from django.db.models import Sum, Count, Avg, Q # Import Sum, Count, and Avg for aggregation
 from decimal import Decimal # Import Decimal for financial calculations
+from .metrics import registry as metrics_registry # Request/SQL/storage latency histograms
+from .routers import use_primary # Checkout and status updates never read from the replica
+from .stalls import shop_owner_required # Shop-side access check; sets request.food_stall from a per-user cache
+from .versions import conditional_page # ETag/Last-Modified from cached version stamps; 304 before the view runs
+from .notifications import get_unread_badge, badge_etag # Cached unread counter for the bottom_nav badge
+from .cart import get_cart, set_quantity, remove_item, clear_cart, apply_operations, cart_summary, CartError # Compact session cart (product id -> quantity)
+from .cart import price_cart, acknowledge_prices, price_change_messages # Shared cart pricing for cart, payment and checkout
+import json # For the batch cart endpoint
+from asgiref.sync import sync_to_async # Rendering from async views
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+async def _arender(request, template_name, context):
+    # Context processors (session messages, the signed-in user, the notification badge) use the
+    # sync ORM, so async views render on the request's database thread. request.user and
+    # request.auser() cache separately; hand the templates the user login_required loaded.
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, template_name, context)
 
 # Helper function to delete image from Supabase Storage
-def _delete_supabase_image(image_url):
-    if not image_url or not settings.SUPABASE_URL or not settings.SUPABASE_KEY or not settings.SUPABASE_BUCKET:
+def _delete_supabase_image(image_url, image_variants=None):
+    if not image_url:
         return
     try:
-        # Attempt to parse the image_url to extract the path
+        storage = get_storage()
         # Public URLs are typically SUPABASE_URL/storage/v1/object/public/BUCKET_NAME/path/to/file.jpg
-        # We need to extract 'path/to/file.jpg'
-        url_path_part = urlparse(image_url).path
-        # Expected path format in Supabase URL: /storage/v1/object/public/your-bucket-name/actual-file-path
-        # We need to strip the prefix to get the 'actual-file-path'
-        prefix_to_strip = f"/storage/v1/object/public/{settings.SUPABASE_BUCKET}/"
-        if url_path_part.startswith(prefix_to_strip):
-            storage_path = url_path_part[len(prefix_to_strip):]
-            if storage_path:
-                supabase_client: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-                supabase_client.storage.from_(settings.SUPABASE_BUCKET).remove([storage_path])
-                # print(f"Successfully requested deletion of {storage_path} from Supabase.") # For debugging
+        # Thumbnails/WebP/AVIF derivatives live alongside the original and go with it.
+        # Removal is batched and retried in the background (see members/deletions.py).
+        # Images are shared by content hash, so they are only removed once no product uses them.
+        schedule_deletion(
+            (storage.path_from_url(url) for url in [image_url, *variant_urls(image_variants)]),
+            source_url=image_url,
+        )
     except Exception as e:
-        # Log this error or handle it as appropriate for your application
-        print(f"Error deleting image from Supabase: {e}") # For debugging
+        # Anything left behind is picked up by `manage.py reconcile_product_images`
+        logger.warning("Error scheduling image deletion for %s: %s", image_url, e)
 
-@login_required
+@shop_owner_required(message="You are not authorized to add items.")
 def add_item_view(request):
-    if request.user.user_type != 'shop':
-        messages.error(request, "You are not authorized to add items.")
-        return redirect('home')
-
-    try:
-        food_stall_instance = FoodStall.objects.get(owner=request.user)
-    except FoodStall.DoesNotExist:
+    food_stall_instance = request.food_stall
+    if food_stall_instance is None:
         messages.error(request, "Food stall not found for your account. Please set up your stall first.")
         return redirect('dashboard')
 
@@ -60,30 +75,19 @@ def add_item_view(request):
             product = form.save(commit=False)
             product.food_stall = food_stall_instance
             
+            product.save() # Saved right away; the image (if any) is uploaded in the background
+
             image_file = request.FILES.get('product_image')
             if image_file:
                 try:
-                    supabase_client: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-                    file_extension = os.path.splitext(image_file.name)[1]
-                    file_name = f"{uuid.uuid4()}{file_extension}"
-                    bucket_path = f"{food_stall_instance.owner.id}/{file_name}"
-                    image_bytes = image_file.read()
-                    supabase_client.storage.from_(settings.SUPABASE_BUCKET).upload(
-                        path=bucket_path,
-                        file=image_bytes,
-                        file_options={"content-type": image_file.content_type}
-                    )
-                    public_url_response = supabase_client.storage.from_(settings.SUPABASE_BUCKET).get_public_url(bucket_path)
-                    product.image_url = public_url_response
+                    # Keyed by content hash; an identical image is not uploaded again
+                    enqueue_product_image(product, image_file)
                 except Exception as e:
-                    messages.error(request, f"Error uploading image to Supabase: {e}")
-                    return render(request, 'add-item.html', {
-                        'form': form, 
-                        'page_title': 'Add New Item',
-                        'food_stall_name': food_stall_instance.stall_name
-                    })
-            
-            product.save()
+                    messages.warning(request, f'Product "{product.product_name}" was saved, but its image could not be queued for upload: {e}')
+                    return redirect('food_list')
+                messages.success(request, f'Product "{product.product_name}" added successfully! Its image will appear in a moment.')
+                return redirect('food_list')
+
             messages.success(request, f'Product "{product.product_name}" added successfully!')
             return redirect('food_list')
         else:
@@ -97,51 +101,31 @@ def add_item_view(request):
         'food_stall_name': food_stall_instance.stall_name
     })
 
-@login_required
+@shop_owner_required(message="You are not authorized to edit items.")
 def edit_product_view(request, product_id):
-    if request.user.user_type != 'shop':
-        messages.error(request, "You are not authorized to edit items.")
-        return redirect('home')
-
-    try:
-        food_stall_instance = FoodStall.objects.get(owner=request.user)
-    except FoodStall.DoesNotExist:
+    food_stall_instance = request.food_stall
+    if food_stall_instance is None:
         messages.error(request, "Food stall not found for your account.")
         return redirect('dashboard')
 
     product = get_object_or_404(Product, pk=product_id, food_stall=food_stall_instance)
-    old_image_url = product.image_url
 
     if request.method == 'POST':
         form = ProductForm(request.POST, request.FILES, instance=product)
         if form.is_valid():
             updated_product = form.save(commit=False)
+            updated_product.save()
             new_image_file = request.FILES.get('product_image')
             if new_image_file:
-                if old_image_url:
-                    _delete_supabase_image(old_image_url)
+                # The old image stays in place until the background upload swaps it out and deletes it
                 try:
-                    supabase_client: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-                    file_extension = os.path.splitext(new_image_file.name)[1]
-                    file_name = f"{uuid.uuid4()}{file_extension}"
-                    bucket_path = f"{food_stall_instance.owner.id}/{file_name}"
-                    image_bytes = new_image_file.read()
-                    supabase_client.storage.from_(settings.SUPABASE_BUCKET).upload(
-                        path=bucket_path,
-                        file=image_bytes,
-                        file_options={"content-type": new_image_file.content_type}
-                    )
-                    public_url_response = supabase_client.storage.from_(settings.SUPABASE_BUCKET).get_public_url(bucket_path)
-                    updated_product.image_url = public_url_response
+                    # Keyed by content hash; an identical image is not uploaded again
+                    enqueue_product_image(updated_product, new_image_file)
                 except Exception as e:
-                    messages.error(request, f"Error uploading new image to Supabase: {e}")
-                    return render(request, 'edit-product.html', {
-                        'form': form, 
-                        'product': product, 
-                        'page_title': f'Edit {product.product_name}',
-                        'food_stall_name': food_stall_instance.stall_name
-                    })
-            updated_product.save()
+                    messages.warning(request, f'Product "{updated_product.product_name}" was updated, but the new image could not be queued for upload: {e}')
+                    return redirect('food_list')
+                messages.success(request, f'Product "{updated_product.product_name}" updated successfully! The new image will appear in a moment.')
+                return redirect('food_list')
             messages.success(request, f'Product "{updated_product.product_name}" updated successfully!')
             return redirect('food_list')
         else:
@@ -156,15 +140,10 @@ def edit_product_view(request, product_id):
         'food_stall_name': food_stall_instance.stall_name
     })
 
-@login_required
+@shop_owner_required(message="You are not authorized to delete items.")
 def delete_product_view(request, product_id):
-    if request.user.user_type != 'shop':
-        messages.error(request, "You are not authorized to delete items.")
-        return redirect('home')
-
-    try:
-        food_stall_instance = FoodStall.objects.get(owner=request.user)
-    except FoodStall.DoesNotExist:
+    food_stall_instance = request.food_stall
+    if food_stall_instance is None:
         messages.error(request, "Food stall not found for your account.")
         return redirect('dashboard')
 
@@ -173,11 +152,12 @@ def delete_product_view(request, product_id):
     if request.method == 'POST':
         product_name = product.product_name # Get name before deleting
         image_url_to_delete = product.image_url
+        image_variants_to_delete = product.image_variants
 
         product.delete() # Delete product from DB
 
-        if image_url_to_delete: # Delete image from Supabase
-            _delete_supabase_image(image_url_to_delete)
+        if image_url_to_delete: # Delete image (and its derivatives) from Supabase
+            _delete_supabase_image(image_url_to_delete, image_variants_to_delete)
             
         messages.success(request, f'Product "{product_name}" and its image have been deleted successfully.')
         return redirect('food_list')
@@ -185,19 +165,14 @@ def delete_product_view(request, product_id):
     # GET request: show confirmation page
     return render(request, 'delete-product-confirm.html', {'product': product})
 
+@shop_owner_required(redirect_to='login')
 def dashboard_view(request):
-    if not request.user.is_authenticated or request.user.user_type != 'shop':
-        messages.error(request, "You are not authorized to view this page.")
-        return redirect('login')
-
-    food_stall = None
+    food_stall = request.food_stall
     running_orders_count = 0
     completed_orders_count = 0
     total_sales_amount = Decimal('0.00')
 
-    try:
-        food_stall = FoodStall.objects.get(owner=request.user)
-        
+    if food_stall is not None:
         # Calculate running orders
         running_orders_count = Order.objects.filter(
             food_stall=food_stall,
@@ -214,8 +189,7 @@ def dashboard_view(request):
         # Calculate total sales from completed orders
         sales_aggregation = completed_orders_queryset.aggregate(total_sales=Sum('total_price'))
         total_sales_amount = sales_aggregation['total_sales'] if sales_aggregation['total_sales'] is not None else Decimal('0.00')
-
-    except FoodStall.DoesNotExist:
+    else:
         messages.warning(request, "Your food stall information is not set up yet. Some features might be limited.")
 
     context = {
@@ -231,15 +205,10 @@ def dashboard_view(request):
 def favorites_view(request):
     return render(request, 'favorites.html')
 
-@login_required
+@shop_owner_required
 def food_list_view(request):
-    if request.user.user_type != 'shop':
-        messages.error(request, "You are not authorized to view this page.")
-        return redirect('home') # Or wherever non-shop users should go
-
-    try:
-        food_stall_instance = FoodStall.objects.get(owner=request.user)
-    except FoodStall.DoesNotExist:
+    food_stall_instance = request.food_stall
+    if food_stall_instance is None:
         messages.error(request, "Food stall not found for your account. Please set up your stall first.")
         # Redirect to a page where they can create/manage their stall, or just dashboard
         return redirect('dashboard') 
@@ -281,6 +250,7 @@ def forgot_password_view(request):
     return render(request, 'forgot-password.html')
 
 @login_required # Or remove if home is accessible to non-loggedIn users with different content
+@conditional_page(lambda request: ['catalog'], badge=True)
 def home_view(request):
     user_first_name = request.user.first_name if request.user.is_authenticated else "Guest"
     
@@ -316,11 +286,20 @@ def index_view(request):
 @login_required
 def notifications_view(request):
     # Fetch all notifications for the logged-in user, newest first
-    user_notifications = Notification.objects.filter(user=request.user).order_by('-timestamp')
+    user_notifications = (
+        Notification.objects.filter(user=request.user)
+        .select_related('order')
+        .prefetch_related('order__orderitem_set__product')
+        .order_by('-timestamp')
+    )
     today = date.today()
     yesterday = today - timedelta(days=1)
     # Fetch all completed orders for the user
-    completed_orders = Order.objects.filter(customer=request.user, status='Completed').order_by('-order_time')
+    completed_orders = (
+        Order.objects.filter(customer=request.user, status='Completed')
+        .prefetch_related('orderitem_set__product')
+        .order_by('-order_time')
+    )
     # Build review lookup for (product_id, order_id)
     user_reviews = Review.objects.filter(customer=request.user, order_id__in=completed_orders.values_list('id', flat=True))
     review_lookup = {}
@@ -337,31 +316,38 @@ def notifications_view(request):
     }
     return render(request, 'notifications.html', context)
 
+@require_GET
+def metrics_view(request):
+    # Prometheus scrape endpoint: bearer METRICS_TOKEN, or a logged-in staff user when no token is set
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token:
+        allowed = request.headers.get('Authorization') == f"Bearer {token}"
+    else:
+        allowed = request.user.is_authenticated and request.user.is_staff
+    if not allowed:
+        return HttpResponse(status=403)
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@login_required
+@require_GET
+@cache_control(private=True, no_cache=True) # Browsers must revalidate, which sends If-None-Match
+@condition(etag_func=lambda request: badge_etag(get_unread_badge(request.user.pk)))
+def notification_badge_view(request):
+    # Polled by bottom_nav.html; unchanged badges are answered with a 304 from the counter cache
+    badge = get_unread_badge(request.user.pk)
+    return JsonResponse({'unread_count': badge['unread_count'], 'latest_id': badge['latest_id']})
+
 def order_details_view(request):
-    cart = request.session.get('cart', {})
-    cart_items = []
-    total_cart_price = Decimal('0.00')
-
-    for product_id, item_data in cart.items():
-        # Ensure price is a Decimal for calculations
-        price = Decimal(str(item_data.get('price', '0.00')))
-        quantity = int(item_data.get('quantity', 0))
-        item_total = price * quantity
-        
-        cart_items.append({
-            'id': product_id,
-            'name': item_data.get('name', 'Unknown Product'),
-            'stall_name': item_data.get('stall_name', 'N/A'),
-            'price': price,
-            'quantity': quantity,
-            'image_url': item_data.get('image_url', ''),
-            'item_total': item_total
-        })
-        total_cart_price += item_total
+    # Names and images come from the catalog cache; the session only holds quantities. Prices come
+    # from the primary like on the payment page: the ones shown here are acknowledged as seen.
+    priced_cart = price_cart(request, current_prices=True)
+    for message_text in price_change_messages(priced_cart):
+        messages.warning(request, message_text)
+    acknowledge_prices(request.session, priced_cart)
 
     context = {
-        'cart_items': cart_items,
-        'total_cart_price': total_cart_price,
+        'cart_items': priced_cart.lines,
+        'total_cart_price': priced_cart.total_price,
         'page_title': "Order Details"
     }
     return render(request, 'order-details.html', context)
@@ -383,7 +369,7 @@ def add_to_cart_view(request, product_id):
                 messages.error(request, message_text)
                 return redirect(reverse('product_detail', args=[product_id]))
 
-        cart = request.session.get('cart', {})
+        cart = get_cart(request.session)
         cart_stall_id = request.session.get('cart_stall_id')
 
         if cart and cart_stall_id is not None and new_item_stall_id != cart_stall_id:
@@ -400,20 +386,8 @@ def add_to_cart_view(request, product_id):
                 messages.error(request, message_text)
                 return redirect(reverse('product_detail', args=[product_id]))
 
-        product_id_str = str(product.id) 
+        set_quantity(request.session, product.id, quantity, quoted_price=product.unit_price)
 
-        cart_item = {
-            'quantity': quantity,
-            'name': product.product_name,
-            'price': str(product.unit_price), 
-            'image_url': product.image_url if product.image_url else '',
-            'stall_name': product.food_stall.stall_name if product.food_stall else 'N/A',
-            'stall_id': new_item_stall_id 
-        }
-        
-        cart[product_id_str] = cart_item
-        request.session['cart'] = cart
-        
         if not cart_stall_id or new_item_stall_id == cart_stall_id:
             request.session['cart_stall_id'] = new_item_stall_id
 
@@ -434,24 +408,19 @@ def add_to_cart_view(request, product_id):
 @login_required # Or at least ensure session exists
 def update_cart_item_quantity_view(request, product_id):
     if request.method == 'POST':
-        cart = request.session.get('cart', {})
+        cart = get_cart(request.session)
         product_id_str = str(product_id)
         new_quantity = int(request.POST.get('quantity', 1))
         is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
 
         if product_id_str in cart:
-            original_quantity = cart[product_id_str]['quantity'] # Store original quantity for potential revert
             if new_quantity > 0:
-                cart[product_id_str]['quantity'] = new_quantity
-                request.session['cart'] = cart
+                if cart[product_id_str] != new_quantity: # Unchanged quantities don't dirty the session
+                    set_quantity(request.session, product_id, new_quantity)
                 return JsonResponse({'success': True, 'message': 'Quantity updated.'})
             else: # Quantity is 0 or less, effectively removing the item
                 if is_ajax:
-                    del cart[product_id_str]
-                    request.session['cart'] = cart
-                    if not cart: # If cart is now empty
-                        if 'cart_stall_id' in request.session:
-                            del request.session['cart_stall_id']
+                    remove_item(request.session, product_id)
                     return JsonResponse({'success': True, 'message': 'Item removed from cart.', 'item_removed': True})
                 else:
                     # For non-AJAX, delegate to the full remove view which handles messages and redirect
@@ -460,18 +429,24 @@ def update_cart_item_quantity_view(request, product_id):
             return JsonResponse({'success': False, 'error': 'Item not in cart.', 'original_quantity': 0}, status=404)
     return JsonResponse({'success': False, 'error': 'Invalid request method.'}, status=400)
 
+@login_required
+@require_POST
+def cart_batch_view(request):
+    # order-details.html debounces +/-/remove clicks and sends them here in one request:
+    # {"operations": [{"op": "set", "product_id": 3, "quantity": 2}, {"op": "remove", "product_id": 5}]}
+    try:
+        payload = json.loads(request.body or b'{}')
+        apply_operations(request.session, payload.get('operations') if isinstance(payload, dict) else None)
+    except (ValueError, CartError) as e:
+        # Nothing was applied; the current cart lets the page roll back its optimistic update
+        error = str(e) if isinstance(e, CartError) else 'Invalid request body.'
+        return JsonResponse({'success': False, 'error': error, 'cart': cart_summary(request)}, status=400)
+    return JsonResponse({'success': True, 'cart': cart_summary(request)})
+
 @login_required # Or at least ensure session exists
 def remove_from_cart_view(request, product_id):
     # This can be called via POST or internally from update_cart_item_quantity_view
-    cart = request.session.get('cart', {})
-    product_id_str = str(product_id)
-
-    if product_id_str in cart:
-        del cart[product_id_str]
-        request.session['cart'] = cart
-        if not cart: # If cart is now empty
-            if 'cart_stall_id' in request.session:
-                del request.session['cart_stall_id']
+    if remove_item(request.session, product_id):
         messages.success(request, "Item removed from cart.") # For redirect scenario
         # If called via AJAX, client might prefer no redirect
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
@@ -493,7 +468,7 @@ def order_tracking_view(request):
     status_sequence = ['Pending', 'Preparing', 'Ready', 'Completed']
 
     # Try to find the latest unacknowledged active/completed order first
-    order = Order.objects.filter(
+    order = Order.objects.select_related('food_stall').prefetch_related('orderitem_set__product').filter(
         customer=request.user,
         status__in=['Pending', 'Preparing', 'Ready', 'Completed'], # Active statuses + Completed
     ).exclude(
@@ -521,43 +496,39 @@ def order_tracking_view(request):
     }
     return render(request, 'order-tracking.html', context)
 
-@login_required
+@shop_owner_required
 def orders_view(request):
-    if request.user.user_type != 'shop':
-        messages.error(request, "You are not authorized to view this page.")
-        return redirect('home')
-
-    try:
-        food_stall = FoodStall.objects.get(owner=request.user)
-    except FoodStall.DoesNotExist:
+    food_stall = request.food_stall
+    if food_stall is None:
         messages.error(request, "No food stall found for your account.")
         return redirect('dashboard')
 
-    # Group orders by status
-    pending_orders = Order.objects.filter(food_stall=food_stall, status='Pending').order_by('-order_time')
-    preparing_orders = Order.objects.filter(food_stall=food_stall, status='Preparing').order_by('-order_time')
-    ready_orders = Order.objects.filter(food_stall=food_stall, status='Ready').order_by('-order_time')
-    completed_orders = Order.objects.filter(food_stall=food_stall, status='Completed').order_by('-order_time')
-    cancelled_orders = Order.objects.filter(food_stall=food_stall, status='Cancelled').order_by('-order_time')
+    # Group orders by status: one query for the orders (with their customer) and one for their items,
+    # instead of a count and a fetch per status plus per-card lookups in order_card.html
+    orders_by_status = {status: [] for status, _ in Order.STATUS_CHOICES}
+    stall_orders = (
+        Order.objects.filter(food_stall=food_stall)
+        .select_related('customer')
+        .prefetch_related('orderitem_set__product')
+        .order_by('-order_time')
+    )
+    for order in stall_orders:
+        orders_by_status.setdefault(order.status, []).append(order)
 
     context = {
-        'pending_orders': pending_orders,
-        'preparing_orders': preparing_orders,
-        'ready_orders': ready_orders,
-        'completed_orders': completed_orders,
-        'cancelled_orders': cancelled_orders,
+        'pending_orders': orders_by_status['Pending'],
+        'preparing_orders': orders_by_status['Preparing'],
+        'ready_orders': orders_by_status['Ready'],
+        'completed_orders': orders_by_status['Completed'],
+        'cancelled_orders': orders_by_status['Cancelled'],
         'food_stall': food_stall,
         'page_title': "Orders - Golden Bites"
     }
     return render(request, 'orders.html', context)
 
-@login_required
+@shop_owner_required(redirect_to='login')
 def overview_view(request):
-    if not request.user.is_authenticated or request.user.user_type != 'shop':
-        messages.error(request, "You are not authorized to view this page.")
-        return redirect('login')
-
-    food_stall = None
+    food_stall = request.food_stall
     total_sales = Decimal('0.00')
     total_revenue = Decimal('0.00') # Assuming same as sales for now
     total_completed_orders = 0
@@ -565,39 +536,37 @@ def overview_view(request):
     top_items = []
     recent_orders = []
 
-    try:
-        food_stall = FoodStall.objects.get(owner=request.user)
-
-        # Calculate Total Sales and Total Completed Orders
-        completed_orders_qs = Order.objects.filter(food_stall=food_stall, status='Completed')
-        sales_aggregation = completed_orders_qs.aggregate(sum_sales=Sum('total_price'))
-        total_sales = sales_aggregation['sum_sales'] if sales_aggregation['sum_sales'] is not None else Decimal('0.00')
-        total_revenue = total_sales # Assuming revenue is same as sales
-        total_completed_orders = completed_orders_qs.count()
-
-        # Calculate Total Items Sold
-        items_sold_aggregation = OrderItem.objects.filter(
-            order__food_stall=food_stall,
-            order__status='Completed'
-        ).aggregate(sum_items=Sum('quantity'))
-        total_items_sold = items_sold_aggregation['sum_items'] if items_sold_aggregation['sum_items'] is not None else 0
-        
-        # Get Top Selling Items (Top 3)
-        top_items = Product.objects.filter(
-            orderitem__order__food_stall=food_stall,
-            orderitem__order__status='Completed'
-        ).annotate(
-            total_sold=Sum('orderitem__quantity')
-        ).filter(total_sold__gt=0).order_by('-total_sold')[:3]
-
-        # Get Recent Orders (Last 3)
-        recent_orders = Order.objects.filter(food_stall=food_stall).order_by('-order_time')[:3]
-
-    except FoodStall.DoesNotExist:
+    if food_stall is None:
         messages.warning(request, "Food stall not found. Some overview data may be unavailable.")
-    except Exception as e:
-        messages.error(request, f"An error occurred while fetching overview data: {e}")
-        print(f"Error in overview_view: {e}") # For server logs
+    else:
+        try:
+            # Calculate Total Sales and Total Completed Orders
+            completed_orders_qs = Order.objects.filter(food_stall=food_stall, status='Completed')
+            sales_aggregation = completed_orders_qs.aggregate(sum_sales=Sum('total_price'))
+            total_sales = sales_aggregation['sum_sales'] if sales_aggregation['sum_sales'] is not None else Decimal('0.00')
+            total_revenue = total_sales # Assuming revenue is same as sales
+            total_completed_orders = completed_orders_qs.count()
+
+            # Calculate Total Items Sold
+            items_sold_aggregation = OrderItem.objects.filter(
+                order__food_stall=food_stall,
+                order__status='Completed'
+            ).aggregate(sum_items=Sum('quantity'))
+            total_items_sold = items_sold_aggregation['sum_items'] if items_sold_aggregation['sum_items'] is not None else 0
+
+            # Get Top Selling Items (Top 3)
+            top_items = Product.objects.filter(
+                orderitem__order__food_stall=food_stall,
+                orderitem__order__status='Completed'
+            ).annotate(
+                total_sold=Sum('orderitem__quantity')
+            ).filter(total_sold__gt=0).order_by('-total_sold')[:3]
+
+            # Get Recent Orders (Last 3)
+            recent_orders = Order.objects.filter(food_stall=food_stall).order_by('-order_time')[:3]
+        except Exception as e:
+            messages.error(request, f"An error occurred while fetching overview data: {e}")
+            logger.exception("Error in overview_view")
 
     context = {
         'page_title': "Overview - Golden Bites",
@@ -611,31 +580,29 @@ def overview_view(request):
     }
     return render(request, 'overview.html', context)
 
+@use_primary
 def payment_view(request):
-    cart = request.session.get('cart', {})
-    cart_items_summary = []
-    total_cart_price = Decimal('0.00')
-    item_count = 0
-
-    for product_id, item_data in cart.items():
-        price = Decimal(str(item_data.get('price', '0.00')))
-        quantity = int(item_data.get('quantity', 0))
-        item_total = price * quantity
-        
-        cart_items_summary.append({
-            'id': product_id,
-            'name': item_data.get('name', 'Unknown Product'),
-            'quantity': quantity,
-            'price_per_item': price,
-            'item_total': item_total
-        })
-        total_cart_price += item_total
-        item_count += quantity
-
-    if not cart:
+    priced_cart = price_cart(request, current_prices=True) # The amount place_order will charge
+    cart_items_summary = [
+        {
+            'id': item['id'],
+            'name': item['name'],
+            'quantity': item['quantity'],
+            'price_per_item': item['price'],
+            'item_total': item['item_total'],
+            'price_changed': item['price_changed'],
+        }
+        for item in priced_cart.lines
+    ]
+
+    if not cart_items_summary:
         messages.error(request, "Your cart is empty. Please add items before proceeding to payment.")
         return redirect('order_details')
 
+    for message_text in price_change_messages(priced_cart):
+        messages.warning(request, message_text)
+    acknowledge_prices(request.session, priced_cart)
+
     # Generate a simple random queue number (for display only, not cryptographically secure)
     # Example: S1234, A5678. First letter + 4 digits.
     random_letter = chr(ord('A') + uuid.uuid4().int % 26) # Random letter A-Z
@@ -647,8 +614,8 @@ def payment_view(request):
 
     context = {
         'cart_items_summary': cart_items_summary, 
-        'total_cart_price': total_cart_price,
-        'item_count': item_count,
+        'total_cart_price': priced_cart.total_price,
+        'item_count': priced_cart.item_count,
         'page_title': "Payment", # Browser tab title
         'header_title': "Order Details", # Title in the top bar as per screenshot
         'queue_number': queue_number,
@@ -663,17 +630,14 @@ def policy_view(request):
 def policy_admin_view(request):
     return render(request, 'policy-admin.html')
 
-def product_detail_view(request, product_id):
-    product = get_object_or_404(Product.objects.select_related('food_stall'), pk=product_id)
-    # These attributes might be from the model or set elsewhere, retaining them for now.
-    is_popular_tag = getattr(product, 'is_popular', True) 
-    orders_display = getattr(product, 'total_orders', 2000)
-
-    # Get sorting option from request query parameters
+@conditional_page(lambda request, product_id: [f'product:{product_id}', f'reviews:{product_id}'])
+async def product_detail_view(request, product_id):
+    # Async: the worker serves other requests while this one waits on the database. The async ORM
+    # runs every query of a request on the same thread, one after another.
     sort_option = request.GET.get('sort_by', 'most_recent') # Default to 'most_recent'
 
     # Base queryset for reviews related to the current product
-    reviews_queryset = Review.objects.filter(product=product).select_related('customer')
+    reviews_queryset = Review.objects.filter(product_id=product_id)
 
     # Apply sorting based on the sort_option
     if sort_option == 'highest_rating':
@@ -686,12 +650,18 @@ def product_detail_view(request, product_id):
         reviews = reviews_queryset.order_by('-created_at')
         sort_option = 'most_recent' # Explicitly set sort_option to the fallback for context
 
-    # Calculate review statistics using Django ORM aggregation
-    review_stats = reviews_queryset.aggregate(
+    # Count, average and the 1-5 star histogram in one aggregate (used to be two round trips)
+    product = await aget_object_or_404(Product.objects.select_related('food_stall'), pk=product_id)
+    reviews = await _alist(reviews.select_related('customer'))
+    review_stats = await reviews_queryset.aaggregate(
         total_reviews_val=Count('id'),
-        average_rating_val=Avg('rating')
+        average_rating_val=Avg('rating'),
+        **{f'rating_{i}': Count('id', filter=Q(rating=i)) for i in range(1, 6)},
     )
-    
+    # These attributes might be from the model or set elsewhere, retaining them for now.
+    is_popular_tag = getattr(product, 'is_popular', True) 
+    orders_display = getattr(product, 'total_orders', 2000)
+
     total_reviews = review_stats.get('total_reviews_val', 0)
     average_rating = review_stats.get('average_rating_val')
 
@@ -700,14 +670,8 @@ def product_detail_view(request, product_id):
     else:
         average_rating = 0.0 # Default if no reviews or ratings
 
-    # Calculate rating distribution (e.g., count of 5-star, 4-star, etc., reviews)
-    rating_distribution_query = reviews_queryset.values('rating').annotate(count=Count('id')).order_by('-rating')
-    
-    # Initialize rating_distribution_dict with all possible ratings (1-5) having a count of 0
-    rating_distribution_dict = {i: 0 for i in range(1, 6)}
-    for item in rating_distribution_query:
-        if item['rating'] is not None: # Ensure rating is not None (e.g. for reviews without a rating value)
-            rating_distribution_dict[item['rating']] = item['count']
+    # Rating distribution (count of 5-star, 4-star, etc. reviews) for all possible ratings (1-5)
+    rating_distribution_dict = {i: review_stats[f'rating_{i}'] for i in range(1, 6)}
             
     context = {
         'product': product,
@@ -728,14 +692,14 @@ def product_detail_view(request, product_id):
             'lowest_rating': 'Lowest Rating',
         }
     }
-    return render(request, 'product-detail.html', context)
+    return await _arender(request, 'product-detail.html', context)
 
 @login_required # Or remove if shops list is public
+@conditional_page(lambda request: ['catalog'])
 def shops_list_view(request):
     # Fetch all food stalls. You might want to add ordering or filtering.
     # For example, to show only active stalls, or stalls with products.
-    all_food_stalls = FoodStall.objects.all().order_by('stall_name')
-    # Consider select_related('owner') if you need owner details in the template.
+    all_food_stalls = FoodStall.objects.select_related('owner').order_by('stall_name') # shops-list.html shows the owner's address
 
     # For active tab highlighting in bottom nav
     # Get the path of the current request
@@ -871,12 +835,10 @@ def sign_in_view(request):
     if request.method == 'POST':
         form = CustomAuthenticationForm(request, data=request.POST)
         if form.is_valid():
-            username = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password')
-            user = authenticate(request, username=username, password=password)
+            user = form.get_user() # The form already authenticated; don't hash the password twice
             if user is not None:
                 login(request, user)
-                messages.success(request, f'Welcome back, {username}!')
+                messages.success(request, f'Welcome back, {user.username}!') # They may have signed in with their email
                 # Redirect to a success page, e.g., dashboard or home
                 # You might want to redirect based on user_type if needed
                 if user.user_type == 'shop':
@@ -923,13 +885,14 @@ def logout_view(request):
     return redirect('login') # Or your desired page after logout, e.g., 'welcome' or 'landing'
 
 @login_required
+@use_primary
 @transaction.atomic # Ensures all database operations are committed together or rolled back
 def place_order_view(request):
     if request.method == 'POST':
-        cart = request.session.get('cart', {})
+        priced_cart = price_cart(request, current_prices=True) # Unit prices from the primary, not the per-worker card cache
         cart_stall_id = request.session.get('cart_stall_id')
 
-        if not cart or not cart_stall_id:
+        if not priced_cart.lines or not cart_stall_id:
             messages.error(request, "Your cart is empty or stall information is missing. Please add items to your cart.")
             return redirect('payment')
 
@@ -948,11 +911,14 @@ def place_order_view(request):
             messages.error(request, "The selected food stall could not be found. Please try again.")
             return redirect('payment')
 
-        total_cart_price = Decimal('0.00')
-        for item_data in cart.values():
-            price = Decimal(str(item_data.get('price', '0.00')))
-            quantity = int(item_data.get('quantity', 0))
-            total_cart_price += price * quantity
+        if priced_cart.changed_lines:
+            # Never charge a price the customer hasn't seen; show the new prices on the payment page
+            for message_text in price_change_messages(priced_cart):
+                messages.error(request, message_text)
+            acknowledge_prices(request.session, priced_cart)
+            return redirect('payment')
+
+        total_cart_price = priced_cart.total_price
         
         # Create Payment object first
         # Assuming initial payment status is 'Pending' or 'Awaiting Payment' for non-cash
@@ -984,20 +950,19 @@ def place_order_view(request):
             # order_time is auto_now_add
         )
 
-        # Create OrderItems
-        for product_id_str, item_data in cart.items():
-            product = get_object_or_404(Product, pk=int(product_id_str))
-            OrderItem.objects.create(
+        # Create OrderItems in one INSERT
+        OrderItem.objects.bulk_create([
+            OrderItem(
                 order=new_order,
-                product=product,
-                quantity=int(item_data['quantity']),
-                price=Decimal(str(item_data['price'])), # Corrected field name from price_at_order
+                product_id=int(item['id']),
+                quantity=item['quantity'],
+                price=item['price'], # Corrected field name from price_at_order
                 food_stall=food_stall_instance # OrderItem has food_stall
             )
+            for item in priced_cart.lines
+        ])
         
-        request.session['cart'] = {}
-        if 'cart_stall_id' in request.session:
-            del request.session['cart_stall_id']
+        clear_cart(request.session)
         if 'cart_total_price' in request.session:
             del request.session['cart_total_price']
 
@@ -1012,6 +977,7 @@ def place_order_view(request):
         return redirect('payment')
 
 @login_required
+@use_primary
 def order_confirmation_view(request):
     order_id = request.session.pop('last_order_id', None) # Pop to remove after retrieval
     queue_number = request.session.pop('last_queue_number', None)
@@ -1029,6 +995,7 @@ def order_confirmation_view(request):
 
 @login_required
 @require_POST
+@use_primary
 def update_order_status_view(request, order_id):
     if request.user.user_type != 'shop':
         return JsonResponse({'success': False, 'error': 'Unauthorized'}, status=403)
@@ -1051,26 +1018,23 @@ def update_order_status_view(request, order_id):
     order.status = new_status
     try:
         order.save()
-        print(f"[DEBUG] Order {order.id} status saved as: {new_status}") # DEBUG
+        logger.debug("Order %s status saved as: %s", order.id, new_status)
         
         # Create notification for the customer
         customer_to_notify = order.customer
         food_stall_name = order.food_stall.stall_name if order.food_stall else "The shop"
         message = f"The status of your order #{order.id} from {food_stall_name} has been updated to: {new_status}."
         
-        print(f"[DEBUG] Attempting to create notification for user: {customer_to_notify.username} (ID: {customer_to_notify.id})") # DEBUG
-        print(f"[DEBUG] Notification message: {message}") # DEBUG
 
         try:
-            notification = Notification.objects.create(
+            Notification.objects.create(
                 user=customer_to_notify,
                 order=order,
                 message=message
                 # link=notification_link # Uncomment and set if you have a relevant link
             )
-            print(f"[DEBUG] Notification created with ID: {notification.id} for order {order.id}") # DEBUG
         except Exception as e_notif:
-            print(f"[ERROR] Failed to create notification for order {order.id}: {e_notif}") # DEBUG
+            logger.error("Failed to create notification for order %s: %s", order.id, e_notif)
         
         return JsonResponse({'success': True, 'new_status': new_status})
     except IntegrityError as e:
@@ -1088,18 +1052,28 @@ def update_order_status_view(request, order_id):
 def order_details_modal_view(request, order_id):
     if not request.user.is_authenticated or request.user.user_type != 'shop':
         return HttpResponse('Unauthorized', status=403)
-    order = get_object_or_404(Order, pk=order_id, food_stall__owner=request.user)
+    order = get_object_or_404(
+        Order.objects.select_related('customer', 'payment', 'food_stall').prefetch_related('orderitem_set__product'),
+        pk=order_id, food_stall__owner=request.user,
+    )
     return render(request, 'order_details_modal.html', {'order': order})
 
 @login_required
-def shop_products_view(request, stall_owner_id):
-    food_stall = get_object_or_404(FoodStall, owner_id=stall_owner_id)
-    
+@conditional_page(lambda request, stall_owner_id: ['catalog'], badge=True)
+async def shop_products_view(request, stall_owner_id):
     # Get all products for this specific stall
-    all_stall_products = Product.objects.filter(food_stall=food_stall).order_by('product_name')
+    all_stall_products = Product.objects.filter(food_stall_id=stall_owner_id).order_by('product_name')
+
+    selected_category_filter = request.GET.get('category', 'All') # Default to 'All'
+
+    products_to_display = all_stall_products
+    if selected_category_filter != 'All':
+        products_to_display = all_stall_products.filter(category=selected_category_filter)
+
+    food_stall = await aget_object_or_404(FoodStall, owner_id=stall_owner_id)
+    stall_categories_from_db = await _alist(all_stall_products.order_by().values_list('category', flat=True).distinct())
+    products_to_display = await _alist(products_to_display)
 
-    # Get unique categories for the filter tabs for this stall's products
-    stall_categories_from_db = all_stall_products.values_list('category', flat=True).distinct()
     # Filter out None or empty string categories, normalize, ensure uniqueness, and sort them
     unique_normalized_categories = set()
     for cat in stall_categories_from_db:
@@ -1109,12 +1083,6 @@ def shop_products_view(request, stall_owner_id):
                  unique_normalized_categories.add(normalized_cat)
     categories_for_tabs = sorted(list(unique_normalized_categories))
 
-    selected_category_filter = request.GET.get('category', 'All') # Default to 'All'
-
-    products_to_display = all_stall_products
-    if selected_category_filter != 'All':
-        products_to_display = all_stall_products.filter(category=selected_category_filter)
-
     context = {
         'food_stall': food_stall,
         'products': products_to_display, # Products to display after category filter
@@ -1123,10 +1091,11 @@ def shop_products_view(request, stall_owner_id):
         'page_title': f"{food_stall.stall_name} - Products",
         'current_page_name': 'shop_products' 
     }
-    return render(request, 'shop_products.html', context)
+    return await _arender(request, 'shop_products.html', context)
 
 @login_required
 @require_POST # Ensures this view only accepts POST requests
+@use_primary
 def acknowledge_order_receipt_view(request, order_id):
     try:
         order = Order.objects.get(pk=order_id, customer=request.user)
@@ -1141,6 +1110,5 @@ def acknowledge_order_receipt_view(request, order_id):
     except Order.DoesNotExist:
         return JsonResponse({'success': False, 'error': 'Order not found.'}, status=404)
     except Exception as e:
-        # Log the exception e
-        print(f"Error in acknowledge_order_receipt_view: {e}") # Basic logging
+        logger.exception("Error in acknowledge_order_receipt_view")
         return JsonResponse({'success': False, 'error': 'An unexpected error occurred.'}, status=500)
\ No newline at end of file
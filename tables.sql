@@ -1,3 +1,10 @@
+-- NOTE: the schema is now managed by Django migrations (members/migrations). This file is kept as a
+-- reference for the original Supabase setup and no longer matches the models exactly.
+--   New database:        python manage.py migrate
+--   Existing Supabase DB: python manage.py migrate members 0001 --fake-initial   (tables already exist)
+--                         python manage.py migrate                                (adds the hot-query indexes)
+-- `python manage.py sqlmigrate members 0002` prints the index DDL for review.
+
 -- 1. User Table (Standalone version)
 -- If using Supabase auth, you'd typically create a 'profiles' table
 -- linked to 'auth.users' instead.
@@ -99,3 +106,23 @@ CREATE TABLE review (
 CREATE INDEX idx_review_customer_id ON review(customer_id);
 CREATE INDEX idx_review_product_id ON review(product_id);
 
+
+-- 10. Product image derivatives (thumbnails + blur placeholder, see members/images.py)
+ALTER TABLE product ADD COLUMN IF NOT EXISTS image_variants JSONB;
+
+
+-- 11. Statement timeout for the web app's connections only. Through the transaction pooler (port 6543) it
+-- can't be sent as a connection option (DB_STATEMENT_TIMEOUT_MS covers session/direct connections), so the
+-- app signs in as its own role that carries it. `migrate`, the index builds in its migrations and the
+-- generate_data COPY loads keep running as postgres without a timeout.
+--   Set the password outside this file:  ALTER ROLE goldenbites_app PASSWORD '...';
+--   Then run the app with DB_USER=goldenbites_app.<project ref> and DB_PASSWORD set to it.
+ALTER ROLE postgres RESET statement_timeout;  -- An earlier version of this file set it on postgres
+CREATE ROLE goldenbites_app LOGIN;
+ALTER ROLE goldenbites_app SET statement_timeout = '5s';
+GRANT USAGE ON SCHEMA public TO goldenbites_app;
+GRANT SELECT, INSERT, UPDATE, DELETE ON ALL TABLES IN SCHEMA public TO goldenbites_app;
+GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA public TO goldenbites_app;
+-- Tables and sequences that later migrations (run as postgres) create
+ALTER DEFAULT PRIVILEGES FOR ROLE postgres IN SCHEMA public GRANT SELECT, INSERT, UPDATE, DELETE ON TABLES TO goldenbites_app;
+ALTER DEFAULT PRIVILEGES FOR ROLE postgres IN SCHEMA public GRANT USAGE, SELECT ON SEQUENCES TO goldenbites_app;